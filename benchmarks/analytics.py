@@ -0,0 +1,88 @@
+"""
+Benchmark: player history and head-to-head queries (models.analytics).
+
+An archive of synthetic tournaments, in the serialized form read from storage, is indexed in
+one pass; the table then compares the time of a career summary and of a head-to-head record
+read from the index with the same figures computed by going through every round of every
+tournament, and gives the time needed to count one more tournament into the index.
+
+Run from the project root:
+
+    python -m benchmarks.analytics
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_archive  # noqa: E402
+from models.analytics import AnalyticsIndex  # noqa: E402
+from models.tournament import Tournament  # noqa: E402
+
+ARCHIVE_GAMES = [100_000, 1_000_000]
+ARCHIVE_PLAYERS = 50_000
+QUERIES = 200
+SEED = 2024
+
+
+def _scan(tournaments, player_id, opponent_id):
+    """
+    Naive queries: the record of a player and against one opponent, from every round.
+    """
+    record = [0, 0.0]
+    against = [0, 0, 0]
+    for tournament in tournaments:
+        for rnd in tournament["rounds"]:
+            for (player1_id, score1), (player2_id, score2) in rnd["matches"]:
+                if player_id == player1_id:
+                    points, other = score1, player2_id
+                elif player_id == player2_id:
+                    points, other = score2, player1_id
+                else:
+                    continue
+                record[0] += 1
+                record[1] += points
+                if other == opponent_id:
+                    against[0 if points == 1 else 2 if points == 0 else 1] += 1
+    return record, against
+
+
+def _median_us(function, arguments):
+    timings = []
+    for args in arguments:
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    rng = random.Random(SEED)
+    print(f"{'parties':>10} | {'opération':>24} | {'temps':>12}")
+    for games in ARCHIVE_GAMES:
+        _, tournaments, played = make_archive(games, ARCHIVE_PLAYERS, rng)
+        last = tournaments.pop()
+        start = time.perf_counter()
+        index = AnalyticsIndex.from_tournaments(tournaments)
+        print(f"{played:>10} | {'construction (1 passage)':>24} | {time.perf_counter() - start:>10.2f} s")
+
+        tournament = Tournament.from_dict(last)
+        start = time.perf_counter()
+        index.record(tournament)
+        print(f"{played:>10} | {'ajout d’un tournoi':>24} | {(time.perf_counter() - start) * 1000:>9.2f} ms")
+
+        pairs = [tuple(rng.sample(last["players"], 2)) for _ in range(QUERIES)]
+        print(f"{played:>10} | {'carrière (index)':>24} | {_median_us(index.career, [p[:1] for p in pairs]):>9.1f} µs")
+        print(f"{played:>10} | {'face-à-face (index)':>24} | {_median_us(index.head_to_head, pairs):>9.1f} µs")
+        print(f"{played:>10} | {'performance (index)':>24} | "
+              f"{_median_us(index.performance, [p[:1] for p in pairs]):>9.1f} µs")
+        scans = [(tournaments,) + pair for pair in pairs[:5]]
+        print(f"{played:>10} | {'carrière + face-à-face':>24} | {_median_us(_scan, scans) / 1000:>9.1f} ms"
+              f"  (parcours de l'historique)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: running a whole event command by command versus as one batch (deferred saves).
+
+The same sequence of operations (create the tournament, register its players, then start every
+round and enter its results) is run against a stored rating list, once with a save after each
+operation and once inside models.deferred_backend.deferred_saves(), which writes everything in
+a single commit at the end.
+
+Run from the project root:
+
+    python -m benchmarks.batch
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.tournament_controller import TournamentController  # noqa: E402
+from models import storage  # noqa: E402
+from models.deferred_backend import deferred_saves  # noqa: E402
+from models.player import Player, PlayerRepository  # noqa: E402
+from models.tournament import TournamentRepository  # noqa: E402
+
+RATING_LIST_SIZES = [1_000, 20_000]
+TOURNAMENT_SIZE = 64
+ROUNDS = 7
+SEED = 2024
+
+
+def _setup(count):
+    shutil.rmtree(storage.DATA_DIR, ignore_errors=True)
+    os.makedirs(storage.DATA_DIR)
+    PlayerRepository.invalidate()
+    TournamentRepository.invalidate()
+    PlayerRepository.add_players(Player(f"Nom{i}", "Jean", "1980-01-01", player_id=f"p{i}") for i in range(count))
+    PlayerRepository.invalidate()
+
+
+def _event(count, rng):
+    tournament = TournamentController.create_tournament("Open", "Paris", "2025-01-01", "2025-01-02", "",
+                                                        number_of_rounds=ROUNDS)
+    for pid in rng.sample([f"p{i}" for i in range(count)], TOURNAMENT_SIZE):
+        TournamentController.register_players_to_tournament(tournament, [pid])
+    for _ in range(ROUNDS):
+        new_round, _ = TournamentController.start_new_round(tournament)
+        TournamentController.enter_results_for_round(
+            tournament, [(1.0, 0.0) if m.is_bye else rng.choice([(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)])
+                         for m in new_round.matches])
+
+
+def _batched(count, rng):
+    with deferred_saves():
+        _event(count, rng)
+
+
+def main():
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        try:
+            print(f"{'joueurs':>8} | {'mode':>21} | {'temps (s)':>10}")
+            for count in RATING_LIST_SIZES:
+                for label, run in (("commande par commande", _event), ("lot", _batched)):
+                    _setup(count)
+                    start = time.perf_counter()
+                    run(count, random.Random(SEED))
+                    print(f"{count:>8} | {label:>21} | {time.perf_counter() - start:>10.3f}")
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
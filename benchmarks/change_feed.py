@@ -0,0 +1,139 @@
+"""
+Benchmark: live screens following a tournament through the change feed (views.change_feed).
+
+Many screens keep a Server-Sent Events stream open on the same tournament while results are
+entered board by board, then the round is closed. The table reports, for each number of screens,
+the time between the end of a write request and the reception of its event by the last screen,
+and the size of the events compared to the full standings and pairings a polling screen would
+download again after each change.
+
+Run from the project root:
+
+    python -m benchmarks.change_feed
+"""
+import asyncio
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.tournament_controller import TournamentController  # noqa: E402
+from models import storage  # noqa: E402
+from models.deferred_backend import deferred_saves  # noqa: E402
+from models.player import Player, PlayerRepository  # noqa: E402
+from models.tournament import TournamentRepository  # noqa: E402
+from views.http_server import ApiServer  # noqa: E402
+
+TOURNAMENT_SIZE = 64
+ROUNDS = 5
+SCREEN_COUNTS = [10, 100, 500]
+SEED = 2024
+
+
+def _setup():
+    rng = random.Random(SEED)
+    shutil.rmtree(storage.DATA_DIR, ignore_errors=True)
+    os.makedirs(storage.DATA_DIR)
+    PlayerRepository.invalidate()
+    TournamentRepository.invalidate()
+    with deferred_saves():
+        PlayerRepository.add_players(Player(f"Nom{i}", "Jean", "1980-01-01", player_id=f"p{i}")
+                                     for i in range(TOURNAMENT_SIZE))
+        tournament = TournamentController.create_tournament("Open", "Paris", "2025-01-01", "2025-01-02", "",
+                                                            number_of_rounds=ROUNDS)
+        TournamentController.register_players_to_tournament(tournament, [f"p{i}" for i in range(TOURNAMENT_SIZE)])
+        for _ in range(ROUNDS - 1):
+            new_round, _ = TournamentController.start_new_round(tournament)
+            TournamentController.enter_board_results(
+                tournament, {board: rng.choice([(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)])
+                             for board in range(1, len(new_round.matches) + 1)})
+        TournamentController.start_new_round(tournament)
+    return tournament.id
+
+
+async def _screen(port, path, received, ready):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    while await reader.readline() != b"\r\n":
+        pass
+    ready.release()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.startswith(b"data: "):
+                received.append((time.perf_counter(), len(line)))
+    finally:
+        writer.close()
+
+
+async def _request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n"
+                 f"Connection: close\r\n\r\n".encode() + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+async def _follow(tournament_id, screens):
+    server = ApiServer(port=0)
+    await server.start()
+    base = f"/tournaments/{tournament_id}"
+    inboxes = [[] for _ in range(screens)]
+    ready = asyncio.Semaphore(0)
+    tasks = [asyncio.create_task(_screen(server.port, f"{base}/events", inbox, ready)) for inbox in inboxes]
+    for _ in range(screens):
+        await ready.acquire()
+    while any(not inbox for inbox in inboxes):  # instantané initial
+        await asyncio.sleep(0.01)
+    full_size = len(await _request(server.port, "GET", f"{base}/standings"))
+    full_size += len(await _request(server.port, "GET", f"{base}/pairings"))
+
+    rng = random.Random(SEED)
+    latencies, sizes = [], []
+    writes = [("POST", f"{base}/boards/{board}", {"result": rng.choice(["1-0", "0-1", "1/2-1/2"])})
+              for board in range(1, TOURNAMENT_SIZE // 2 + 1)] + [("POST", f"{base}/round-end", None)]
+    for number, (method, path, body) in enumerate(writes, start=2):
+        await _request(server.port, method, path, body)
+        sent = time.perf_counter()
+        while any(len(inbox) < number for inbox in inboxes):
+            await asyncio.sleep(0.001)
+        latencies.append(max(inbox[number - 1][0] for inbox in inboxes) - sent)
+        sizes.append(inboxes[0][number - 1][1])
+    for task in tasks:
+        task.cancel()
+    await server.close()
+    return latencies, sizes, full_size
+
+
+def main():
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        try:
+            print(f"{'écrans':>6} | {'latence médiane (ms)':>20} | {'latence max (ms)':>16} | "
+                  f"{'octets/événement':>16} | {'octets/relecture':>16}")
+            for screens in SCREEN_COUNTS:
+                tournament_id = _setup()
+                latencies, sizes, full_size = asyncio.run(_follow(tournament_id, screens))
+                print(f"{screens:>6} | {statistics.median(latencies) * 1000:>20.1f} | "
+                      f"{max(latencies) * 1000:>16.1f} | {statistics.mean(sizes):>16.0f} | {full_size:>16}")
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: displaying a tournament again while nothing has changed (models.derived_cache).
+
+A synthetic tournament is played for a few rounds, then the data behind the standings, the
+pairing table and the round history screens is requested repeatedly: first with the cache
+emptied before every request (the cost of each screen before the cache), then as it is served
+after the first request.
+
+Run from the project root:
+
+    python -m benchmarks.derived_cache
+"""
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import draw_round_results, make_players  # noqa: E402
+from controllers.tournament_controller import TournamentController  # noqa: E402
+from models import storage  # noqa: E402
+from models.player import PlayerRepository  # noqa: E402
+from models.tournament import TournamentRepository  # noqa: E402
+
+PLAYER_COUNTS = [50, 500, 2000]
+ROUNDS = 5
+REPEATS = 50
+SEED = 2024
+
+SCREENS = {
+    "classement": TournamentController.get_tournament_standings,
+    "appariements": TournamentController.get_round_pairings,
+    "historique": TournamentController.get_rounds_history,
+}
+
+
+def _setup(player_count):
+    rng = random.Random(SEED)
+    shutil.rmtree(storage.DATA_DIR, ignore_errors=True)
+    os.makedirs(storage.DATA_DIR)
+    PlayerRepository.invalidate()
+    TournamentRepository.invalidate()
+    players, ratings = make_players(player_count, rng)
+    PlayerRepository.add_players(players)
+    tournament = TournamentController.create_tournament("Bench", "Paris", "2025-01-01", "2025-01-02", "",
+                                                        number_of_rounds=ROUNDS, pairing_seed=str(SEED))
+    TournamentController.register_players_to_tournament(tournament, [p.id for p in players])
+    for _ in range(ROUNDS):
+        new_round, _ = TournamentController.start_new_round(tournament)
+        TournamentController.enter_results_for_round(
+            tournament, draw_round_results(new_round.matches, ratings, rng, "elo"))
+    return tournament
+
+
+def _median_ms(screen, tournament, cold):
+    timings = []
+    for _ in range(REPEATS):
+        if cold:
+            TournamentController._derived.invalidate()
+        start = time.perf_counter()
+        screen(tournament)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        try:
+            print(f"{'joueurs':>7} | {'écran':>12} | {'recalculé (ms)':>14} | {'en cache (ms)':>13}")
+            for player_count in PLAYER_COUNTS:
+                tournament = _setup(player_count)
+                for name, screen in SCREENS.items():
+                    cold = _median_ms(screen, tournament, cold=True)
+                    warm = _median_ms(screen, tournament, cold=False)
+                    print(f"{player_count:>7} | {name:>12} | {cold:>14.3f} | {warm:>13.4f}")
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: Elo rating of rounds and of a whole archive (models.elo).
+
+First, one round of a large open is rated player by player on Player objects, as a naive
+implementation would, then as one batch over the rating columns (models.elo.rate_round).
+Then an archive of synthetic tournaments, in the serialized form read from storage, is
+re-rated from scratch with models.elo.rerate; the table reports the throughput in games per
+second, from which the time needed for a larger archive can be extrapolated.
+
+Run from the project root:
+
+    python -m benchmarks.elo
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import draw_result, make_archive, make_players  # noqa: E402
+from models import elo  # noqa: E402
+from models.round import Match  # noqa: E402
+
+ROUND_SIZES = [1_000, 10_000]
+ARCHIVE_GAMES = [100_000, 1_000_000]
+ARCHIVE_PLAYERS = 50_000
+SEED = 2024
+
+
+def _round(size, rng):
+    players, ratings = make_players(size, rng)
+    for player in players:
+        player.rating = ratings[player.id]
+    ids = [p.id for p in players]
+    rng.shuffle(ids)
+    matches = []
+    for pid1, pid2 in zip(ids[::2], ids[1::2]):
+        match = Match(pid1, pid2)
+        match.set_result(*draw_result(match, ratings, rng, "elo"))
+        matches.append(match)
+    return {p.id: p for p in players}, matches
+
+
+def _rate_one_by_one(players, matches):
+    """
+    Naive rating: each player's change computed and applied from Player objects, one at a time.
+    """
+    opponents = {}
+    for match in matches:
+        opponents[match.player1_id] = (match.player2_id, match.score1)
+        opponents[match.player2_id] = (match.player1_id, match.score2)
+    before = {pid: players[pid].rating for pid in opponents}
+    for pid, (opponent_id, score) in opponents.items():
+        player = players[pid]
+        player.rating = round(player.rating + player.k_factor * (
+            score - elo.expected_score(before[pid], before[opponent_id])), 1)
+        player.games += 1
+        player.k_factor = elo.next_k_factor(player.k_factor, player.rating, player.games)
+
+
+def main():
+    rng = random.Random(SEED)
+    print(f"{'joueurs':>8} | {'mode':>20} | {'temps (ms)':>10}")
+    for size in ROUND_SIZES:
+        players, matches = _round(size, rng)
+        start = time.perf_counter()
+        _rate_one_by_one(players, matches)
+        print(f"{size:>8} | {'joueur par joueur':>20} | {(time.perf_counter() - start) * 1000:>10.2f}")
+
+        players, matches = _round(size, rng)
+        start = time.perf_counter()
+        elo.rate_round(type("Round", (), {"matches": matches}), players)
+        print(f"{size:>8} | {'round en un lot':>20} | {(time.perf_counter() - start) * 1000:>10.2f}")
+
+    print()
+    print(f"{'parties':>10} | {'recalcul (s)':>12} | {'parties/s':>10}")
+    for games in ARCHIVE_GAMES:
+        players, tournaments, played = make_archive(games, ARCHIVE_PLAYERS, rng)
+        start = time.perf_counter()
+        elo.rerate(players, tournaments)
+        elapsed = time.perf_counter() - start
+        print(f"{played:>10} | {elapsed:>12.2f} | {played / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: read clients of the HTTP service (views.http_server).
+
+Many screens poll the standings of a tournament over keep-alive connections. The table reports
+the request rate and the number of times the storage backend was read during the polling:
+once served from memory, adding clients must not add disk reads. As a baseline, the same
+standings are computed by re-reading the JSON files for every request, as each screen would
+do without the service.
+
+Run from the project root:
+
+    python -m benchmarks.http_server
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.tournament_controller import TournamentController  # noqa: E402
+from models import storage  # noqa: E402
+from models.deferred_backend import deferred_saves  # noqa: E402
+from models.player import Player, PlayerRepository  # noqa: E402
+from models.tournament import TournamentRepository  # noqa: E402
+from views.http_server import ApiServer  # noqa: E402
+
+RATING_LIST_SIZE = 20_000
+TOURNAMENT_SIZE = 64
+ROUNDS = 5
+CLIENT_COUNTS = [1, 50]
+REQUESTS_PER_CLIENT = 200
+SEED = 2024
+
+
+def _setup():
+    rng = random.Random(SEED)
+    os.makedirs(storage.DATA_DIR)
+    with deferred_saves():
+        PlayerRepository.add_players(Player(f"Nom{i}", "Jean", "1980-01-01", player_id=f"p{i}")
+                                     for i in range(RATING_LIST_SIZE))
+        tournament = TournamentController.create_tournament("Open", "Paris", "2025-01-01", "2025-01-02", "",
+                                                            number_of_rounds=ROUNDS)
+        TournamentController.register_players_to_tournament(
+            tournament, rng.sample([f"p{i}" for i in range(RATING_LIST_SIZE)], TOURNAMENT_SIZE))
+        for _ in range(ROUNDS):
+            new_round, _ = TournamentController.start_new_round(tournament)
+            TournamentController.enter_board_results(
+                tournament, {board: rng.choice([(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)])
+                             for board in range(1, len(new_round.matches) + 1)})
+    return tournament.id
+
+
+def _count_loads(backend, counter):
+    for name in ("load_players", "load_tournaments"):
+        original = getattr(backend, name)
+
+        def counted(*args, _original=original, **kwargs):
+            counter[0] += 1
+            return _original(*args, **kwargs)
+        setattr(backend, name, counted)
+
+
+async def _client(port, path, etags):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    etag = None
+    for _ in range(REQUESTS_PER_CLIENT):
+        conditional = f"If-None-Match: {etag}\r\n" if etags and etag else ""
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{conditional}\r\n".encode())
+        await writer.drain()
+        await reader.readline()
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        await reader.readexactly(int(headers["content-length"]))
+        etag = headers.get("etag", etag)
+    writer.close()
+
+
+async def _poll(tournament_id, clients, etags):
+    server = ApiServer(port=0)
+    await server.start()
+    path = f"/tournaments/{tournament_id}/standings"
+    start = time.perf_counter()
+    await asyncio.gather(*[_client(server.port, path, etags) for _ in range(clients)])
+    elapsed = time.perf_counter() - start
+    await server.close()
+    return elapsed
+
+
+def _reread(tournament_id, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        PlayerRepository.invalidate()
+        TournamentRepository.invalidate()
+        TournamentController.get_standings_table(TournamentController.get_tournament(tournament_id))
+    return time.perf_counter() - start
+
+
+def main():
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        try:
+            tournament_id = _setup()
+            loads = [0]
+            _count_loads(storage.get_backend(), loads)
+            print(f"{'clients':>7} | {'mode':>26} | {'requêtes/s':>10} | {'lectures disque':>15}")
+            for clients in CLIENT_COUNTS:
+                requests = clients * REQUESTS_PER_CLIENT
+                for label, etags in (("service", False), ("service + If-None-Match", True)):
+                    loads[0] = 0
+                    PlayerRepository.invalidate()
+                    TournamentRepository.invalidate()
+                    elapsed = asyncio.run(_poll(tournament_id, clients, etags))
+                    print(f"{clients:>7} | {label:>26} | {requests / elapsed:>10.0f} | {loads[0]:>15}")
+            loads[0] = 0
+            elapsed = _reread(tournament_id, 200)
+            print(f"{1:>7} | {'relecture à chaque requête':>26} | {200 / elapsed:>10.0f} | {loads[0]:>15}")
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
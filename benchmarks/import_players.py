@@ -0,0 +1,81 @@
+"""
+Benchmark: adding players one at a time versus the bulk import (models.exchange.import_players).
+
+Adding players one by one through PlayerRepository.add_player rewrites the whole players file
+on every call (O(N²) I/O), so it is only measured on small lists; the bulk import validates,
+dedupes and saves the whole list in a single write.
+
+Run from the project root:
+
+    python -m benchmarks.import_players
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import exchange, storage  # noqa: E402
+from models.player import Player, PlayerRepository  # noqa: E402
+
+ONE_BY_ONE_COUNTS = [500, 2_000]
+BULK_COUNTS = [500, 2_000, 10_000, 100_000]
+
+
+def _name(i):
+    # Les noms ne peuvent contenir que des lettres : l'indice est écrit en base 26.
+    letters = ""
+    while True:
+        i, rest = divmod(i, 26)
+        letters = "abcdefghijklmnopqrstuvwxyz"[rest] + letters
+        if not i:
+            return "Nom" + letters
+
+
+def _rows(count):
+    return [{"last_name": _name(i), "first_name": "Jean", "birth_date": "1980-01-01"} for i in range(count)]
+
+
+def _reset():
+    for name in os.listdir(storage.DATA_DIR):
+        os.remove(os.path.join(storage.DATA_DIR, name))
+    PlayerRepository.invalidate()
+
+
+def _one_by_one(rows):
+    for row in rows:
+        PlayerRepository.add_player(Player(row["last_name"], row["first_name"], row["birth_date"]))
+
+
+def _bulk(rows):
+    report = exchange.import_players(enumerate(rows, start=2))
+    assert len(report.added) == len(rows)
+
+
+def _measure(run, rows):
+    _reset()
+    start = time.perf_counter()
+    run(rows)
+    return time.perf_counter() - start
+
+
+def main():
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        os.makedirs(storage.DATA_DIR)
+        try:
+            print(f"{'joueurs':>8} | {'méthode':>13} | {'temps (s)':>10}")
+            for count in ONE_BY_ONE_COUNTS:
+                print(f"{count:>8} | {'un par un':>13} | {_measure(_one_by_one, _rows(count)):>10.3f}")
+            for count in BULK_COUNTS:
+                print(f"{count:>8} | {'import en lot':>13} | {_measure(_bulk, _rows(count)):>10.3f}")
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: cost of the instrumentation (models.instrumentation).
+
+The same session (a synthetic tournament played through the controller, with the standings
+displayed after every round) is timed three times: as normally run, with the controllers and
+repositories instrumented, and under python main.py --profile (instrumentation, cProfile and
+tracemalloc). After disable() the classes hold their original methods again, which the first
+line checks.
+
+Run from the project root:
+
+    python -m benchmarks.instrumentation
+"""
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import draw_round_results, make_players  # noqa: E402
+from controllers.player_controller import PlayerController  # noqa: E402
+from controllers.tournament_controller import TournamentController  # noqa: E402
+from models import instrumentation, storage  # noqa: E402
+from models.player import Player, PlayerRepository  # noqa: E402
+from models.tournament import Tournament, TournamentRepository  # noqa: E402
+
+CLASSES = [PlayerRepository, TournamentRepository, PlayerController, TournamentController]
+DESERIALIZED = [Player, Tournament]
+PLAYERS = 300
+ROUNDS = 7
+REPEATS = 5
+SEED = 2024
+
+
+def _session():
+    rng = random.Random(SEED)
+    shutil.rmtree(storage.DATA_DIR, ignore_errors=True)
+    os.makedirs(storage.DATA_DIR)
+    PlayerRepository.invalidate()
+    TournamentRepository.invalidate()
+    players, ratings = make_players(PLAYERS, rng)
+    PlayerRepository.add_players(players)
+    tournament = TournamentController.create_tournament("Bench", "Paris", "2025-01-01", "2025-01-02", "",
+                                                        number_of_rounds=ROUNDS, pairing_seed=str(SEED))
+    TournamentController.register_players_to_tournament(tournament, [p.id for p in players])
+    for _ in range(ROUNDS):
+        new_round, _ = TournamentController.start_new_round(tournament)
+        TournamentController.enter_results_for_round(
+            tournament, draw_round_results(new_round.matches, ratings, rng, "elo"))
+        TournamentController.get_tournament_standings(tournament)
+        PlayerController.search_players("nom1", limit=20)
+
+
+def _median(run):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _instrumented():
+    instrumentation.enable(CLASSES, DESERIALIZED)
+    try:
+        _session()
+    finally:
+        instrumentation.disable()
+
+
+def _profiled():
+    with instrumentation.profiled_session("profile.json", CLASSES, DESERIALIZED):
+        _session()
+
+
+def main():
+    originals = {(cls, name): attribute for cls in CLASSES + DESERIALIZED for name, attribute in vars(cls).items()}
+    instrumentation.enable(CLASSES, DESERIALIZED)
+    instrumentation.disable()
+    restored = all(vars(cls)[name] is attribute for (cls, name), attribute in originals.items())
+    print(f"méthodes d'origine rétablies après disable() : {'oui' if restored else 'NON'}")
+
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        try:
+            plain = _median(_session)
+            print(f"{'mode':>22} | {'temps (s)':>9} | {'surcoût':>7}")
+            for name, run in (("sans mesures", _session), ("instrumenté", _instrumented),
+                              ("--profile", _profiled)):
+                elapsed = plain if run is _session else _median(run)
+                print(f"{name:>22} | {elapsed:>9.3f} | {elapsed / plain - 1:>6.1%}")
+            calls = sum(op["calls"] for op in instrumentation.report())
+            print(f"\n{calls} appels mesurés par session")
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
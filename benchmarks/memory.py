@@ -0,0 +1,111 @@
+"""
+Benchmark: memory held by the player and match models (tracemalloc).
+
+The same JSON documents are loaded with the previous model (a Player with a per-instance
+__dict__, rounds kept as the nested dicts and lists produced by json.load) and with the current
+one (slotted Player with interned ids, Round/Match objects with half-point scores), plus the
+PlayerColumns store used for bulk listings. The table reports the memory still allocated once
+the JSON text and the intermediate dictionaries are released.
+
+Run from the project root:
+
+    python -m benchmarks.memory
+"""
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.player import Player  # noqa: E402
+from models.player_columns import PlayerColumns  # noqa: E402
+from models.round import Round  # noqa: E402
+
+PLAYER_COUNTS = [100_000, 500_000]
+MATCH_COUNTS = [100_000, 1_000_000]
+ROUND_SIZE = 32
+SEED = 2024
+
+
+class LegacyPlayer:
+    """
+    The Player model before slots and interned ids, kept here as the baseline.
+    """
+    def __init__(self, last_name, first_name, birth_date, player_id=None):
+        self.last_name = last_name
+        self.first_name = first_name
+        self.birth_date = birth_date
+        self.id = player_id or f"{first_name.lower()}_{last_name.lower()}_{birth_date}"
+        self.score = 0
+
+    @staticmethod
+    def from_dict(data):
+        player = LegacyPlayer(data["last_name"], data["first_name"], data["birth_date"], data["id"])
+        player.score = data.get("score", 0)
+        return player
+
+
+def _players_json(count, rng):
+    """
+    A rating list whose names and birth dates repeat as in a real one.
+    """
+    players = []
+    for i in range(count):
+        player = Player(f"Nom{rng.randrange(20_000)}", f"Prenom{rng.randrange(2_000)}",
+                        f"19{rng.randrange(40, 100)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+                        player_id=f"player_{i}")
+        players.append(player.to_dict())
+    return json.dumps(players)
+
+
+def _rounds_json(match_count, rng):
+    ids = [f"prenom{i}_nom{i}_19{50 + i % 50}-0{1 + i % 9}-1{i % 10}" for i in range(20_000)]
+    rounds = []
+    for r in range(match_count // ROUND_SIZE):
+        order = rng.sample(ids, ROUND_SIZE * 2)
+        matches = []
+        for i in range(0, len(order), 2):
+            score = rng.choice((0.0, 0.5, 1.0))
+            matches.append([[order[i], score], [order[i + 1], 1.0 - score]])
+        rounds.append({"name": f"Round {r % 9 + 1}", "start_time": "2025-01-01 10:00:00",
+                       "end_time": "2025-01-01 12:00:00", "matches": matches})
+    return json.dumps(rounds)
+
+
+def _retained(build, text):
+    """
+    Return the memory (in MB) still allocated by the result of build(text).
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build(text)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1e6
+
+
+def main():
+    rng = random.Random(SEED)
+    print(f"{'données':>18} | {'modèle':>22} | {'mémoire (Mo)':>12}")
+    for count in PLAYER_COUNTS:
+        text = _players_json(count, rng)
+        for label, build in (
+                ("Player (__dict__)", lambda t: [LegacyPlayer.from_dict(d) for d in json.loads(t)]),
+                ("Player (__slots__)", lambda t: [Player.from_dict(d) for d in json.loads(t)]),
+                ("PlayerColumns", lambda t: PlayerColumns.from_records(json.loads(t)))):
+            print(f"{f'{count} joueurs':>18} | {label:>22} | {_retained(build, text):>12.1f}")
+    for count in MATCH_COUNTS:
+        text = _rounds_json(count, rng)
+        for label, build in (
+                ("dicts et listes", json.loads),
+                ("Round/Match", lambda t: [Round.from_dict(d) for d in json.loads(t)])):
+            print(f"{f'{count} matchs':>18} | {label:>22} | {_retained(build, text):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
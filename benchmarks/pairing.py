@@ -0,0 +1,81 @@
+"""
+Benchmark: greedy first-fit pairing versus the blossom-based Swiss pairing engine.
+
+Both strategies pair the same simulated tournaments round after round. For each field size
+the table reports the worst round time, the number of players left unpaired beyond the bye
+(the engine always pairs everyone or reports that no legal pairing exists) and the total
+cost of the pairs actually formed (squared score gaps, then ranking distance; lower is better).
+
+Run from the project root:
+
+    python -m benchmarks.pairing
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.pairing import PairingError, greedy_pairing, pair_round, pairing_cost  # noqa: E402
+
+FIELD_SIZES = [16, 64, 256, 1000, 2000]
+ROUNDS = 9
+SEED = 2024
+
+
+def _simulate(player_count, seed):
+    """
+    Play a tournament with the engine; at every round the greedy scan pairs the very same
+    standings so that both strategies are compared on identical inputs.
+    """
+    rng = random.Random(seed)
+    ids = [f"player_{i}" for i in range(player_count)]
+    scores = {pid: 0.0 for pid in ids}
+    past_pairs = set()
+    byes = set()
+    stats = {name: {"time": 0.0, "unpaired": 0, "cost": 0} for name in ("greedy", "blossom")}
+
+    for _ in range(min(ROUNDS, player_count - 1)):
+        ranked = sorted(ids, key=lambda pid: (-scores[pid], rng.random()))
+
+        start = time.perf_counter()
+        greedy_pairs, unpaired = greedy_pairing(ranked, past_pairs)
+        _record(stats["greedy"], time.perf_counter() - start, len(unpaired) - len(ids) % 2,
+                pairing_cost(scores, ranked, greedy_pairs))
+
+        start = time.perf_counter()
+        try:
+            pairs = pair_round(ranked, scores, past_pairs, byes)
+        except PairingError:
+            break
+        _record(stats["blossom"], time.perf_counter() - start, 0, pairing_cost(scores, ranked, pairs))
+
+        for pid1, pid2 in pairs:
+            if pid2 is None:
+                scores[pid1] += 1.0
+                byes.add(pid1)
+                continue
+            past_pairs.add(tuple(sorted([pid1, pid2])))
+            result = rng.choice([0.0, 0.5, 1.0])
+            scores[pid1] += result
+            scores[pid2] += 1.0 - result
+    return stats
+
+
+def _record(stats, elapsed, unpaired, cost):
+    stats["time"] = max(stats["time"], elapsed)
+    stats["unpaired"] += unpaired
+    stats["cost"] += cost
+
+
+def main():
+    print(f"{'joueurs':>8} | {'moteur':>8} | {'pire round (s)':>14} | {'non appariés':>12} | {'coût total':>14}")
+    for size in FIELD_SIZES:
+        for strategy, result in _simulate(size, SEED).items():
+            print(f"{size:>8} | {strategy:>8} | {result['time']:>14.4f} | "
+                  f"{result['unpaired']:>12} | {result['cost']:>14}")
+
+
+if __name__ == "__main__":
+    main()
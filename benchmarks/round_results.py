@@ -0,0 +1,96 @@
+"""
+Benchmark: per-match result entry versus batched result entry for one round.
+
+Run from the project root:
+
+    python -m benchmarks.round_results
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import storage  # noqa: E402
+from models.player import Player, PlayerRepository  # noqa: E402
+from models.round import Match, Round  # noqa: E402
+from models.tournament import Tournament, TournamentRepository  # noqa: E402
+from controllers.tournament_controller import TournamentController  # noqa: E402
+
+PLAYER_COUNTS = [50, 200, 400]
+
+
+def _setup(player_count):
+    """
+    Create a fresh data directory with player_count players and one open round.
+    """
+    shutil.rmtree(storage.DATA_DIR, ignore_errors=True)
+    os.makedirs(storage.DATA_DIR)
+    PlayerRepository.invalidate()
+    TournamentRepository.invalidate()
+    players = [Player(f"Nom{i}", f"Prenom{i}", "1990-01-01", player_id=f"player_{i}") for i in range(player_count)]
+    PlayerRepository.save_players(players)
+
+    tournament = Tournament("Bench", "Paris", "2025-01-01", "2025-01-02", "", id="bench")
+    tournament.players = [p.id for p in players]
+    tournament.rounds.append(Round(
+        "Round 1",
+        start_time="2025-01-01 10:00:00",
+        matches=[Match(players[i].id, players[i + 1].id) for i in range(0, player_count - 1, 2)]
+    ))
+    tournament.current_round = 1
+    TournamentRepository.save_tournaments([tournament])
+    return tournament
+
+
+def _per_match(tournament):
+    for match in tournament.rounds[-1].matches:
+        TournamentController.set_match_result(match, 1.0, 0.0)
+    TournamentController.finalize_round(tournament)
+
+
+def _batched(tournament):
+    results = [(1.0, 0.0)] * len(tournament.rounds[-1].matches)
+    TournamentController.enter_results_for_round(tournament, results)
+
+
+def _measure(player_count, entry):
+    tournament = _setup(player_count)
+    written = []
+    original = storage.write_json_documents
+
+    def counting_write(documents):
+        size = original(documents)
+        written.append(size)
+        return size
+
+    storage.write_json_documents = counting_write
+    try:
+        start = time.perf_counter()
+        entry(tournament)
+        elapsed = time.perf_counter() - start
+    finally:
+        storage.write_json_documents = original
+    return elapsed, len(written), sum(written)
+
+
+def main():
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        try:
+            print(f"{'joueurs':>8} | {'mode':>10} | {'écritures':>9} | {'octets':>12} | {'temps (s)':>9}")
+            for count in PLAYER_COUNTS:
+                for label, entry in (("par match", _per_match), ("groupé", _batched)):
+                    elapsed, writes, size = _measure(count, entry)
+                    print(f"{count:>8} | {label:>10} | {writes:>9} | {size:>12} | {elapsed:>9.4f}")
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: starting the rounds of an event split into several sections.
+
+Each section is a separate tournament. Every round is started either section by section with
+start_new_round (one pairing and one save per section), or for all sections at once with
+start_new_rounds, whose pairings are computed in a process pool and saved in a single write.
+The table reports the total time spent starting rounds; results are entered between rounds
+and are not timed. The speed-up of the pool depends on the number of cores of the machine.
+
+Run from the project root:
+
+    python -m benchmarks.sections
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.tournament_controller import TournamentController  # noqa: E402
+from models import storage  # noqa: E402
+from models.deferred_backend import deferred_saves  # noqa: E402
+from models.player import Player, PlayerRepository  # noqa: E402
+from models.tournament import TournamentRepository  # noqa: E402
+
+SECTIONS = 4
+SECTION_SIZES = [100, 500, 1000]
+ROUNDS = 5
+SEED = 2024
+
+
+def _setup(size):
+    shutil.rmtree(storage.DATA_DIR, ignore_errors=True)
+    os.makedirs(storage.DATA_DIR)
+    PlayerRepository.invalidate()
+    TournamentRepository.invalidate()
+    with deferred_saves():
+        PlayerRepository.add_players(Player(f"Nom{i}", "Jean", "1980-01-01", player_id=f"p{i}")
+                                     for i in range(SECTIONS * size))
+        for section in range(SECTIONS):
+            tournament = TournamentController.create_tournament(f"Open {section}", "Paris", "2025-01-01",
+                                                                "2025-01-02", "", number_of_rounds=ROUNDS)
+            TournamentController.register_players_to_tournament(
+                tournament, [f"p{i}" for i in range(section * size, (section + 1) * size)])
+    PlayerRepository.invalidate()
+    TournamentRepository.invalidate()
+    return TournamentController.get_all_tournaments()
+
+
+def _one_by_one(tournaments):
+    for tournament in tournaments:
+        TournamentController.start_new_round(tournament)
+
+
+def _pool(workers):
+    def start(tournaments):
+        TournamentController.start_new_rounds(tournaments, workers=workers)
+    return start
+
+
+def _play(tournaments, start_rounds):
+    rng = random.Random(SEED)
+    elapsed = 0.0
+    for _ in range(ROUNDS):
+        begin = time.perf_counter()
+        start_rounds(tournaments)
+        elapsed += time.perf_counter() - begin
+        with deferred_saves():
+            for tournament in tournaments:
+                TournamentController.enter_results_for_round(
+                    tournament, [(1.0, 0.0) if m.is_bye else rng.choice([(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)])
+                                 for m in tournament.rounds[-1].matches])
+    return elapsed
+
+
+def main():
+    cores = os.cpu_count() or 1
+    modes = [("section par section", _one_by_one), ("toutes, 1 processus", _pool(1))]
+    if cores > 1:
+        modes.append((f"toutes, {cores} processus", _pool(cores)))
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        try:
+            print(f"{SECTIONS} sections, {ROUNDS} rounds, {cores} cœur(s)")
+            print(f"{'joueurs/section':>15} | {'mode':>22} | {'temps (s)':>10}")
+            for size in SECTION_SIZES:
+                for label, start_rounds in modes:
+                    elapsed = _play(_setup(size), start_rounds)
+                    print(f"{size:>15} | {label:>22} | {elapsed:>10.3f}")
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
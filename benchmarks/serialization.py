@@ -0,0 +1,130 @@
+"""
+Benchmark: JSON files versus the compact binary format (models.binary_format).
+
+For each dataset size (number of matches) the same synthetic players and tournaments are saved
+and loaded back into Player/Tournament objects with both formats. The table reports save and
+load times, the size on disk and the number of memory blocks still allocated by the loaded
+objects. Every run also checks that both formats give back exactly the saved data.
+
+Run from the project root:
+
+    python -m benchmarks.serialization
+"""
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import binary_format, storage  # noqa: E402
+from models.player import Player  # noqa: E402
+from models.round import Match, Round  # noqa: E402
+from models.tournament import Tournament  # noqa: E402
+
+MATCH_COUNTS = [10_000, 100_000, 1_000_000]
+PLAYER_POOL = 20_000
+TOURNAMENT_SIZE = 64
+ROUNDS = 7
+SEED = 2024
+
+
+def _dataset(match_count, rng):
+    """
+    Build player and tournament dictionaries totalling about match_count matches.
+    """
+    players = [Player(f"Nom{i}", f"Prenom{i}", f"19{50 + i % 50}-0{1 + i % 9}-1{i % 10}").to_dict()
+               for i in range(PLAYER_POOL)]
+    ids = [p["id"] for p in players]
+    tournaments = []
+    per_tournament = TOURNAMENT_SIZE // 2 * ROUNDS
+    for t in range(max(1, match_count // per_tournament)):
+        tournament = Tournament(f"Open {t}", "Paris", "2025-01-01", "2025-01-02", "", id=f"t{t}",
+                                number_of_rounds=ROUNDS)
+        tournament.players = rng.sample(ids, TOURNAMENT_SIZE)
+        for r in range(ROUNDS):
+            order = rng.sample(tournament.players, TOURNAMENT_SIZE)
+            matches = []
+            for i in range(0, TOURNAMENT_SIZE, 2):
+                score = rng.choice((0.0, 0.5, 1.0))
+                matches.append(Match(order[i], order[i + 1], score, 1.0 - score))
+            tournament.rounds.append(Round(f"Round {r + 1}", start_time="2025-01-01 10:00:00",
+                                           end_time="2025-01-01 12:00:00", matches=matches))
+        tournament.current_round = ROUNDS
+        tournaments.append(tournament.to_dict())
+    return players, tournaments
+
+
+def _objects(players, tournaments):
+    return [Player.from_dict(p) for p in players], [Tournament.from_dict(t) for t in tournaments]
+
+
+def _json_save(players, tournaments):
+    storage.write_json_documents({storage.PLAYERS_FILE: players, storage.TOURNAMENTS_FILE: tournaments})
+    return os.path.getsize(storage.PLAYERS_FILE) + os.path.getsize(storage.TOURNAMENTS_FILE)
+
+
+def _json_load():
+    with open(storage.PLAYERS_FILE) as f:
+        players = json.load(f)
+    with open(storage.TOURNAMENTS_FILE) as f:
+        tournaments = json.load(f)
+    return _objects(players, tournaments)
+
+
+def _binary_save(players, tournaments):
+    storage.write_documents({storage.BINARY_FILE: binary_format.encode(players, tournaments)})
+    return os.path.getsize(storage.BINARY_FILE)
+
+
+def _binary_load():
+    with open(storage.BINARY_FILE, "rb") as f:
+        return _objects(*binary_format.decode(f.read()))
+
+
+def _measure(save, load, players, tournaments):
+    start = time.perf_counter()
+    size = save(players, tournaments)
+    save_time = time.perf_counter() - start
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    loaded_players, loaded_tournaments = load()
+    load_time = time.perf_counter() - start
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks
+
+    # Aller-retour : les objets rechargés doivent redonner exactement les données sauvegardées.
+    assert len(loaded_players) == len(players) and len(loaded_tournaments) == len(tournaments)
+    assert all(p.to_dict() == Player.from_dict(data).to_dict() for p, data in zip(loaded_players, players))
+    assert all(t.to_dict() == Tournament.from_dict(data).to_dict() for t, data in zip(loaded_tournaments, tournaments))
+    return save_time, load_time, size, blocks
+
+
+def main():
+    rng = random.Random(SEED)
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        os.makedirs(storage.DATA_DIR)
+        try:
+            print(f"{'matchs':>9} | {'format':>7} | {'sauvegarde (s)':>14} | {'chargement (s)':>14} | "
+                  f"{'taille (Mo)':>11} | {'blocs mémoire':>13}")
+            for match_count in MATCH_COUNTS:
+                players, tournaments = _dataset(match_count, rng)
+                for label, save, load in (("json", _json_save, _json_load), ("binaire", _binary_save, _binary_load)):
+                    save_time, load_time, size, blocks = _measure(save, load, players, tournaments)
+                    print(f"{match_count:>9} | {label:>7} | {save_time:>14.3f} | {load_time:>14.3f} | "
+                          f"{size / 1e6:>11.1f} | {blocks:>13}")
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
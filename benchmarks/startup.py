@@ -0,0 +1,118 @@
+"""
+Benchmark: start-up time of python main.py, paid again by every scripted call.
+
+Each command is run REPEATS times in a new interpreter, from a temporary directory and against
+a synthetic data directory (CHESS_DATA_DIR), and the median wall time is reported with the time
+spent importing modules (python -X importtime), in total and for the project's own modules.
+The first line is the bare interpreter, the floor of any call; the second imports every view,
+controller and model, as main.py did before its imports were made lazy.
+
+Bytecode is cached in a temporary directory (PYTHONPYCACHEPREFIX) by a first run, so that the
+figures are those of an installed program rather than of compiling the sources.
+
+Run from the project root:
+
+    python -m benchmarks.startup
+"""
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import draw_round_results, make_players  # noqa: E402
+from controllers.tournament_controller import TournamentController  # noqa: E402
+from models import storage  # noqa: E402
+from models.player import PlayerRepository  # noqa: E402
+from models.tournament import TournamentRepository  # noqa: E402
+
+MAIN = os.path.join(ROOT, "main.py")
+PLAYERS = 200
+ROUNDS = 5
+REPEATS = 10
+SEED = 2024
+PROJECT_PACKAGES = ("models.", "controllers.", "views.")
+
+COMMANDS = [
+    ("interpréteur seul", ["-c", "pass"], None),
+    ("tout importer", ["-c", "import views.cli, views.metrics_view, views.player_view, views.tournament_view"], None),
+    ("menu → Quitter", [MAIN], "15\n"),
+    ("players list", [MAIN, "players", "list"], None),
+    ("players history", [MAIN, "players", "history", "synthetic_0"], None),
+    ("standings", [MAIN, "standings", "Bench"], None),
+    ("--help", [MAIN, "--help"], None),
+]
+
+
+def _setup():
+    rng = random.Random(SEED)
+    os.makedirs(storage.DATA_DIR)
+    PlayerRepository.invalidate()
+    TournamentRepository.invalidate()
+    players, ratings = make_players(PLAYERS, rng)
+    PlayerRepository.add_players(players)
+    tournament = TournamentController.create_tournament("Bench", "Paris", "2025-01-01", "2025-01-02", "",
+                                                        number_of_rounds=ROUNDS, pairing_seed=str(SEED))
+    TournamentController.register_players_to_tournament(tournament, [p.id for p in players])
+    for _ in range(ROUNDS):
+        new_round, _ = TournamentController.start_new_round(tournament)
+        TournamentController.enter_results_for_round(
+            tournament, draw_round_results(new_round.matches, ratings, rng, "elo"))
+
+
+def _run(arguments, stdin, env, workdir, options=()):
+    return subprocess.run([sys.executable, *options, *arguments], input=stdin, env=env, cwd=workdir,
+                          capture_output=True, text=True, check=True)
+
+
+def _import_times(arguments, stdin, env, workdir):
+    """
+    Return the (total, project) import times in ms, from the self times of -X importtime.
+    """
+    total = project = 0
+    for line in _run(arguments, stdin, env, workdir, ["-X", "importtime"]).stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # ligne d'en-tête
+        total += int(own)
+        if name.strip().startswith(PROJECT_PACKAGES):
+            project += int(own)
+    return total / 1000, project / 1000
+
+
+def _median_ms(arguments, stdin, env, workdir):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        _run(arguments, stdin, env, workdir)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        try:
+            _setup()
+            env = dict(os.environ, CHESS_DATA_DIR=storage.DATA_DIR, PYTHONPATH=ROOT,
+                       PYTHONPYCACHEPREFIX=os.path.join(workdir, "pycache"))
+            env.pop("PYTHONDONTWRITEBYTECODE", None)
+            print(f"{'commande':>18} | {'démarrage (ms)':>14} | {'imports (ms)':>12} | {'dont projet (ms)':>16}")
+            for name, arguments, stdin in COMMANDS:
+                _run(arguments, stdin, env, workdir)  # met le bytecode en cache
+                elapsed = _median_ms(arguments, stdin, env, workdir)
+                imports, project = _import_times(arguments, stdin, env, workdir)
+                print(f"{name:>18} | {elapsed:>14.1f} | {imports:>12.1f} | {project:>16.1f}")
+        finally:
+            storage.set_data_dir(storage.resolve_data_dir())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Benchmark suite: the main code paths timed on synthetic tournaments, with JSON output.
+
+For each field size a rating list of that many players is stored and one tournament is played
+with all of them through the controller (synthetic results, see benchmarks.synthetic). Every
+round times the real code paths:
+
+    start_new_round          pairing and saving the new round
+    enter_results_for_round  entering the results of the round and saving them
+    get_tournament_rankings  ranking with tiebreaks after the round
+    load_players             reading the rating list from storage (cache invalidated first)
+    save_tournaments         rewriting all the tournaments
+
+The storage backend is the one selected by CHESS_STORAGE. The results (with the machine,
+backend and pairing engine) are written as JSON; a previous output can be given as a baseline
+to print the ratio of each median time:
+
+    python -m benchmarks.suite --players 16,256,1000,5000 --rounds 9 --output avant.json
+    python -m benchmarks.suite --players 16,256,1000,5000 --rounds 9 --baseline avant.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import RESULT_MODES, draw_round_results, make_players  # noqa: E402
+from controllers.tournament_controller import TournamentController  # noqa: E402
+from models import storage  # noqa: E402
+from models.pairing import ENGINE_VERSION  # noqa: E402
+from models.player import PlayerRepository  # noqa: E402
+from models.tournament import TournamentRepository  # noqa: E402
+
+OPERATIONS = ["start_new_round", "enter_results_for_round", "get_tournament_rankings", "load_players",
+              "save_tournaments"]
+DEFAULT_SIZES = "16,256,1000,5000"
+DEFAULT_ROUNDS = 9
+SEED = 2024
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Chronométrage des opérations principales sur des tournois "
+                                                 "synthétiques.")
+    parser.add_argument("--players", default=DEFAULT_SIZES, help="Tailles de tournoi, séparées par des virgules.")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--results", choices=RESULT_MODES, default="random",
+                        help="Résultats tirés au hasard ou selon l'écart de classement Elo.")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="Fichier JSON des résultats (par défaut, la sortie standard).")
+    parser.add_argument("--baseline", help="Résultats JSON d'une exécution précédente à comparer.")
+    return parser
+
+
+def run_size(size, rounds, mode, seed):
+    """
+    Play one synthetic tournament of `size` players and return the number of rounds played
+    (fewer than `rounds` when a small field runs out of legal pairings) and the timings of
+    each operation.
+    """
+    rng = random.Random(seed)
+    shutil.rmtree(storage.DATA_DIR, ignore_errors=True)
+    os.makedirs(storage.DATA_DIR)
+    PlayerRepository.invalidate()
+    TournamentRepository.invalidate()
+    players, ratings = make_players(size, rng)
+    PlayerRepository.add_players(players)
+    tournament = TournamentController.create_tournament(f"Synthétique {size}", "Paris", "2025-01-01", "2025-01-09",
+                                                        "", number_of_rounds=rounds, pairing_seed=str(seed))
+    TournamentController.register_players_to_tournament(tournament, [p.id for p in players])
+
+    timings = {name: [] for name in OPERATIONS}
+
+    def timed(name, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        timings[name].append(time.perf_counter() - start)
+        return result
+
+    for _ in range(min(rounds, size - 1)):
+        new_round, message = timed("start_new_round", TournamentController.start_new_round, tournament)
+        if message:
+            # Petit tableau : plus d'appariement légal possible avant le dernier round.
+            timings["start_new_round"].pop()
+            break
+        results = draw_round_results(new_round.matches, ratings, rng, mode)
+        timed("enter_results_for_round", TournamentController.enter_results_for_round, tournament, results)
+        timed("get_tournament_rankings", TournamentController.get_tournament_rankings, tournament)
+        PlayerRepository.invalidate()
+        timed("load_players", PlayerRepository.load_players)
+        timed("save_tournaments", TournamentRepository.save_tournaments, TournamentRepository.load_tournaments())
+    return len(tournament.rounds), {name: _summary(values) for name, values in timings.items()}
+
+
+def _summary(values):
+    return {"calls": len(values), "total": sum(values), "median": statistics.median(values), "max": max(values)}
+
+
+def run(sizes, rounds, mode, seed):
+    """
+    Run the suite in a temporary directory and return the JSON document of the results.
+    """
+    document = {"meta": _meta(rounds, mode, seed), "runs": []}
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        storage.set_data_dir(os.path.join(workdir, "data"))
+        try:
+            for size in sizes:
+                played, operations = run_size(size, rounds, mode, seed)
+                document["runs"].append({"players": size, "rounds": played, "operations": operations})
+                print(f"{size} joueurs : terminé", file=sys.stderr)
+        finally:
+            os.chdir(previous_cwd)
+            storage.set_data_dir(storage.resolve_data_dir())
+    return document
+
+
+def _meta(rounds, mode, seed):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "storage": os.environ.get("CHESS_STORAGE", "json"),
+        "pairing_engine": ENGINE_VERSION,
+        "rounds": rounds,
+        "results": mode,
+        "seed": seed,
+    }
+
+
+def compare(document, baseline):
+    """
+    Print the median time of every operation next to the baseline's, with their ratio.
+    """
+    previous = {(r["players"], name): op for r in baseline["runs"] for name, op in r["operations"].items()}
+    print(f"référence : {baseline['meta'].get('commit')} ({baseline['meta'].get('storage')}), "
+          f"actuel : {document['meta'].get('commit')} ({document['meta'].get('storage')})")
+    differences = [key for key in ("rounds", "results", "seed", "pairing_engine")
+                   if baseline["meta"].get(key) != document["meta"].get(key)]
+    if differences:
+        print(f"⚠️ paramètres différents de la référence : {', '.join(differences)}")
+    print(f"{'joueurs':>7} | {'opération':>23} | {'référence (ms)':>14} | {'actuel (ms)':>11} | {'ratio':>6}")
+    for run_ in document["runs"]:
+        for name, op in run_["operations"].items():
+            before = previous.get((run_["players"], name))
+            if before is None:
+                continue
+            ratio = op["median"] / before["median"] if before["median"] else float("inf")
+            print(f"{run_['players']:>7} | {name:>23} | {before['median'] * 1000:>14.2f} | "
+                  f"{op['median'] * 1000:>11.2f} | {ratio:>6.2f}")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sizes = [int(size) for size in args.players.split(",")]
+    document = run(sizes, args.rounds, args.results, args.seed)
+    encoded = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(encoded + "\n")
+    elif not args.baseline:
+        print(encoded)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(document, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Synthetic players, tournaments and results for the benchmarks.
+
+Players get deterministic ids and names and a synthetic rating, used only to draw results:
+either uniformly ("random") or from the Elo expected score of the two players, with draws
+more frequent between close ratings ("elo"). Everything is drawn from the given random.Random,
+so a seed always produces the same event.
+
+make_archive builds a history of many small tournaments in their serialized form (the
+dictionaries read from storage), for the code that goes through the whole history.
+"""
+from models.player import Player
+from models.round import Match
+
+RESULT_MODES = ("random", "elo")
+
+RATING_MEAN = 1800
+RATING_DEVIATION = 300
+DRAW_RATE = 0.3  # probabilité de nulle entre deux joueurs de même force
+ARCHIVE_TOURNAMENT_SIZE = 100
+ARCHIVE_ROUNDS = 9
+
+
+def make_players(count, rng):
+    """
+    Return `count` players and their synthetic ratings ({player id: rating}).
+    """
+    players = [Player(f"Nom{i}", f"Prenom{i}", f"{1950 + i % 50}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                      player_id=f"synthetic_{i}")
+               for i in range(count)]
+    ratings = {p.id: max(1000, min(2800, round(rng.gauss(RATING_MEAN, RATING_DEVIATION)))) for p in players}
+    return players, ratings
+
+
+def expected_score(rating, opponent_rating):
+    """
+    Expected score of a player against an opponent under the Elo model.
+    """
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def draw_result(match, ratings, rng, mode="random"):
+    """
+    Return the (score1, score2) of a match; a bye always scores (1.0, 0.0).
+    """
+    if match.is_bye:
+        return 1.0, 0.0
+    if mode == "random":
+        return rng.choice([(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)])
+    expected = expected_score(ratings[match.player1_id], ratings[match.player2_id])
+    draw = DRAW_RATE * (1 - abs(2 * expected - 1))
+    roll = rng.random()
+    if roll < expected - draw / 2:
+        return 1.0, 0.0
+    if roll < expected + draw / 2:
+        return 0.5, 0.5
+    return 0.0, 1.0
+
+
+def draw_round_results(matches, ratings, rng, mode="random"):
+    """
+    Return the results of a round's matches, in order, as expected by enter_results_for_round.
+    """
+    return [draw_result(match, ratings, rng, mode) for match in matches]
+
+
+def make_archive(games, player_count, rng):
+    """
+    Return `player_count` players and serialized tournaments of 100 of them totalling about
+    `games` games (results drawn in "elo" mode), each player's rating at registration being
+    their synthetic rating. Returns (players, tournaments, games played).
+    """
+    players, ratings = make_players(player_count, rng)
+    ids = [p.id for p in players]
+    tournaments = []
+    played = 0
+    day = 0
+    while played < games:
+        day += 1
+        entrants = rng.sample(ids, ARCHIVE_TOURNAMENT_SIZE)
+        rounds = []
+        for _ in range(ARCHIVE_ROUNDS):
+            rng.shuffle(entrants)
+            matches = []
+            for pid1, pid2 in zip(entrants[::2], entrants[1::2]):
+                match = Match(pid1, pid2)
+                match.set_result(*draw_result(match, ratings, rng, "elo"))
+                matches.append(match.to_list())
+            rounds.append({"name": "Round", "end_time": "2025-01-01 20:00:00", "matches": matches})
+            played += len(matches)
+        date = f"{2000 + day // 365:04d}-{day % 365 // 31 + 1:02d}-{day % 28 + 1:02d}"
+        tournaments.append({"id": f"archive_{day}", "name": f"Archive {day}", "location": "Paris",
+                            "start_date": date, "end_date": date, "description": "",
+                            "number_of_rounds": ARCHIVE_ROUNDS, "players": list(entrants),
+                            "ratings": {pid: ratings[pid] for pid in entrants}, "rounds": rounds})
+    return players, tournaments, played
@@ -1,4 +1,6 @@
+from models import elo, storage
 from models.player import Player, PlayerRepository
+from models.tournament import TournamentRepository
 
 
 class PlayerController:
@@ -25,3 +27,39 @@ class PlayerController:
         if sorted_by_name:
             players.sort(key=lambda p: (p.last_name.lower(), p.first_name.lower()))
         return players
+
+    @staticmethod
+    def search_players(query="", offset=0, limit=None):
+        """
+        Return the players whose "last name first name" starts with the query (accents and case
+        ignored), sorted by name.
+        """
+        return PlayerRepository.get_index().search(query, offset, limit)
+
+    @staticmethod
+    def rerate_players():
+        """
+        Recompute every Elo rating over the whole tournament history (see models.elo.rerate) and
+        save the players whose rating changed in one write. Returns (games rated, players changed).
+        """
+        players = PlayerRepository.load_players()
+        before = {p.id: (p.rating, p.k_factor, p.games) for p in players}
+        games = elo.rerate(players, storage.get_backend().load_tournaments())
+        changed = [p for p in players if before[p.id] != (p.rating, p.k_factor, p.games)]
+        PlayerRepository.save_players(players, changed=changed)
+        return games, len(changed)
+
+    @staticmethod
+    def get_career(player_id):
+        """
+        Return the career summary of a player over all tournaments (see models.analytics), or
+        None if they never entered one.
+        """
+        return TournamentRepository.get_analytics().career(player_id)
+
+    @staticmethod
+    def get_head_to_head(player_id, opponent_id):
+        """
+        Return the record of a player against an opponent over all tournaments.
+        """
+        return TournamentRepository.get_analytics().head_to_head(player_id, opponent_id)
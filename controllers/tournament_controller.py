@@ -1,21 +1,65 @@
 from models.tournament import Tournament, TournamentRepository
 from models.player import PlayerRepository
+from models.derived_cache import DerivedCache
+from models.elo import rate_round
+from models.pairing import ENGINE_VERSION, PairingError, pair_round, rank_for_pairing, seeded_random
+from models.pairing_history import PairingHistory
+from models.round import Match, Round
+from models.standings import StandingsLedger
+from models.tiebreaks import TIEBREAKS, rank_players, validate_order
 from datetime import datetime
+import os
 import random
 
 
 class TournamentController:
+    # Callables notified as listener(event, tournament) after a round or a result is committed
+    # (see views.change_feed); the event is the name of the controller method.
+    _listeners = []
+    # Standings, pairing tables and round history already computed, see models.derived_cache.
+    _derived = DerivedCache()
+
+    @staticmethod
+    def subscribe(listener):
+        """
+        Register a listener called after each committed round start, result or round end.
+        """
+        TournamentController._listeners.append(listener)
+
+    @staticmethod
+    def unsubscribe(listener):
+        TournamentController._listeners.remove(listener)
+
     @staticmethod
-    def create_tournament(name, location, start_date, end_date, description):
+    def _notify(event, tournament):
+        TournamentController._derived.invalidate(tournament.id)
+        for listener in list(TournamentController._listeners):
+            listener(event, tournament)
+
+    @staticmethod
+    def _changed(tournament):
+        """
+        Drop the derived data of a tournament changed by an operation that publishes no event.
+        """
+        TournamentController._derived.invalidate(tournament.id)
+
+    @staticmethod
+    def create_tournament(name, location, start_date, end_date, description, number_of_rounds=4,
+                          pairing_seed=None):
         """
         Create a new tournament and save it to the repository.
+
+        Every new tournament is paired with a seed (a random one unless `pairing_seed` is given),
+        so that its rounds can be replayed (see models.replay).
         """
         tournament = Tournament(
             name=name,
             location=location,
             start_date=start_date,
             end_date=end_date,
-            description=description
+            description=description,
+            number_of_rounds=number_of_rounds,
+            pairing_seed=pairing_seed or os.urandom(8).hex()
         )
         TournamentRepository.add_tournament(tournament)
         return tournament
@@ -27,6 +71,20 @@ class TournamentController:
         """
         return TournamentRepository.load_tournaments()
 
+    @staticmethod
+    def get_tournament_catalog():
+        """
+        Return the lightweight catalog records used to list tournaments without loading their rounds.
+        """
+        return TournamentRepository.load_catalog()
+
+    @staticmethod
+    def get_tournament(tournament_id):
+        """
+        Load and return a single tournament, or None if it does not exist.
+        """
+        return TournamentRepository.get_tournament(tournament_id)
+
     @staticmethod
     def get_all_players():
         """
@@ -34,24 +92,31 @@ class TournamentController:
         """
         return PlayerRepository.load_players()
 
+    @staticmethod
+    def get_player(player_id):
+        """
+        Return the player with the given id, or None if it does not exist.
+        """
+        return PlayerRepository.get_player(player_id)
+
     @staticmethod
     def register_players_to_tournament(tournament, player_ids):
         """
-        Register multiple players to a given tournament.
+        Register multiple players to a given tournament, recording their current rating.
         """
+        registered = set(tournament.players)
+        players = PlayerRepository.get_index()
         added = 0
         for pid in player_ids:
-            if pid not in tournament.players:
+            if pid not in registered:
                 tournament.players.append(pid)
+                registered.add(pid)
+                if pid in players:
+                    tournament.ratings[pid] = players[pid].rating
                 added += 1
 
-        all_tournaments = TournamentController.get_all_tournaments()
-        for i, t in enumerate(all_tournaments):
-            if t.id == tournament.id:
-                all_tournaments[i] = tournament
-                break
-
-        TournamentRepository.save_tournaments(all_tournaments)
+        TournamentRepository.save_tournament(tournament)
+        TournamentController._changed(tournament)
         return added
 
     @staticmethod
@@ -59,121 +124,281 @@ class TournamentController:
         """
         Retrieve player objects registered in a given tournament.
         """
-        all_players = TournamentController.get_all_players()
-        return [p for p in all_players if p.id in tournament.players]
+        players = PlayerRepository.get_index()
+        return [players[pid] for pid in tournament.players if pid in players]
 
     @staticmethod
     def start_new_round(tournament):
         """
         Start a new round in the tournament, generate matches,
         and update the tournament accordingly.
+
+        Players are paired by the Swiss pairing engine (see models.pairing): score groups are
+        kept together, rematches are forbidden and the lowest-ranked player without a bye
+        receives it when the number of players is odd. Players on equal scores are ordered by
+        rating at registration, then with the tournament's pairing seed, which is stored with
+        the round.
         """
-        if tournament.current_round >= tournament.number_of_rounds:
-            return None, "Tous les rounds ont déjà été joués."
+        refusal = TournamentController._round_refusal(tournament)
+        if refusal:
+            return None, refusal
+
+        pairs, error = _pair_section(TournamentController._pairing_input(tournament))
+        if error:
+            return None, error
+
+        new_round = TournamentController._add_round(tournament, pairs)
+        TournamentRepository.save_tournament(tournament)
+        TournamentController._notify("start_new_round", tournament)
+        return new_round, None
+
+    @staticmethod
+    def start_new_rounds(tournaments, workers=None):
+        """
+        Start the next round of several independent tournaments, such as the sections of one
+        event, and save them together in a single write.
 
+        The pairings of the sections are computed in parallel in a pool of `workers` processes
+        (one per core by default); as each section is ordered with its own pairing seed, the
+        pairings do not depend on the number of workers. Returns a (new_round, message) pair
+        per tournament, in order, as start_new_round.
+        """
+        outcomes = [(None, TournamentController._round_refusal(t)) for t in tournaments]
+        pending = [i for i, (_, refusal) in enumerate(outcomes) if refusal is None]
+        jobs = [TournamentController._pairing_input(tournaments[i]) for i in pending]
+
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        if workers > 1:
+            # Importé ici : le pool de processus coûte cher au démarrage et ne sert qu'ici.
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_pair_section, jobs))
+        else:
+            results = [_pair_section(job) for job in jobs]
+
+        started = []
+        for i, (pairs, error) in zip(pending, results):
+            if error:
+                outcomes[i] = (None, error)
+                continue
+            outcomes[i] = (TournamentController._add_round(tournaments[i], pairs), None)
+            started.append(tournaments[i])
+        TournamentRepository.save_changed(started)
+        for tournament in started:
+            TournamentController._notify("start_new_round", tournament)
+        return outcomes
+
+    @staticmethod
+    def _round_refusal(tournament):
+        """
+        Return the reason why the next round of a tournament cannot start, or None.
+        """
+        if tournament.current_round >= tournament.number_of_rounds:
+            return "Tous les rounds ont déjà été joués."
         if len(tournament.players) < 2:
-            return None, "Pas assez de joueurs inscrits pour générer un round."
+            return "Pas assez de joueurs inscrits pour générer un round."
+        if TournamentController.get_current_round(tournament) is not None:
+            return "Le round en cours n'est pas terminé : saisissez d'abord ses résultats."
+        return None
 
-        all_players = TournamentController.get_all_players()
-        player_dict = {p.id: p for p in all_players}
-        scores = {pid: player_dict[pid].score for pid in tournament.players}
-        sorted_players = sorted(tournament.players, key=lambda pid: (-scores[pid], random.random()))
+    @staticmethod
+    def _pairing_input(tournament):
+        """
+        Return the arguments of pair_round for the next round of the tournament.
+        """
+        if tournament.pairing_seed is None:
+            rng = random  # tournoi créé avant les appariements reproductibles
+        else:
+            rng = seeded_random(tournament.pairing_seed, len(tournament.rounds) + 1)
+        scores = {pid: tournament.standings.score(pid) for pid in tournament.players}
+        history = tournament.pairing_history
+        ranked = rank_for_pairing(tournament.players, scores, rng, tournament.ratings)
+        return ranked, scores, history, history.bye_ids()
 
-        past_pairs = set()
-        for round_ in tournament.rounds:
-            for match in round_["matches"]:
-                player1_id = match[0][0]
-                player2_id = match[1][0]
-                if player1_id is None or player2_id is None:
-                    continue  # ignorer les matchs avec bye
-                pair = tuple(sorted([player1_id, player2_id]))
-                past_pairs.add(pair)
-
-        matches = []
-        used = set()
-        i = 0
-        while i < len(sorted_players) - 1:
-            pid1 = sorted_players[i]
-            for j in range(i + 1, len(sorted_players)):
-                pid2 = sorted_players[j]
-                pair = tuple(sorted([pid1, pid2]))
-                if pair not in past_pairs and pid1 not in used and pid2 not in used:
-                    matches.append([[pid1, 0.0], [pid2, 0.0]])
-                    used.add(pid1)
-                    used.add(pid2)
-                    break
-            i += 1
-
-        if len(used) < len(sorted_players):
-            solo = [pid for pid in sorted_players if pid not in used][0]
-            matches.append([[solo, 1.0], [None, 0.0]])
+    @staticmethod
+    def _add_round(tournament, pairs):
+        """
+        Append a round made of the given pairs to the tournament (not saved).
+        """
+        matches = [Match(pid1, pid2, 1.0 if pid2 is None else 0.0) for pid1, pid2 in pairs]
 
         round_number = tournament.current_round + 1
         round_name = f"Round {round_number}"
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        new_round = {
-            "name": round_name,
-            "start_time": now,
-            "end_time": None,
-            "matches": matches
-        }
+        extra = {"pairing_engine": ENGINE_VERSION}
+        if tournament.pairing_seed is not None:
+            extra["pairing_seed"] = tournament.pairing_seed
+        new_round = Round(round_name, start_time=now, matches=matches, extra=extra)
         tournament.rounds.append(new_round)
+        tournament.pairing_history.record_round(matches)
         tournament.current_round = round_number
-        tournaments = TournamentController.get_all_tournaments()
-        for i, t in enumerate(tournaments):
-            if t.id == tournament.id:
-                tournaments[i] = tournament
-                break
-
-        TournamentRepository.save_tournaments(tournaments)
-        return new_round, None
+        return new_round
 
     @staticmethod
     def enter_results_for_round(tournament, match_results):
         """
         Record the results of the latest round's matches and update player scores.
+
+        All results are applied in memory in a single pass, then the round is closed and rated
+        (see models.elo), and players and tournament are persisted together in one write. The
+        tournament's standings ledger is updated alongside; the global Player.score remains a
+        career total. Results already counted (boards entered one by one, or a correction of a
+        finished round) replace their previous value instead of being added again.
         """
-        all_players = TournamentController.get_all_players()
-        player_dict = {p.id: p for p in all_players}
+        last_round = tournament.rounds[-1]
+        matches = last_round.matches
+        if len(match_results) != len(matches):
+            raise ValueError("Un résultat est attendu pour chaque match du round.")
+
+        player_dict = PlayerRepository.get_index()
+
+        for match, (score1, score2) in zip(matches, match_results):
+            previous1, previous2 = TournamentController._counted_scores(match, last_round.is_finished)
+            match.set_result(score1, score2)
+            player_dict[match.player1_id].score += match.score1 - previous1
+            if not match.is_bye:
+                player_dict[match.player2_id].score += match.score2 - previous2
+        tournament.standings.record_round(len(tournament.rounds) - 1, matches)
+
+        if not last_round.is_finished:
+            rate_round(last_round, player_dict)
+        last_round.end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        changed_players = [player_dict[pid] for match in matches for pid in match.player_ids()]
+        TournamentRepository.commit(tournament, changed_players=changed_players)
+        TournamentController._notify("enter_results_for_round", tournament)
 
-        for match, result in zip(tournament.rounds[-1]["matches"], match_results):
-            match[0][1], match[1][1] = result
-            if match[0][0] is not None:
-                player_dict[match[0][0]].score += match[0][1]
-            if match[1][0] is not None:
-                player_dict[match[1][0]].score += match[1][1]
+    @staticmethod
+    def enter_board_results(tournament, results_by_board):
+        """
+        Record the results of the round in progress given as {board number: (score1, score2)},
+        boards being numbered from 1 in pairing order; byes are scored automatically.
+
+        Raises ValueError when no round is in progress or a board is missing or unknown.
+        """
+        current_round = TournamentController.get_current_round(tournament)
+        if current_round is None:
+            raise ValueError("Aucun round en cours.")
+        given = dict(results_by_board)
+        results = []
+        for board, match in enumerate(current_round.matches, start=1):
+            if match.is_bye:
+                given.pop(board, None)
+                results.append((1.0, 0.0))
+            elif board in given:
+                results.append(given.pop(board))
+            else:
+                raise ValueError(f"Résultat manquant pour l'échiquier {board}.")
+        if given:
+            raise ValueError(f"Échiquier(s) inconnu(s) : {', '.join(map(str, sorted(given)))}")
+        TournamentController.enter_results_for_round(tournament, results)
+        return current_round
+
+    @staticmethod
+    def get_round_pairings(tournament):
+        """
+        Describe the latest round of the tournament (pairings and results entered so far) as
+        plain data, or return None before the first round.
+
+        Like the other display data below, the description is computed once per state of the
+        tournament (see models.derived_cache) and must not be modified.
+        """
+        if not tournament.rounds:
+            return None
+        last = len(tournament.rounds) - 1
+        return TournamentController._derived.get(tournament, "pairings",
+                                                 lambda: TournamentController._describe_round(tournament, last))
 
-        PlayerRepository.save_players(list(player_dict.values()))
-        tournament.rounds[-1]["end_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        tournaments = TournamentController.get_all_tournaments()
-        for i, t in enumerate(tournaments):
-            if t.id == tournament.id:
-                tournaments[i] = tournament
-                break
-        TournamentRepository.save_tournaments(tournaments)
+    @staticmethod
+    def get_rounds_history(tournament):
+        """
+        Describe every round of the tournament as plain data, in the format of get_round_pairings.
+        """
+        return TournamentController._derived.get(tournament, "rounds", lambda: [
+            TournamentController._describe_round(tournament, index) for index in range(len(tournament.rounds))])
+
+    @staticmethod
+    def _describe_round(tournament, index):
+        players = PlayerRepository.get_index()
+
+        def describe(player_id):
+            player = players.get(player_id) if player_id else None
+            if player is None:
+                return None
+            return {"id": player.id, "name": f"{player.first_name} {player.last_name}"}
+
+        round_ = tournament.rounds[index]
+        return {
+            "round": round_.name,
+            "number": index + 1,
+            "start_time": round_.start_time,
+            "end_time": round_.end_time,
+            "matches": [
+                {"board": board, "white": describe(match.player1_id), "black": describe(match.player2_id),
+                 "result": match.result_code()}
+                for board, match in enumerate(round_.matches, start=1)
+            ],
+        }
+
+    @staticmethod
+    def get_standings_table(tournament):
+        """
+        Return the standings as plain data: one dict per player with rank, id, names, score and
+        tiebreak values (by tiebreak name, in the tournament's order).
+        """
+        return TournamentController._derived.get(tournament, "standings_table", lambda: [
+            {"rank": rank, "id": player.id, "first_name": player.first_name, "last_name": player.last_name,
+             "score": score, "tiebreaks": dict(zip(tournament.tiebreaks, values))}
+            for rank, (player, score, values) in enumerate(
+                TournamentController.get_tournament_standings(tournament), start=1)
+        ])
 
     @staticmethod
     def get_tournament_rankings(tournament):
         """
-        Get the current rankings of players in the tournament.
+        Get the current rankings of players in the tournament, ties being broken by the
+        tournament's tiebreak order.
         """
-        all_players = TournamentController.get_all_players()
-        player_dict = {p.id: p for p in all_players}
-        return sorted(
-            [(player_dict[pid], player_dict[pid].score) for pid in tournament.players],
-            key=lambda x: -x[1]
-        )
+        return [(player, score) for player, score, _ in TournamentController.get_tournament_standings(tournament)]
+
+    @staticmethod
+    def get_tournament_standings(tournament):
+        """
+        Get the ranked (player, score, tiebreak values) rows of the tournament, the tiebreak
+        values being listed in the tournament's tiebreak order.
+
+        Everything is read from the tournament's standings ledger, so the games already entered
+        in the round in progress count, as in the scores used for pairing.
+        """
+        def build():
+            ranking = rank_players(tournament.players, tournament.standings, tournament.tiebreaks)
+            return [
+                (PlayerRepository.get_player(pid), values["score"], [values[name] for name in tournament.tiebreaks])
+                for pid, values in ranking
+            ]
+
+        return TournamentController._derived.get(tournament, "standings", build)
+
+    @staticmethod
+    def set_tiebreak_order(tournament, order):
+        """
+        Set the tiebreak order of the tournament and save it. Raises ValueError on an unknown tiebreak.
+        """
+        tournament.tiebreaks = validate_order(order)
+        TournamentRepository.save_tournament(tournament)
+        TournamentController._changed(tournament)
 
     @staticmethod
     def close_tournament(tournament):
         """
         Close the tournament if all rounds are completed.
         """
-        if any(r["end_time"] is None for r in tournament.rounds):
+        if any(not r.is_finished for r in tournament.rounds):
             return False
         tournament.is_closed = True
-        TournamentRepository.save_tournaments(TournamentController.get_all_tournaments())
+        TournamentRepository.save_tournament(tournament)
+        TournamentController._changed(tournament)
         return True
 
     @staticmethod
@@ -185,41 +410,104 @@ class TournamentController:
             return None
 
         last_round = tournament.rounds[-1]
-        if last_round["end_time"] is None:
+        if not last_round.is_finished:
             return last_round
         return None
 
     @staticmethod
-    def set_match_result(match, score1, score2):
+    def set_match_result(match, score1, score2, tournament=None):
         """
         Set the result of a specific match and update the corresponding player scores.
+
+        When the match's tournament is given, the result is also recorded in its standings
+        ledger (as part of the latest round) and saved together with the players. Setting the
+        result of a board again corrects it: the previous result is taken off the scores first.
         """
-        match[0][1] = score1
-        match[1][1] = score2
+        finished = tournament is not None and tournament.rounds[-1].is_finished
+        previous1, previous2 = TournamentController._counted_scores(match, finished)
+        match.set_result(score1, score2)
+
+        player_dict = PlayerRepository.get_index()
 
-        all_players = PlayerRepository.load_players()
-        player_dict = {p.id: p for p in all_players}
+        changed = [player_dict[pid] for pid in match.player_ids()]
+        changed[0].score += match.score1 - previous1
+        if not match.is_bye:
+            changed[1].score += match.score2 - previous2
 
-        if match[0][0] is not None:
-            player_dict[match[0][0]].score += score1
-        if match[1][0] is not None:
-            player_dict[match[1][0]].score += score2
+        if tournament is None:
+            PlayerRepository.save_players(PlayerRepository.load_players(), changed=changed)
+            return
+        tournament.standings.record_match(len(tournament.rounds) - 1, match)
+        TournamentRepository.commit(tournament, changed_players=changed)
+        TournamentController._notify("set_match_result", tournament)
 
-        PlayerRepository.save_players(list(player_dict.values()))
+    @staticmethod
+    def _counted_scores(match, round_finished):
+        """
+        Return the (score1, score2) of the match already added to the players' scores: every
+        result of a finished round and, in a round in progress, the games whose result was
+        entered (byes are only counted when the round ends); (0.0, 0.0) otherwise.
+        """
+        if round_finished or (not match.is_bye and match.result_code() is not None):
+            return match.score1, match.score2
+        return 0.0, 0.0
 
     @staticmethod
     def finalize_round(tournament):
         """
-        Finalize the current round by setting its end time and saving the tournament.
+        Finalize the current round by setting its end time, count its byes, rate its games (see
+        models.elo) and save the tournament and the changed players together.
         """
         if tournament.rounds:
-            tournament.rounds[-1]["end_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            tournaments = TournamentController.get_all_tournaments()
-            for i, t in enumerate(tournaments):
-                if t.id == tournament.id:
-                    tournaments[i] = tournament
-                    break
-            TournamentRepository.save_tournaments(tournaments)
+            last_round = tournament.rounds[-1]
+            changed = []
+            if not last_round.is_finished:
+                player_dict = PlayerRepository.get_index()
+                # Les exempts ne sont comptés qu'à la fin du round (voir _counted_scores).
+                for match in last_round.matches:
+                    if match.is_bye:
+                        player_dict[match.player1_id].score += match.score1
+                        changed.append(player_dict[match.player1_id])
+                tournament.standings.record_round(len(tournament.rounds) - 1, last_round.matches)
+                changed += rate_round(last_round, player_dict)
+            last_round.end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            if changed:
+                TournamentRepository.commit(tournament, changed_players=changed)
+            else:
+                TournamentRepository.save_tournament(tournament)
+            TournamentController._notify("finalize_round", tournament)
+
+    @staticmethod
+    def check_pairing_history(tournament):
+        """
+        Verify the tournament's pairing index against its rounds.
+        Returns the ids of the players whose indexed history is inconsistent.
+        """
+        return tournament.pairing_history.check(tournament.rounds)
+
+    @staticmethod
+    def rebuild_pairing_history(tournament):
+        """
+        Rebuild the tournament's pairing index from its rounds (the index is not stored).
+        """
+        tournament.pairing_history = PairingHistory.from_rounds(tournament.rounds)
+        TournamentController._changed(tournament)
+
+    @staticmethod
+    def check_standings(tournament):
+        """
+        Verify the tournament's standings ledger against its rounds (see StandingsLedger.from_rounds).
+        Returns the ids of the players whose ledger entry is inconsistent.
+        """
+        return tournament.standings.check(tournament.rounds)
+
+    @staticmethod
+    def rebuild_standings(tournament):
+        """
+        Rebuild the tournament's standings ledger from its rounds (the ledger is not stored).
+        """
+        tournament.standings = StandingsLedger.from_rounds(tournament.rounds)
+        TournamentController._changed(tournament)
 
     @staticmethod
     def has_incomplete_rounds(tournament):
@@ -227,7 +515,7 @@ class TournamentController:
         Check whether the tournament still has any ongoing (incomplete) rounds.
         """
         for round_ in tournament.rounds:
-            if round_["end_time"] is None:
+            if not round_.is_finished:
                 return True
         return False
 
@@ -243,8 +531,22 @@ class TournamentController:
         print(f"📝 Description : {tournament.description}\n")
 
         print("📊 Classement final :")
-        rankings = TournamentController.get_tournament_rankings(tournament)
-        for i, (player, score) in enumerate(rankings, start=1):
-            print(f"  {i}. {player.first_name} {player.last_name} - {score} pts")
+        print(f"  Départages : {', '.join(TIEBREAKS[name] for name in tournament.tiebreaks)}")
+        standings = TournamentController.get_tournament_standings(tournament)
+        for i, (player, score, tiebreaks) in enumerate(standings, start=1):
+            print(f"  {i}. {player.first_name} {player.last_name} - {score} pts "
+                  f"({' / '.join(f'{value:g}' for value in tiebreaks)})")
 
         print("\n✅ Le tournoi est maintenant clôturé.\n")
+
+
+def _pair_section(job):
+    """
+    Pair one tournament from the arguments built by TournamentController._pairing_input.
+    Returns (pairs, None), or (None, message) when no legal pairing exists. Kept at module level
+    so that it can run in a worker process.
+    """
+    try:
+        return pair_round(*job), None
+    except PairingError as error:
+        return None, str(error)
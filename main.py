@@ -1,63 +1,98 @@
-from views.player_view import create_player_view, list_players_view
-from views.tournament_view import (
-    create_tournament_view,
-    list_tournaments_view,
-    register_players_to_tournament_view,
-    show_players_in_tournament_view,
-    start_new_round_view,
-    enter_results_for_round_view,
-    show_rounds_history_view,
-    show_player_rankings_view,
-    close_tournament_view
-)
+"""
+Entry point: the interactive menu, or one command of views.cli when arguments are given.
+
+Only the module of the chosen menu entry or command is imported, when it is run: a scripted
+call such as « python main.py players list » does not pay for the tournament views, the
+pairing engine or the HTTP server.
+"""
+import importlib
+import sys
+
+PROFILE_OUTPUT = "profile.json"  # Report of python main.py --profile
+
+# Entrées du menu : (libellé, module de la vue, fonction), importées au premier choix.
+MENU = [
+    ("Ajouter un joueur", "views.player_view", "create_player_view"),
+    ("Afficher les joueurs", "views.player_view", "list_players_view"),
+    ("Créer un tournoi", "views.tournament_view", "create_tournament_view"),
+    ("Afficher les tournois", "views.tournament_view", "list_tournaments_view"),
+    ("Inscrire des joueurs dans un tournoi", "views.tournament_view", "register_players_to_tournament_view"),
+    ("Voir les joueurs d’un tournoi", "views.tournament_view", "show_players_in_tournament_view"),
+    ("Démarrer un round", "views.tournament_view", "start_new_round_view"),
+    ("Entrer les résultats d’un round", "views.tournament_view", "enter_results_for_round_view"),
+    ("Historique des rounds", "views.tournament_view", "show_rounds_history_view"),
+    ("Classement des joueurs", "views.tournament_view", "show_player_rankings_view"),
+    ("Clôturer un tournoi", "views.tournament_view", "close_tournament_view"),
+    ("Départages d’un tournoi", "views.tournament_view", "configure_tiebreaks_view"),
+    ("Historique d’un joueur", "views.player_view", "player_history_view"),
+    ("Mesures de la session", "views.metrics_view", "show_metrics_view"),
+]
 
 
 def main_menu():
+    from models.storage import ConcurrentModificationError
+
+    quit_choice = str(len(MENU) + 1)
     while True:
         print("\n=== Menu Principal ===")
-        print("1. Ajouter un joueur")
-        print("2. Afficher les joueurs")
-        print("3. Créer un tournoi")
-        print("4. Afficher les tournois")
-        print("5. Inscrire des joueurs dans un tournoi")
-        print("6. Voir les joueurs d’un tournoi")
-        print("7. Démarrer un round")
-        print("8. Entrer les résultats d’un round")
-        print("9. Historique des rounds")
-        print("10. Classement des joueurs")
-        print("11. Clôturer un tournoi")
-        print("12. Quitter")
+        for number, (label, _, _) in enumerate(MENU, start=1):
+            print(f"{number}. {label}")
+        print(f"{quit_choice}. Quitter")
 
         choice = input("Votre choix : ").strip()
 
-        if choice == "1":
-            create_player_view()
-        elif choice == "2":
-            list_players_view()
-        elif choice == "3":
-            create_tournament_view()
-        elif choice == "4":
-            list_tournaments_view()
-        elif choice == "5":
-            register_players_to_tournament_view()
-        elif choice == "6":
-            show_players_in_tournament_view()
-        elif choice == "7":
-            start_new_round_view()
-        elif choice == "8":
-            enter_results_for_round_view()
-        elif choice == "9":
-            show_rounds_history_view()
-        elif choice == "10":
-            show_player_rankings_view()
-        elif choice == "11":
-            close_tournament_view()
-        elif choice == "12":
+        if choice == quit_choice:
             print("Au revoir !")
             break
-        else:
+        if not choice.isdigit() or not 1 <= int(choice) <= len(MENU):
             print("Choix invalide. Réessayez.")
+            continue
+        _, module, function = MENU[int(choice) - 1]
+        try:
+            getattr(importlib.import_module(module), function)()
+        except ConcurrentModificationError as error:
+            # Un autre poste a modifié les mêmes données : elles sont rechargées à la prochaine action.
+            print(f"\n⚠️  {error}\n")
 
 
-if __name__ == "__main__":
+def run(argv):
+    """
+    Run the command line given in `argv` (see views.cli), or the interactive menu without one.
+    Returns the process exit status.
+    """
+    if argv:
+        # Mode non interactif : python main.py <commande> ... (voir views.cli)
+        from views.cli import main
+
+        return main(argv)
     main_menu()
+    return 0
+
+
+def run_profiled(argv, path):
+    """
+    Run the session with the controllers and repositories instrumented and cProfile and
+    tracemalloc running (see models.instrumentation); the report is written to `path` and
+    summarized on the error output at the end.
+    """
+    from controllers.player_controller import PlayerController
+    from controllers.tournament_controller import TournamentController
+    from models import instrumentation
+    from models.player import Player, PlayerRepository
+    from models.tournament import Tournament, TournamentRepository
+    from views.metrics_view import format_report
+
+    classes = [PlayerRepository, TournamentRepository, PlayerController, TournamentController]
+    with instrumentation.profiled_session(path, classes, [Player, Tournament]) as document:
+        status = run(argv)
+    print(format_report(document["operations"]), file=sys.stderr)
+    print(f"📈 Mesures enregistrées dans {path} (profil cProfile : {document['cprofile']})", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    if arguments and arguments[0].partition("=")[0] == "--profile":
+        # python main.py --profile[=rapport.json] [commande ...]
+        sys.exit(run_profiled(arguments[1:], arguments[0].partition("=")[2] or PROFILE_OUTPUT))
+    sys.exit(run(arguments))
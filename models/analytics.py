@@ -0,0 +1,210 @@
+"""
+Cross-tournament player history and head-to-head index.
+
+The index is built in one pass over all the tournaments (their stored dictionaries, or the
+loaded Tournament objects) and then kept up to date as tournaments are saved (see
+TournamentRepository.get_analytics), so a player's career, a head-to-head record or a
+performance rating is read from a few counters, without going through the rounds again.
+
+Only finished rounds are counted. A game counts when its scores add up to one point (so double
+forfeits are left out, as for the Elo ratings); byes count for their points only. Opponent
+ratings are the ratings recorded at registration (Tournament.ratings), 1500 when none was.
+
+For every tournament the index keeps the games it counted for each round, with the ratings
+used: when a tournament is recorded again, only the rounds that changed (a new round, a
+corrected result) are taken out and counted again.
+"""
+from models.elo import DEFAULT_RATING, performance_rating
+
+
+def _games(matches, ratings):
+    """
+    Return the games of a round as (white, black, score1, score2, white rating, black rating)
+    tuples; a bye is (player id, None, score, 0.0, None, None).
+    """
+    return tuple((player1_id, player2_id, score1, score2,
+                  None if player2_id is None else ratings.get(player1_id, DEFAULT_RATING),
+                  None if player2_id is None else ratings.get(player2_id, DEFAULT_RATING))
+                 for player1_id, player2_id, score1, score2 in matches)
+
+
+class AnalyticsIndex:
+    """
+    Career records of the players and head-to-head tallies, over all tournaments.
+
+    `signature` is the storage signature of the tournaments the index was built from.
+    """
+    def __init__(self, signature=None):
+        self.players = {}      # player id -> career entry, see _entry
+        self.pairs = {}        # (player id, player id) in sorted order -> [wins of the first, draws, losses]
+        self.rounds = {}       # tournament id -> games counted for each round (None: round not counted)
+        self.tournaments = {}  # tournament id -> (name, start date)
+        self.signature = signature
+
+    @staticmethod
+    def from_tournaments(tournaments, signature=None):
+        """
+        Build the index from serialized tournaments (dictionaries, as stored).
+        """
+        index = AnalyticsIndex(signature)
+        for data in tournaments:
+            ratings = data.get("ratings") or {}
+            rounds = [None if rnd.get("end_time") is None else
+                      _games(((p1, p2, s1, s2) for (p1, s1), (p2, s2) in rnd.get("matches", [])), ratings)
+                      for rnd in data.get("rounds", [])]
+            index._record(data["id"], data["name"], data.get("start_date"), data.get("players", []), rounds)
+        return index
+
+    def record(self, tournament):
+        """
+        Count the finished rounds of a Tournament again, after it was changed.
+        """
+        rounds = [None if not rnd.is_finished else
+                  _games(((m.player1_id, m.player2_id, m.score1, m.score2) for m in rnd.matches), tournament.ratings)
+                  for rnd in tournament.rounds]
+        self._record(tournament.id, tournament.name, tournament.start_date, tournament.players, rounds)
+
+    def _record(self, tournament_id, name, start_date, player_ids, rounds):
+        self.tournaments[tournament_id] = (name, start_date)
+        for pid in player_ids:
+            self._entry(pid)["tournaments"].setdefault(tournament_id, [0, 0.0, 0.0, 0.0])
+        counted = self.rounds.get(tournament_id, [])
+        for round_index in range(max(len(counted), len(rounds))):
+            old = counted[round_index] if round_index < len(counted) else None
+            new = rounds[round_index] if round_index < len(rounds) else None
+            if old == new:
+                continue
+            for game in old or ():
+                self._count(tournament_id, round_index, game, -1)
+            for game in new or ():
+                self._count(tournament_id, round_index, game, 1)
+        self.rounds[tournament_id] = rounds
+
+    def _entry(self, player_id):
+        entry = self.players.get(player_id)
+        if entry is None:
+            entry = self.players[player_id] = {
+                "games": 0, "wins": 0, "draws": 0, "losses": 0, "points": 0.0, "opponent_ratings": 0.0,
+                "byes": 0, "bye_points": 0.0,
+                "opponents": {},    # opponent id -> games played together
+                "results": {},      # (tournament id, round index) -> (opponent id, points)
+                "tournaments": {},  # tournament id -> [games, points, opponent ratings, bye points]
+            }
+        return entry
+
+    def _count(self, tournament_id, round_index, game, sign):
+        """
+        Add (sign 1) or take out (sign -1) one game of a round.
+        """
+        player1_id, player2_id, score1, score2, rating1, rating2 = game
+        if player2_id is None:
+            entry = self._entry(player1_id)
+            entry["byes"] += sign
+            entry["bye_points"] += sign * score1
+            self._log(entry, tournament_id, round_index, None, score1, sign)
+            entry["tournaments"].setdefault(tournament_id, [0, 0.0, 0.0, 0.0])[3] += sign * score1
+            return
+        if score1 + score2 != 1:
+            return
+
+        for player_id, opponent_id, points, opponent_rating in ((player1_id, player2_id, score1, rating2),
+                                                                (player2_id, player1_id, score2, rating1)):
+            entry = self.players.get(player_id) or self._entry(player_id)
+            entry["games"] += sign
+            entry["points"] += sign * points
+            entry["opponent_ratings"] += sign * opponent_rating
+            entry["wins" if points == 1 else "losses" if points == 0 else "draws"] += sign
+            opponents = entry["opponents"]
+            count = opponents[opponent_id] = opponents.get(opponent_id, 0) + sign
+            if not count:
+                del opponents[opponent_id]
+            self._log(entry, tournament_id, round_index, opponent_id, points, sign)
+            totals = entry["tournaments"].get(tournament_id)
+            if totals is None:
+                totals = entry["tournaments"][tournament_id] = [0, 0.0, 0.0, 0.0]
+            totals[0] += sign
+            totals[1] += sign * points
+            totals[2] += sign * opponent_rating
+
+        pair = (player1_id, player2_id) if player1_id < player2_id else (player2_id, player1_id)
+        tally = self.pairs.setdefault(pair, [0, 0, 0])
+        column = 1 if score1 == score2 else 0 if (score1 == 1) == (pair[0] == player1_id) else 2
+        tally[column] += sign
+        if not any(tally):
+            del self.pairs[pair]
+
+    @staticmethod
+    def _log(entry, tournament_id, round_index, opponent_id, points, sign):
+        if sign > 0:
+            entry["results"][(tournament_id, round_index)] = (opponent_id, points)
+        else:
+            entry["results"].pop((tournament_id, round_index), None)
+
+    # --- Queries ------------------------------------------------------------------------------
+
+    def career(self, player_id):
+        """
+        Return the career summary of a player: games, wins, draws, losses, byes, points, number
+        of opponents, performance rating and, for each tournament entered (by start date), its
+        games, points (byes included) and performance. None for a player who never entered a
+        tournament.
+        """
+        entry = self.players.get(player_id)
+        if entry is None:
+            return None
+        tournaments = []
+        for tournament_id, (games, points, opponent_ratings, bye_points) in entry["tournaments"].items():
+            name, start_date = self.tournaments.get(tournament_id, ("", None))
+            tournaments.append({"id": tournament_id, "name": name, "start_date": start_date, "games": games,
+                                "points": points + bye_points,
+                                "performance": performance_rating(opponent_ratings, points, games)})
+        tournaments.sort(key=lambda t: t["start_date"] or "")
+        return {
+            "player": player_id,
+            "games": entry["games"],
+            "wins": entry["wins"],
+            "draws": entry["draws"],
+            "losses": entry["losses"],
+            "byes": entry["byes"],
+            "points": entry["points"] + entry["bye_points"],
+            "opponents": len(entry["opponents"]),
+            "performance": self.performance(player_id),
+            "tournaments": tournaments,
+        }
+
+    def head_to_head(self, player_id, opponent_id):
+        """
+        Return the record of a player against an opponent: games, wins, draws and losses, seen
+        from the first player.
+        """
+        first, second = sorted((player_id, opponent_id))
+        wins, draws, losses = self.pairs.get((first, second), (0, 0, 0))
+        if first != player_id:
+            wins, losses = losses, wins
+        return {"player": player_id, "opponent": opponent_id, "games": wins + draws + losses,
+                "wins": wins, "draws": draws, "losses": losses}
+
+    def performance(self, player_id, tournament_id=None):
+        """
+        Return the performance rating of a player over their career or in one tournament (see
+        models.elo.performance_rating), or None if they played no counted game there. Byes do
+        not count.
+        """
+        entry = self.players.get(player_id)
+        if entry is None:
+            return None
+        if tournament_id is None:
+            return performance_rating(entry["opponent_ratings"], entry["points"], entry["games"])
+        totals = entry["tournaments"].get(tournament_id)
+        if totals is None:
+            return None
+        games, points, opponent_ratings, _ = totals
+        return performance_rating(opponent_ratings, points, games)
+
+    def results(self, player_id):
+        """
+        Return the game log of a player: {(tournament id, round index): (opponent id, points)},
+        the opponent being None for a bye.
+        """
+        entry = self.players.get(player_id)
+        return entry["results"] if entry else {}
@@ -0,0 +1,75 @@
+from models import binary_format, storage
+from models.storage import JsonBackend, file_signature, locked
+
+
+class BinaryBackend(JsonBackend):
+    """
+    Storage backend keeping players and tournaments in a single compact binary file
+    (see models.binary_format).
+
+    The file is read from disk once per change and decoded on each load, which always hands out
+    fresh records. Saves follow the JSON backend: under the data
+    directory lock, the file is read again, versions are checked and only the changed records
+    are replaced before the whole file is rewritten.
+    """
+    name = "binary"
+    partial_saves = True
+
+    def __init__(self, path=None, lock_file=None):
+        super().__init__(lock_file=lock_file)
+        self.path = path or storage.BINARY_FILE
+        self._decoded = None
+        self._decoded_signature = None
+
+    def signature(self, kind):
+        """
+        Return a value that changes whenever the file changes (players and tournaments share it).
+        """
+        return file_signature(self.path)
+
+    def load_players(self):
+        """
+        Return every stored player as a dictionary.
+        """
+        return self._load()[0]
+
+    def load_tournaments(self):
+        """
+        Return every stored tournament as a dictionary.
+        """
+        return self._load()[1]
+
+    def commit(self, players=None, tournaments=None, changed_players=None, changed_tournaments=None):
+        """
+        Persist players and/or tournaments by rewriting the binary file in one staged write.
+        """
+        with locked(self.lock_file):
+            stored_players, stored_tournaments = self._load()
+            if players is not None or changed_players is not None:
+                stored_players = self._merge(stored_players, players, changed_players)
+            if tournaments is not None or changed_tournaments is not None:
+                stored_tournaments = self._merge(stored_tournaments, tournaments, changed_tournaments)
+            self.import_records(stored_players, stored_tournaments)
+
+    def import_records(self, players, tournaments):
+        """
+        Replace the whole stored content with the given player and tournament dictionaries.
+        """
+        with locked(self.lock_file):
+            storage.write_documents({self.path: binary_format.encode(players, tournaments)})
+        self._decoded = None
+
+    def _load(self):
+        """
+        Return the decoded (players, tournaments) of the file, read again only when it changed.
+        """
+        storage.recover_documents(self.lock_file)
+        signature = file_signature(self.path)
+        if signature is None:
+            return [], []
+        if self._decoded is None or self._decoded_signature != signature:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            self._decoded = data
+            self._decoded_signature = signature
+        return binary_format.decode(self._decoded)
@@ -0,0 +1,141 @@
+"""
+Compact binary serialization of players and tournaments.
+
+Layout (little-endian):
+
+    header   magic b"CHSB", format version (u16), flags (u16), then the byte lengths of the id
+             table and of the metadata (u32 each) and the number of matches (u32)
+    ids      every player id, UTF-8, separated by NUL bytes; ids are referred to by their index
+    meta     compact JSON of the players and tournaments, where player ids are replaced by their
+             index and each round's "matches" by its number of matches
+    matches  four fixed-width columns over all matches in file order: first player index (i32),
+             second player index (i32, -1 for a bye), first and second scores in half points (u8)
+
+Loading decodes the columns with array.frombytes and rebuilds the matches with shared id
+strings and shared score floats, instead of allocating a new string and float per occurrence
+as json.load does. The pairing history and standings ledger that documents of earlier versions
+still carry are left out: Tournament.from_dict rebuilds them from the rounds.
+"""
+import json
+import struct
+import sys
+from array import array
+
+
+MAGIC = b"CHSB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+
+_SCORES = [i / 2 for i in range(256)]
+
+
+class BinaryFormatError(ValueError):
+    """
+    Raised when data cannot be encoded in, or decoded from, the binary format.
+    """
+
+
+def encode(players, tournaments):
+    """
+    Serialize player and tournament dictionaries to bytes.
+    """
+    ids = {}
+
+    def intern(player_id):
+        index = ids.get(player_id)
+        if index is None:
+            index = ids[player_id] = len(ids)
+        return index
+
+    meta_players = []
+    for player in players:
+        record = dict(player)
+        record["id"] = intern(player["id"])
+        meta_players.append(record)
+
+    first, second = array("i"), array("i")
+    first_scores, second_scores = array("B"), array("B")
+    meta_tournaments = []
+    for tournament in tournaments:
+        record = dict(tournament)
+        record["players"] = [intern(pid) for pid in tournament.get("players", [])]
+        rounds = tournament.get("rounds", [])
+        record["rounds"] = []
+        for rnd in rounds:
+            record["rounds"].append(dict(rnd, matches=len(rnd["matches"])))
+            for (player1_id, score1), (player2_id, score2) in rnd["matches"]:
+                first.append(-1 if player1_id is None else intern(player1_id))
+                second.append(-1 if player2_id is None else intern(player2_id))
+                first_scores.append(_half_points(score1))
+                second_scores.append(_half_points(score2))
+        record.pop("pairing_history", None)
+        record.pop("standings", None)
+        meta_tournaments.append(record)
+
+    id_table = "\0".join(ids).encode()
+    meta = json.dumps({"players": meta_players, "tournaments": meta_tournaments}, separators=(",", ":")).encode()
+    columns = [first, second, first_scores, second_scores]
+    if sys.byteorder == "big":
+        for column in columns[:2]:
+            column.byteswap()
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(id_table), len(meta), len(first))
+    return b"".join([header, id_table, meta] + [column.tobytes() for column in columns])
+
+
+def decode(data):
+    """
+    Deserialize bytes produced by encode() into (players, tournaments) dictionaries.
+    """
+    if len(data) < HEADER.size:
+        raise BinaryFormatError("Fichier binaire tronqué.")
+    magic, version, _, ids_length, meta_length, match_count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise BinaryFormatError("Ce fichier n'est pas au format binaire du tournoi.")
+    if version > FORMAT_VERSION:
+        raise BinaryFormatError(f"Format binaire version {version} non pris en charge (max {FORMAT_VERSION}).")
+
+    offset = HEADER.size
+    # L'index -1 (bye) désigne le None ajouté en fin de table.
+    ids = data[offset:offset + ids_length].decode().split("\0")
+    ids.append(None)
+    offset += ids_length
+    meta = json.loads(data[offset:offset + meta_length])
+    offset += meta_length
+
+    columns = []
+    for typecode in ("i", "i", "B", "B"):
+        column = array(typecode)
+        size = match_count * column.itemsize
+        column.frombytes(data[offset:offset + size])
+        if len(column) != match_count:
+            raise BinaryFormatError("Fichier binaire tronqué.")
+        if sys.byteorder == "big" and column.itemsize > 1:
+            column.byteswap()
+        columns.append(column)
+        offset += size
+    first, second, first_scores, second_scores = columns
+
+    players = meta["players"]
+    for player in players:
+        player["id"] = ids[player["id"]]
+
+    tournaments = meta["tournaments"]
+    position = 0
+    scores = _SCORES
+    for tournament in tournaments:
+        tournament["players"] = [ids[index] for index in tournament["players"]]
+        for rnd in tournament["rounds"]:
+            end = position + rnd["matches"]
+            rnd["matches"] = [
+                [[ids[first[i]], scores[first_scores[i]]], [ids[second[i]], scores[second_scores[i]]]]
+                for i in range(position, end)
+            ]
+            position = end
+    return players, tournaments
+
+
+def _half_points(score):
+    half_points = score * 2
+    if half_points != int(half_points) or not 0 <= half_points < len(_SCORES):
+        raise BinaryFormatError(f"Score non représentable dans le format binaire : {score}")
+    return int(half_points)
@@ -0,0 +1,123 @@
+from contextlib import contextmanager
+
+from models import storage
+
+
+class DeferredBackend:
+    """
+    Wrapper around a storage backend that keeps saves in memory until flush().
+
+    Used by batch operations (see views.cli): every save of the batch only records the changed
+    players and tournaments, and flush() writes them all to the wrapped backend in one commit.
+    The signature stays the same for the whole batch, so the repositories keep their loaded
+    state instead of reading the storage again after each operation.
+
+    Repositories bump the version of an object on every save; the wrapper remembers the version
+    each object had when it was first saved in the batch so that the final commit bumps it only
+    once and the wrapped backend can still detect concurrent modifications.
+    """
+    partial_saves = True
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = backend.name
+        self._signatures = {kind: ("deferred", backend.signature(kind)) for kind in ("players", "tournaments")}
+        self._players = {}          # id -> changed Player
+        self._tournaments = {}      # id -> changed Tournament
+        self._stored_versions = {}  # id -> version before the batch
+
+    def signature(self, kind):
+        """
+        Return the signature of the wrapped backend when the batch started.
+        """
+        return self._signatures[kind]
+
+    def load_players(self):
+        """
+        Return the stored players with the changes of the batch applied.
+        """
+        return self._overlay(self.backend.load_players(), self._players)
+
+    def load_tournaments(self):
+        """
+        Return the stored tournaments with the changes of the batch applied.
+        """
+        return self._overlay(self.backend.load_tournaments(), self._tournaments)
+
+    def load_tournament(self, tournament_id):
+        """
+        Return a single tournament, as changed by the batch if it was.
+        """
+        if tournament_id in self._tournaments:
+            return self._tournaments[tournament_id].to_dict()
+        if hasattr(self.backend, "load_tournament"):
+            return self.backend.load_tournament(tournament_id)
+        return next((t for t in self.backend.load_tournaments() if t["id"] == tournament_id), None)
+
+    def save_players(self, players, changed=None):
+        self.commit(players=players, changed_players=changed)
+
+    def save_tournaments(self, tournaments, changed=None):
+        self.commit(tournaments=tournaments, changed_tournaments=changed)
+
+    def commit(self, players=None, tournaments=None, changed_players=None, changed_tournaments=None):
+        """
+        Record the saved players and/or tournaments; nothing is written before flush().
+        """
+        self._record(self._players, players if changed_players is None else changed_players)
+        self._record(self._tournaments, tournaments if changed_tournaments is None else changed_tournaments)
+
+    def flush(self):
+        """
+        Write every player and tournament changed by the batch to the wrapped backend in one commit.
+
+        Raises storage.ConcurrentModificationError if another process changed one of them meanwhile.
+        """
+        players = list(self._players.values())
+        tournaments = list(self._tournaments.values())
+        if not players and not tournaments:
+            return
+        for obj in players + tournaments:
+            obj.version = self._stored_versions[obj.id] + 1
+        self.backend.commit(players=players or None, changed_players=players or None,
+                            changed_tournaments=tournaments or None)
+        self._players = {}
+        self._tournaments = {}
+        self._stored_versions = {}
+
+    def _record(self, changed, objects):
+        for obj in objects or ():
+            changed[obj.id] = obj
+            # Les objets arrivent déjà incrémentés : on garde la version d'avant le lot.
+            self._stored_versions.setdefault(obj.id, obj.version - 1)
+
+    @staticmethod
+    def _overlay(records, changed):
+        if not changed:
+            return records
+        records = {record["id"]: record for record in records}
+        for obj in changed.values():
+            records[obj.id] = obj.to_dict()
+        return list(records.values())
+
+
+@contextmanager
+def deferred_saves():
+    """
+    Run the enclosed operations against one loaded state and save everything they changed in a
+    single write when the block ends. Nothing is written if the block raises.
+    """
+    from models.player import PlayerRepository
+    from models.tournament import TournamentRepository
+
+    backend = storage.get_backend()
+    deferred = DeferredBackend(backend)
+    storage.set_backend(deferred)
+    try:
+        yield deferred
+        deferred.flush()
+    finally:
+        storage.set_backend(backend)
+        # Les caches ont été construits sur la signature du lot : ils seront relus.
+        PlayerRepository.invalidate()
+        TournamentRepository.invalidate()
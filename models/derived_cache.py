@@ -0,0 +1,51 @@
+"""
+Cache of the data derived from a tournament for display (standings, pairing tables, round history).
+
+Entries are keyed by (tournament id, tournament version, kind): the version changes on every
+save, so a tournament reloaded after another process changed it never hits an entry computed
+from its previous state. In this process, the controller operations that change a tournament
+also drop its entries (invalidate), so an entry is only ever built again after a change.
+
+The least recently used entries are evicted beyond `size` entries. Cached values are shared by
+every caller and must not be modified.
+"""
+from collections import OrderedDict
+
+DEFAULT_SIZE = 128
+
+
+class DerivedCache:
+    """
+    LRU cache of derived tournament data, see the module docstring.
+    """
+    def __init__(self, size=DEFAULT_SIZE):
+        self.size = size
+        self.entries = OrderedDict()  # (tournament id, version, kind) -> value
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tournament, kind, build):
+        """
+        Return the `kind` data of the tournament, calling build() only if it is not cached.
+        """
+        key = (tournament.id, tournament.version, kind)
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        value = entries[key] = build()
+        if len(entries) > self.size:
+            entries.popitem(last=False)
+        return value
+
+    def invalidate(self, tournament_id=None):
+        """
+        Drop the entries of a tournament (of every tournament when no id is given).
+        """
+        if tournament_id is None:
+            self.entries.clear()
+            return
+        for key in [key for key in self.entries if key[0] == tournament_id]:
+            del self.entries[key]
@@ -0,0 +1,214 @@
+"""
+Elo ratings (FIDE rules).
+
+Every player carries a rating, a K-factor and a number of rated games. A round is rated as one
+batch: the expected scores of all its games are computed from the ratings before the round,
+then every rating moves by K x (score - expected score), as FIDE does over a rating period.
+Rating differences are capped at 400 points and expected scores come from a precomputed table.
+
+The K-factor follows the FIDE rules: 40 for the first 30 rated games, then 20, and 10 for good
+once a rating of 2400 has been reached. Byes and games without a decisive or drawn result
+(such as double forfeits) are not rated.
+
+RatingTable keeps ratings, K-factors and game counts in typed columns indexed by player, so
+rating a round only touches flat arrays: it is used both after each round and by rerate(),
+which recomputes the ratings over the whole history.
+"""
+import math
+from array import array
+
+DEFAULT_RATING = 1500.0
+DEFAULT_K_FACTOR = 40
+MAX_DIFFERENCE = 400
+NEW_PLAYER_GAMES = 30
+MASTER_RATING = 2400
+MAX_PERFORMANCE_DIFFERENCE = 800
+
+# Score attendu du joueur le moins bien classé pour chaque écart de 0 à 400 points.
+EXPECTED = array("d", [1 / (1 + 10 ** (difference / 400)) for difference in range(MAX_DIFFERENCE + 1)])
+
+
+def expected_score(rating, opponent_rating):
+    """
+    Expected score of a player against an opponent, the difference being capped at 400 points.
+    """
+    difference = min(MAX_DIFFERENCE, round(abs(rating - opponent_rating)))
+    return EXPECTED[difference] if rating <= opponent_rating else 1 - EXPECTED[difference]
+
+
+def next_k_factor(k_factor, rating, games):
+    """
+    Return the K-factor of a player after a rating update.
+    """
+    if k_factor == 10 or rating >= MASTER_RATING:
+        return 10
+    return 40 if games < NEW_PLAYER_GAMES else 20
+
+
+def performance_rating(opponent_ratings, points, games):
+    """
+    Return the performance rating of `points` scored in `games` games against opponents whose
+    ratings add up to `opponent_ratings`: the rating whose expected score against their average
+    is the score made, at most 800 points from that average (for 0 % or 100 %). None without games.
+    """
+    if not games:
+        return None
+    average = opponent_ratings / games
+    rate = points / games
+    if rate <= 0:
+        return round(average - MAX_PERFORMANCE_DIFFERENCE)
+    if rate >= 1:
+        return round(average + MAX_PERFORMANCE_DIFFERENCE)
+    difference = 400 * math.log10(rate / (1 - rate))
+    return round(average + max(-MAX_PERFORMANCE_DIFFERENCE, min(MAX_PERFORMANCE_DIFFERENCE, difference)))
+
+
+class RatingTable:
+    """
+    Ratings, K-factors and rated game counts of a set of players, in columns.
+    """
+    def __init__(self):
+        self.index = {}  # player id -> row
+        self.ids = []
+        self.ratings = array("d")
+        self.k_factors = array("B")
+        self.games = array("I")
+
+    def add(self, player_id, rating=DEFAULT_RATING, k_factor=DEFAULT_K_FACTOR, games=0):
+        """
+        Add a player (once) and return its row.
+        """
+        row = self.index.get(player_id)
+        if row is None:
+            row = self.index[player_id] = len(self.ids)
+            self.ids.append(player_id)
+            self.ratings.append(rating)
+            self.k_factors.append(k_factor)
+            self.games.append(games)
+        return row
+
+    @staticmethod
+    def from_players(players):
+        """
+        Build the table of the given Player objects, one row each in order.
+        """
+        players = list(players)
+        table = RatingTable()
+        table.ids = [p.id for p in players]
+        table.index = {pid: row for row, pid in enumerate(table.ids)}
+        if len(table.index) != len(table.ids):
+            raise ValueError("Un joueur apparaît plusieurs fois.")
+        table.ratings = array("d", [p.rating for p in players])
+        table.k_factors = array("B", [p.k_factor for p in players])
+        table.games = array("I", [p.games for p in players])
+        return table
+
+    def rate(self, first, second, scores):
+        """
+        Rate a batch of games given as three columns: rows of the first players, rows of the
+        second players and scores of the first players. All the expected scores are computed
+        from the ratings before the batch. Returns the rows whose rating changed.
+        """
+        ratings, k_factors, games = self.ratings, self.k_factors, self.games
+        expected = EXPECTED
+        surprises = []
+        for i, j, score in zip(first, second, scores):
+            difference = ratings[j] - ratings[i]
+            if difference >= 0:
+                surprises.append(score - expected[min(MAX_DIFFERENCE, round(difference))])
+            else:
+                surprises.append(score - 1 + expected[min(MAX_DIFFERENCE, round(-difference))])
+
+        changes = {}
+        for i, j, surprise in zip(first, second, surprises):
+            changes[i] = changes.get(i, 0.0) + k_factors[i] * surprise
+            changes[j] = changes.get(j, 0.0) - k_factors[j] * surprise
+            games[i] += 1
+            games[j] += 1
+        for row, change in changes.items():
+            rating = ratings[row] = round(ratings[row] + change, 1)
+            k_factors[row] = next_k_factor(k_factors[row], rating, games[row])
+        return list(changes)
+
+    def rate_matches(self, matches):
+        """
+        Rate the games of a round (Match objects); returns the rows whose rating changed.
+        """
+        first, second, scores = [], [], []
+        for match in matches:
+            if match.is_bye or match.score1 + match.score2 != 1:
+                continue
+            first.append(self.add(match.player1_id))
+            second.append(self.add(match.player2_id))
+            scores.append(match.score1)
+        return self.rate(first, second, scores)
+
+    def apply(self, players):
+        """
+        Copy the ratings of the table to the given Player objects.
+        """
+        for player in players:
+            row = self.index.get(player.id)
+            if row is not None:
+                player.rating = self.ratings[row]
+                player.k_factor = self.k_factors[row]
+                player.games = self.games[row]
+
+
+def rate_round(round_, players):
+    """
+    Rate the games of a finished round and update the given players ({id: Player}).
+    Returns the players whose rating changed.
+    """
+    games = [m for m in round_.matches if not m.is_bye and m.score1 + m.score2 == 1]
+    # Une ligne par joueur, dans l'ordre des parties : blancs aux lignes paires, noirs aux impaires.
+    changed = [players[pid] for match in games for pid in (match.player1_id, match.player2_id)]
+    table = RatingTable.from_players(changed)
+    table.rate(range(0, len(changed), 2), range(1, len(changed), 2), [match.score1 for match in games])
+    table.apply(changed)
+    return changed
+
+
+def rerate(players, tournaments):
+    """
+    Recompute every rating from the serialized tournaments (dictionaries, as stored).
+
+    Each player starts from the rating recorded when they entered their first tournament (see
+    Tournament.ratings), or from DEFAULT_RATING; the finished rounds are then rated in order,
+    tournaments being taken by start date. Players who never played keep their rating.
+    Updates the Player objects and returns the number of games rated.
+    """
+    players = list(players)
+    table = RatingTable()
+    tournaments = sorted(tournaments, key=lambda t: (t.get("start_date") or "", t.get("end_date") or ""))
+    for tournament in tournaments:
+        entry_ratings = tournament.get("ratings") or {}
+        for pid in tournament.get("players", []):
+            if pid not in table.index:
+                table.add(pid, entry_ratings.get(pid, DEFAULT_RATING))
+
+    rated = 0
+    for tournament in tournaments:
+        for rnd in tournament.get("rounds", []):
+            if rnd.get("end_time") is None:
+                continue
+            first, second, scores = [], [], []
+            for (player1_id, score1), (player2_id, score2) in rnd["matches"]:
+                if player2_id is None or score1 + score2 != 1:
+                    continue
+                first.append(table.add(player1_id))
+                second.append(table.add(player2_id))
+                scores.append(score1)
+            table.rate(first, second, scores)
+            rated += len(scores)
+
+    for player in players:
+        if player.id not in table.index:
+            continue
+        row = table.index[player.id]
+        if not table.games[row]:
+            continue
+        player.rating = table.ratings[row]
+        player.k_factor = table.k_factors[row]
+        player.games = table.games[row]
+    return rated
@@ -0,0 +1,302 @@
+"""
+Bulk import and export of players and results.
+
+Supported formats:
+
+* CSV players list, with a header line naming the columns last_name, first_name, birth_date
+  (YYYY-MM-DD) and optionally id and rating (Elo);
+* FIDE TRF (Tournament Report File, TRF16): players are read from the "001" lines; a tournament
+  is exported with its header, every player line and the results of its completed rounds;
+* PGN headers: one game per played match (tags only, the moves are not recorded).
+
+Files are streamed: readers are generators yielding one record at a time and writers consume
+iterables, so a large rating list is never held twice in memory. An import validates every
+record with the rules of the interactive views (models.validators), skips players already known
+(same Player.id) and adds the new ones in a single batched save.
+"""
+import csv
+import os
+
+from models.player import Player, PlayerRepository
+from models.standings import StandingsLedger
+from models.tiebreaks import rank_players
+from models.validators import validate_birth_date, validate_name
+
+CSV_COLUMNS = ["id", "last_name", "first_name", "birth_date", "score", "rating"]
+FORMATS = ("csv", "trf", "pgn")
+
+# Colonnes 15-47, 49-52 et 70-79 (numérotées à partir de 1 dans la norme) d'une ligne joueur "001" du format TRF16.
+TRF_NAME = slice(14, 47)
+TRF_RATING = slice(48, 52)
+TRF_BIRTH_DATE = slice(69, 79)
+MAX_RATING = 3500
+
+
+class ImportReport:
+    """
+    Outcome of a bulk import: players added, duplicates skipped and rejected lines.
+    """
+    def __init__(self):
+        self.added = []
+        self.duplicates = 0
+        self.errors = []  # (line number, message)
+
+    def summary(self):
+        return (f"{len(self.added)} joueur(s) importé(s), {self.duplicates} doublon(s) ignoré(s), "
+                f"{len(self.errors)} ligne(s) rejetée(s).")
+
+
+def detect_format(path):
+    """
+    Return the format of a file from its extension; raises ValueError for an unknown one.
+    """
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension == "txt":
+        extension = "trf"
+    if extension not in FORMATS:
+        raise ValueError(f"Format de fichier inconnu : {path} (attendu : .csv, .trf ou .pgn).")
+    return extension
+
+
+def read_players_csv(lines):
+    """
+    Yield (line number, record) for every row of a CSV players list.
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_players_trf(lines):
+    """
+    Yield (line number, record) for every player line ("001") of a TRF file.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.startswith("001"):
+            continue
+        last_name, _, first_name = line[TRF_NAME].partition(",")
+        yield number, {
+            "last_name": last_name.strip(),
+            "first_name": first_name.strip(),
+            "birth_date": line[TRF_BIRTH_DATE].strip().replace("/", "-"),
+            "rating": line[TRF_RATING].strip(),
+        }
+
+
+def validate_records(records):
+    """
+    Check streamed (line number, record) pairs and yield (line number, Player or None, error message).
+    """
+    for number, record in records:
+        last_name = (record.get("last_name") or "").strip()
+        first_name = (record.get("first_name") or "").strip()
+        birth_date = (record.get("birth_date") or "").strip()
+        rating = _rating(record.get("rating"))
+        if not validate_name(first_name):
+            yield number, None, f"prénom invalide : {first_name!r}"
+        elif not validate_name(last_name):
+            yield number, None, f"nom invalide : {last_name!r}"
+        elif not validate_birth_date(birth_date):
+            yield number, None, f"date de naissance invalide : {birth_date!r}"
+        elif rating is None:
+            yield number, None, f"classement Elo invalide : {record.get('rating')!r}"
+        else:
+            player = Player(last_name, first_name, birth_date, (record.get("id") or "").strip() or None)
+            if rating:
+                player.rating = rating
+            yield number, player, None
+
+
+def _rating(value):
+    """
+    Return the rating given in an imported record, 0 when there is none, or None when it is invalid.
+    """
+    value = (value or "").strip()
+    if not value:
+        return 0
+    try:
+        rating = float(value)
+    except ValueError:
+        return None
+    return rating if 0 < rating <= MAX_RATING else None
+
+
+def import_players(records):
+    """
+    Validate streamed (line number, record) pairs, skip players whose id is already known
+    (stored or earlier in the stream) and save the new ones in one batch.
+
+    Returns an ImportReport.
+    """
+    report = ImportReport()
+    known = {p.id for p in PlayerRepository.load_players()}
+    for number, player, error in validate_records(records):
+        if error:
+            report.errors.append((number, error))
+        elif player.id in known:
+            report.duplicates += 1
+        else:
+            known.add(player.id)
+            report.added.append(player)
+    PlayerRepository.add_players(report.added)
+    return report
+
+
+def import_players_file(path, file_format=None):
+    """
+    Import the players of a CSV or TRF file; returns an ImportReport.
+    """
+    file_format = file_format or detect_format(path)
+    if file_format not in ("csv", "trf"):
+        raise ValueError("Seuls les fichiers CSV et TRF peuvent être importés.")
+    reader = read_players_csv if file_format == "csv" else read_players_trf
+    with open(path, newline="", encoding="utf-8") as f:
+        return import_players(reader(f))
+
+
+def write_players_csv(players, out):
+    """
+    Write players (Player objects) as a CSV players list.
+    """
+    writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for player in players:
+        writer.writerow(player.to_dict())
+
+
+def _trf_date(date_str):
+    return (date_str or "").replace("-", "/")
+
+
+def _trf_result(match, first):
+    """
+    Return the (opponent id, color, result code) of a match seen from player 1 or player 2.
+    """
+    if match.is_bye:
+        return None, "-", "U"
+    points = match.score1 if first else match.score2
+    code = "1" if points == 1.0 else "=" if points == 0.5 else "0"
+    return (match.player2_id, "w", code) if first else (match.player1_id, "b", code)
+
+
+def write_tournament_trf(tournament, players, out):
+    """
+    Write a tournament report in the FIDE TRF16 format.
+
+    `players` maps player ids to Player objects. Starting ranks follow the registration order;
+    only completed rounds are reported, points and places included.
+    """
+    rounds = [rnd for rnd in tournament.rounds if rnd.is_finished]
+    starting_rank = {pid: rank for rank, pid in enumerate(tournament.players, start=1)}
+    ranking = rank_players(tournament.players, StandingsLedger.from_rounds(rounds), tournament.tiebreaks)
+    place = {pid: rank for rank, (pid, _) in enumerate(ranking, start=1)}
+    points = {pid: values["score"] for pid, values in ranking}
+    results = {pid: [] for pid in tournament.players}
+    for rnd in rounds:
+        paired = set()
+        for match in rnd.matches:
+            for pid, first in ((match.player1_id, True), (match.player2_id, False)):
+                if pid in results:
+                    results[pid].append(_trf_result(match, first))
+                    paired.add(pid)
+        for pid in results:
+            if pid not in paired:
+                results[pid].append((None, "-", "Z"))
+
+    out.write(f"012 {tournament.name}\n")
+    out.write(f"022 {tournament.location}\n")
+    out.write(f"042 {_trf_date(tournament.start_date)}\n")
+    out.write(f"052 {_trf_date(tournament.end_date)}\n")
+    out.write(f"062 {len(tournament.players)}\n")
+    out.write("092 Individual: Swiss-System\n")
+    out.write(f"XXR {tournament.number_of_rounds}\n")
+    for pid in tournament.players:
+        player = players[pid]
+        name = f"{player.last_name}, {player.first_name}"
+        rating = tournament.ratings.get(pid, player.rating)
+        line = (f"001 {starting_rank[pid]:>4}      {name[:33]:<33} {rating:>4.0f} {'':>3} {'':>11} "
+                f"{_trf_date(player.birth_date):>10} {points[pid]:>4.1f} {place[pid]:>4}  ")
+        line += "  ".join(f"{starting_rank[opponent] if opponent else '0000':>4} {color} {code}"
+                          for opponent, color, code in results[pid])
+        out.write(line.rstrip() + "\n")
+
+
+def write_tournament_pgn(tournament, players, out):
+    """
+    Write one PGN game (tags only) for every played match of the tournament's completed rounds.
+
+    `players` maps player ids to Player objects.
+    """
+    for number, rnd in enumerate(tournament.rounds, start=1):
+        if not rnd.is_finished:
+            continue
+        date = (rnd.start_time or tournament.start_date or "????-??-??")[:10].replace("-", ".")
+        for board, match in enumerate(rnd.matches, start=1):
+            if match.is_bye:
+                continue
+            white, black = players[match.player1_id], players[match.player2_id]
+            result = match.result_code() or "*"
+            out.write(f'[Event "{tournament.name}"]\n'
+                      f'[Site "{tournament.location}"]\n'
+                      f'[Date "{date}"]\n'
+                      f'[Round "{number}.{board}"]\n'
+                      f'[White "{white.last_name}, {white.first_name}"]\n'
+                      f'[Black "{black.last_name}, {black.first_name}"]\n'
+                      f'[Result "{result}"]\n\n{result}\n\n')
+
+
+def export_players_file(path):
+    """
+    Write every stored player to a CSV file; returns the number of players written.
+    """
+    players = PlayerRepository.load_players()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        write_players_csv(players, f)
+    return len(players)
+
+
+def export_tournament_file(tournament, path, file_format=None):
+    """
+    Write a tournament and its results to a TRF or PGN file.
+    """
+    file_format = file_format or detect_format(path)
+    if file_format not in ("trf", "pgn"):
+        raise ValueError("Un tournoi s'exporte au format TRF ou PGN.")
+    players = {p.id: p for p in PlayerRepository.load_players()}
+    writer = write_tournament_trf if file_format == "trf" else write_tournament_pgn
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer(tournament, players, f)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from models.tournament import TournamentRepository
+
+    parser = argparse.ArgumentParser(description="Import et export des joueurs et des résultats.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Importer des joueurs depuis un fichier CSV ou TRF.")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=["csv", "trf"])
+    players_parser = subparsers.add_parser("export-players", help="Exporter les joueurs au format CSV.")
+    players_parser.add_argument("path")
+    tournament_parser = subparsers.add_parser("export-tournament",
+                                              help="Exporter un tournoi et ses résultats (TRF ou PGN).")
+    tournament_parser.add_argument("tournament_id")
+    tournament_parser.add_argument("path")
+    tournament_parser.add_argument("--format", choices=["trf", "pgn"])
+    args = parser.parse_args()
+
+    if args.command == "import":
+        report = import_players_file(args.path, args.format)
+        for number, message in report.errors:
+            print(f"❌ Ligne {number} : {message}")
+        print(f"✅ {report.summary()}")
+    elif args.command == "export-players":
+        print(f"✅ {export_players_file(args.path)} joueur(s) exporté(s) vers {args.path}.")
+    else:
+        tournament = TournamentRepository.get_tournament(args.tournament_id)
+        if tournament is None:
+            parser.error(f"Tournoi introuvable : {args.tournament_id}")
+        export_tournament_file(tournament, args.path, args.format)
+        print(f"✅ Tournoi {tournament.name} exporté vers {args.path}.")
@@ -0,0 +1,181 @@
+"""
+Instrumentation of the controllers and repositories, and profiling of a whole session.
+
+enable() replaces every public static method of the given classes (repositories, controllers)
+with a wrapper that records, per "Class.method":
+
+    calls          number of calls
+    time           wall time in seconds
+    bytes_read     bytes read by the process during the calls
+    bytes_written  bytes written by the process during the calls (files, and the terminal)
+    objects        Player and Tournament objects deserialized during the calls
+
+Figures are inclusive: an operation also counts the repository calls it makes. Bytes come from
+the kernel's per-process counters (/proc/self/io), so they cover every storage backend,
+SQLite included; they stay at 0 where those counters do not exist. disable() puts the
+original methods back: when the instrumentation is off, no wrapper is left in place and the
+measured code runs exactly as if this module did not exist.
+
+profiled_session() also runs cProfile and tracemalloc for the session and writes everything
+to a JSON report (python main.py --profile, see main.py).
+"""
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+
+IO_COUNTERS = "/proc/self/io"
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 15
+
+metrics = {}     # "Class.method" -> counters, see the module docstring
+_installed = {}  # (class, attribute name) -> original attribute
+_objects = 0     # objects deserialized since enable()
+_probe = None    # descriptor of IO_COUNTERS
+_probe_bytes = 0  # bytes read from IO_COUNTERS itself, left out of the measures
+
+
+def is_enabled():
+    return bool(_installed)
+
+
+def enable(classes, deserialized=()):
+    """
+    Instrument the public static methods of `classes` and count the objects built by the
+    from_dict of the `deserialized` classes. Resets the metrics.
+    """
+    global _probe, _objects
+    disable()
+    metrics.clear()
+    _objects = 0
+    try:
+        _probe = os.open(IO_COUNTERS, os.O_RDONLY)
+    except OSError:
+        _probe = None
+    for cls in classes:
+        for name, attribute in list(vars(cls).items()):
+            if isinstance(attribute, staticmethod) and not name.startswith("_"):
+                _install(cls, name, _timed(f"{cls.__name__}.{name}", attribute.__func__))
+    for cls in deserialized:
+        _install(cls, "from_dict", _counted(vars(cls)["from_dict"].__func__))
+
+
+def disable():
+    """
+    Put the original methods back. The metrics recorded so far are kept.
+    """
+    global _probe
+    for (cls, name), attribute in _installed.items():
+        setattr(cls, name, attribute)
+    _installed.clear()
+    if _probe is not None:
+        os.close(_probe)
+        _probe = None
+
+
+def _install(cls, name, function):
+    _installed[(cls, name)] = vars(cls)[name]
+    setattr(cls, name, staticmethod(function))
+
+
+def _io():
+    """
+    Return the (bytes read, bytes written) of the process so far, without the reads of the probe.
+    """
+    global _probe_bytes
+    if _probe is None:
+        return 0, 0
+    data = os.pread(_probe, 512, 0)
+    # Les deux premières lignes sont « rchar: <n> » et « wchar: <n> ».
+    rchar, wchar, _ = data.split(b"\n", 2)
+    # Le compteur lu n'inclut pas encore cette lecture, mais toutes les précédentes.
+    read = int(rchar[7:]) - _probe_bytes
+    _probe_bytes += len(data)
+    return read, int(wchar[7:])
+
+
+def _timed(name, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        read, written = _io()
+        objects = _objects
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            read_after, written_after = _io()
+            entry = metrics.get(name)
+            if entry is None:
+                entry = metrics[name] = {"calls": 0, "time": 0.0, "bytes_read": 0, "bytes_written": 0, "objects": 0}
+            entry["calls"] += 1
+            entry["time"] += elapsed
+            entry["bytes_read"] += read_after - read
+            entry["bytes_written"] += written_after - written
+            entry["objects"] += _objects - objects
+    return wrapper
+
+
+def _counted(function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        global _objects
+        _objects += 1
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def report():
+    """
+    Return the metrics sorted by decreasing time, as a list of {"operation": name, ...counters}.
+    """
+    return [{"operation": name, **entry}
+            for name, entry in sorted(metrics.items(), key=lambda item: item[1]["time"], reverse=True)]
+
+
+@contextmanager
+def profiled_session(path, classes, deserialized=()):
+    """
+    Instrument `classes` (see enable) and run cProfile and tracemalloc until the end of the
+    block, then write the JSON report to `path` and the cProfile statistics next to it (same
+    name, .prof extension, readable with pstats or snakeviz). Yields the report dictionary,
+    filled in when the block ends.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    document = {}
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    enable(classes, deserialized)
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield document
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats_path = os.path.splitext(path)[0] + ".prof"
+        profiler.dump_stats(stats_path)
+        stats = pstats.Stats(profiler)
+        functions = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+        document.update({
+            "duration": elapsed,
+            "operations": report(),
+            "functions": [{"function": f"{filename}:{line}({function})", "calls": calls, "own_time": own,
+                           "cumulative_time": cumulative}
+                          for (filename, line, function), (_, calls, own, cumulative, _) in functions],
+            "memory": {"current": current, "peak": peak,
+                       "allocations": [{"location": str(stat.traceback[0]), "size": stat.size, "count": stat.count}
+                                       for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]]},
+            "cprofile": stats_path,
+        })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
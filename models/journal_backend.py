@@ -0,0 +1,235 @@
+import copy
+import json
+import os
+
+from models import storage
+from models.storage import apply_tournament_event, check_versions, diff_tournament, file_signature, locked
+
+COMPACT_EVERY = 500
+
+
+class JournalBackend:
+    """
+    Storage backend recording every change as an event appended to a JSON-lines journal.
+
+    State is rebuilt on load by replaying the journal on top of the latest snapshot, and only
+    the events appended since the previous read are replayed afterwards. Once the journal holds
+    COMPACT_EVERY events it is folded into a new snapshot, which keeps replay time bounded.
+    A truncated trailing line left by a crash is discarded when the journal is read.
+    Appends, compactions and replays run under the data directory lock, so several processes
+    can share one journal.
+    """
+    name = "journal"
+    partial_saves = True
+
+    def __init__(self, journal_file=None, snapshot_file=None, compact_every=COMPACT_EVERY, lock_file=None):
+        self.journal_file = journal_file or storage.JOURNAL_FILE
+        self.snapshot_file = snapshot_file or storage.SNAPSHOT_FILE
+        self.compact_every = compact_every
+        self.lock_file = lock_file or storage.LOCK_FILE
+        self._players = {}
+        self._tournaments = {}
+        self._versions = {"players": 0, "tournaments": 0}
+        self._sequence = 0
+        self._pending = 0
+        self._offset = 0
+        self._source = None
+
+    def signature(self, kind):
+        """
+        Return the change counter of players or tournaments, after catching up with the journal.
+        """
+        self._sync()
+        return self.name, self.journal_file, self._versions[kind]
+
+    def load_players(self):
+        """
+        Return every stored player as a dictionary.
+        """
+        self._sync()
+        return copy.deepcopy(list(self._players.values()))
+
+    def load_tournaments(self):
+        """
+        Return every stored tournament as a dictionary.
+        """
+        self._sync()
+        return copy.deepcopy(list(self._tournaments.values()))
+
+    def save_players(self, players, changed=None):
+        """
+        Append events for the players that differ from the journaled state.
+        """
+        self.commit(players=players, changed_players=changed)
+
+    def save_tournaments(self, tournaments, changed=None):
+        """
+        Append events for the tournaments that differ from the journaled state.
+        """
+        self.commit(tournaments=tournaments, changed_tournaments=changed)
+
+    def commit(self, players=None, tournaments=None, changed_players=None, changed_tournaments=None):
+        """
+        Append the events describing the change as one batch of journal lines.
+        """
+        with locked(self.lock_file):
+            self._sync()
+            events = []
+            if players is not None or changed_players is not None:
+                check_versions({pid: p.get("version", 0) for pid, p in self._players.items()},
+                               players if changed_players is None else changed_players)
+                events.extend(self._player_events(players, changed_players))
+            if tournaments is not None or changed_tournaments is not None:
+                check_versions({tid: t.get("version", 0) for tid, t in self._tournaments.items()},
+                               tournaments if changed_tournaments is None else changed_tournaments)
+                events.extend(self._tournament_events(tournaments, changed_tournaments))
+            if events:
+                self._append(events)
+
+    def import_records(self, players, tournaments):
+        """
+        Replace the whole stored content with the given player and tournament dictionaries.
+        """
+        with locked(self.lock_file):
+            self._sync()
+            self._players = {p["id"]: copy.deepcopy(p) for p in players}
+            self._tournaments = {t["id"]: copy.deepcopy(t) for t in tournaments}
+            for kind in self._versions:
+                self._versions[kind] += 1
+            self.compact()
+
+    def compact(self):
+        """
+        Fold the journal into a new snapshot and start an empty journal.
+        """
+        with locked(self.lock_file):
+            self._sync()
+            snapshot = {
+                "sequence": self._sequence,
+                "players": list(self._players.values()),
+                "tournaments": list(self._tournaments.values()),
+            }
+            tmp_path = f"{self.snapshot_file}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_file)
+            # Les événements déjà inclus dans l'instantané sont ignorés au rejeu si la troncature n'a pas lieu.
+            open(self.journal_file, "w").close()
+            self._pending = 0
+            self._offset = 0
+            self._source = self._files_signature()
+
+    def _player_events(self, players, changed):
+        events = []
+        if changed is None:
+            kept = {p.id for p in players}
+            events.extend({"type": "player_deleted", "id": pid} for pid in self._players if pid not in kept)
+            changed = players
+        for player in changed:
+            data = player.to_dict()
+            if self._players.get(player.id) != data:
+                events.append({"type": "player_saved", "player": data})
+        return events
+
+    def _tournament_events(self, tournaments, changed):
+        events = []
+        if changed is None:
+            kept = {t.id for t in tournaments}
+            events.extend({"type": "tournament_deleted", "tournament_id": tid}
+                          for tid in self._tournaments if tid not in kept)
+            changed = tournaments
+        for tournament in changed:
+            for event in diff_tournament(self._tournaments.get(tournament.id), tournament.to_dict()):
+                event["tournament_id"] = tournament.id
+                events.append(event)
+        return events
+
+    def _append(self, events):
+        lines = []
+        for event in events:
+            self._sequence += 1
+            event["seq"] = self._sequence
+            lines.append(json.dumps(event) + "\n")
+            self._apply(event)
+        with open(self.journal_file, "a") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+            self._offset = f.tell()
+        self._pending += len(events)
+        self._source = self._files_signature()
+        if self._pending >= self.compact_every:
+            self.compact()
+
+    def _apply(self, event):
+        kind = event["type"]
+        if kind == "player_saved":
+            self._players[event["player"]["id"]] = copy.deepcopy(event["player"])
+            self._versions["players"] += 1
+        elif kind == "player_deleted":
+            self._players.pop(event["id"], None)
+            self._versions["players"] += 1
+        elif kind == "tournament_deleted":
+            self._tournaments.pop(event["tournament_id"], None)
+            self._versions["tournaments"] += 1
+        else:
+            tournament_id = event["tournament_id"]
+            self._tournaments[tournament_id] = apply_tournament_event(self._tournaments.get(tournament_id), event)
+            self._versions["tournaments"] += 1
+
+    def _files_signature(self):
+        return file_signature(self.snapshot_file), file_signature(self.journal_file)
+
+    def _sync(self):
+        """
+        Bring the in-memory state up to date with the files, replaying only what is new.
+        """
+        current = self._files_signature()
+        if current == self._source:
+            return
+        with locked(self.lock_file):
+            self._catch_up()
+
+    def _catch_up(self):
+        current = self._files_signature()
+        snapshot_changed = self._source is None or current[0] != self._source[0]
+        journal = current[1]
+        if snapshot_changed or journal is None or journal[1] < self._offset:
+            self._load_snapshot()
+        self._replay()
+        self._source = self._files_signature()
+
+    def _load_snapshot(self):
+        self._players, self._tournaments = {}, {}
+        self._sequence = self._pending = self._offset = 0
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, "r") as f:
+                snapshot = json.load(f)
+            self._sequence = snapshot["sequence"]
+            self._players = {p["id"]: p for p in snapshot["players"]}
+            self._tournaments = {t["id"]: t for t in snapshot["tournaments"]}
+        for kind in self._versions:
+            self._versions[kind] += 1
+
+    def _replay(self):
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, "r+") as f:
+            f.seek(self._offset)
+            for line in iter(f.readline, ""):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Dernière ligne tronquée par un arrêt brutal : on la supprime.
+                    f.truncate(self._offset)
+                    break
+                if not line.endswith("\n"):
+                    f.truncate(self._offset)
+                    break
+                if event["seq"] > self._sequence:
+                    self._sequence = event["seq"]
+                    self._apply(event)
+                    self._pending += 1
+                self._offset = f.tell()
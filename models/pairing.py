@@ -0,0 +1,198 @@
+"""
+Swiss-system pairing.
+
+A round is modelled as a minimum-cost perfect matching: players are vertices, every legal
+pair is an edge whose cost grows with the score difference (then with the distance in the
+ranking), and pairs that already met are simply left out of the graph. When the number of
+players is odd, a virtual "bye" vertex is added, linked to the players who have not had a
+bye yet. The matching itself is solved with the blossom algorithm of models.matching.
+
+Large fields are split into brackets of about PAIRING_BRACKET players, cut on score-group
+boundaries and paired top-down; players a bracket cannot pair float down into the next one.
+If the bottom of the ranking cannot be paired, brackets are merged and paired again, up to
+solving the whole field at once, so a legal pairing is always found when one exists.
+
+The engine itself is deterministic; players on equal scores are ordered by their rating at
+registration, and only those still tied are in random order. A seeded tournament draws that
+order from seeded_random(seed, round number), so its rounds can be generated again from their
+inputs (see models.replay). ENGINE_VERSION is stored with every round and must change whenever
+a change to this module alters the pairings it produces.
+"""
+import random
+
+from models.matching import max_weight_matching
+
+ENGINE_VERSION = "blossom-1"
+
+PAIRING_BRACKET = 40
+
+SCORE_WEIGHT = 1_000_000
+
+
+class PairingError(Exception):
+    """
+    Raised when no legal pairing exists for a round.
+    """
+
+
+def pair_round(ranked_ids, scores, past_pairs, bye_ids=(), bracket_size=PAIRING_BRACKET):
+    """
+    Pair the players of a round.
+
+    `ranked_ids` is ordered from first to last seed, `scores` maps each player to their current score,
+    `past_pairs` holds the (sorted) pairs of players who already met and `bye_ids` the players who
+    already received a bye. Returns a list of (player1_id, player2_id) tuples where player2_id is
+    None for the bye. Raises PairingError when no legal pairing exists.
+    """
+    players = list(ranked_ids)
+    if len(players) < 2:
+        raise PairingError("Pas assez de joueurs pour générer un appariement.")
+
+    bye_ids = set(bye_ids)
+    if all(pid in bye_ids for pid in players):
+        bye_ids = set()
+
+    brackets = _brackets(players, scores, bracket_size)
+    while True:
+        pairs = _pair_brackets(brackets, scores, past_pairs, bye_ids)
+        if pairs is not None:
+            return pairs
+        if len(brackets) == 1:
+            raise PairingError("Aucun appariement légal : toutes les combinaisons restantes ont déjà été jouées.")
+        brackets[-2:] = [brackets[-2] + brackets[-1]]
+
+
+def seeded_random(seed, round_number):
+    """
+    Return the generator ordering players on equal scores in the given round of a tournament
+    paired with `seed`.
+    """
+    return random.Random(f"{seed}:{round_number}")
+
+
+def rank_for_pairing(player_ids, scores, rng, ratings=None):
+    """
+    Order players for pair_round: by decreasing score, then by decreasing rating (`ratings` maps
+    player ids to their rating, missing players counting as unrated), players still tied in an
+    order drawn from `rng` (one draw per player, in the order of `player_ids`).
+    """
+    ratings = ratings or {}
+    return sorted(player_ids, key=lambda pid: (-scores[pid], -ratings.get(pid, 0), rng.random()))
+
+
+def pairing_cost(scores, ranked_ids, pairs):
+    """
+    Return the total cost of a pairing: squared score differences (in half points) first,
+    then distances in the ranking. Useful to compare pairing strategies.
+    """
+    rank = {pid: index for index, pid in enumerate(ranked_ids)}
+    total = 0
+    for pid1, pid2 in pairs:
+        if pid2 is None:
+            continue
+        total += _edge_cost(scores[pid1], scores[pid2], rank[pid1], rank[pid2])
+    return total
+
+
+def greedy_pairing(ranked_ids, past_pairs):
+    """
+    First-fit pairing scanning the ranking top-down, without backtracking.
+
+    Players left without a legal opponent are returned separately. Kept as a baseline for benchmarks.
+    """
+    pairs = []
+    used = set()
+    for i, pid1 in enumerate(ranked_ids):
+        if pid1 in used:
+            continue
+        for pid2 in ranked_ids[i + 1:]:
+            if pid2 not in used and tuple(sorted([pid1, pid2])) not in past_pairs:
+                pairs.append((pid1, pid2))
+                used.add(pid1)
+                used.add(pid2)
+                break
+    unpaired = [pid for pid in ranked_ids if pid not in used]
+    return pairs, unpaired
+
+
+def _edge_cost(score1, score2, rank1, rank2):
+    gap = round(abs(score1 - score2) * 2)
+    return SCORE_WEIGHT * gap * gap + abs(rank1 - rank2)
+
+
+def _brackets(players, scores, bracket_size):
+    """
+    Cut the ranking into consecutive brackets of at least bracket_size players, on score changes
+    when possible; very large score groups are cut anyway.
+    """
+    brackets = [[]]
+    for pid in players:
+        current = brackets[-1]
+        if len(current) >= 2 * bracket_size or (
+                len(current) >= bracket_size and scores[current[-1]] != scores[pid]):
+            brackets.append([])
+        brackets[-1].append(pid)
+    if len(brackets) > 1 and len(brackets[-1]) < bracket_size // 2:
+        last = brackets.pop()
+        brackets[-1].extend(last)
+    return brackets
+
+
+def _pair_brackets(brackets, scores, past_pairs, bye_ids):
+    pairs = []
+    floaters = []
+    for index, bracket in enumerate(brackets):
+        group = floaters + bracket
+        is_last = index == len(brackets) - 1
+        bracket_pairs, floaters = _solve(group, scores, past_pairs, bye_ids if is_last else None)
+        pairs.extend(bracket_pairs)
+    if floaters:
+        return None
+    pairs.sort(key=lambda pair: pair[1] is None)
+    return pairs
+
+
+def _solve(players, scores, past_pairs, bye_ids):
+    """
+    Pair one bracket optimally. With an odd number of players, an extra vertex takes either
+    the bye (last bracket, `bye_ids` given) or the player floating down to the next bracket.
+    Returns the pairs and the players left unpaired.
+    """
+    count = len(players)
+    candidates = []
+    for i in range(count):
+        pid1 = players[i]
+        for j in range(i + 1, count):
+            pid2 = players[j]
+            pair = (pid1, pid2) if pid1 < pid2 else (pid2, pid1)
+            if pair not in past_pairs:
+                candidates.append((i, j, _edge_cost(scores[pid1], scores[pid2], i, j)))
+
+    extra_vertex = count
+    if count % 2 == 1:
+        lowest = scores[players[-1]]
+        for i, pid in enumerate(players):
+            if bye_ids is None or pid not in bye_ids:
+                # Le bye (ou le flotteur) revient de préférence au joueur le moins bien classé.
+                candidates.append((i, extra_vertex, _edge_cost(scores[pid], lowest, i, count - 1)))
+
+    if not candidates:
+        return [], players
+    highest = max(cost for _, _, cost in candidates)
+    mate = max_weight_matching([(i, j, highest + 1 - cost) for i, j, cost in candidates], max_cardinality=True)
+    mate += [-1] * (count + 1 - len(mate))
+
+    pairs = []
+    unpaired = []
+    for i, pid in enumerate(players):
+        j = mate[i]
+        if j == extra_vertex:
+            if bye_ids is None:
+                unpaired.append(pid)
+            else:
+                pairs.append((pid, None))
+        elif j == -1:
+            unpaired.append(pid)
+        elif i < j:
+            pairs.append((pid, players[j]))
+    return pairs, unpaired
@@ -0,0 +1,75 @@
+class PairingHistory:
+    """
+    Incrementally maintained opponent index of a tournament.
+
+    For every player it keeps the set of opponents already met, the number of byes received
+    and the colour history ("W" for the first player of a match, "B" for the second). It is
+    updated each time a round is created, so pairing can tell whether two players have met
+    in O(1) without walking through the previous rounds.
+
+    The index is kept in memory only: saving it would rewrite it with every tournament, so
+    Tournament.from_dict rebuilds it from the rounds once per load and check() compares the
+    live index with them.
+    """
+    def __init__(self):
+        self.entries = {}
+
+    def _entry(self, player_id):
+        entry = self.entries.get(player_id)
+        if entry is None:
+            entry = self.entries[player_id] = {"opponents": set(), "byes": 0, "colours": ""}
+        return entry
+
+    def record_round(self, matches):
+        """
+        Add the pairings of a newly created round to the index.
+        """
+        for match in matches:
+            player1_id, player2_id = match.player1_id, match.player2_id
+            if player2_id is None:
+                self._entry(player1_id)["byes"] += 1
+                continue
+            white = self._entry(player1_id)
+            black = self._entry(player2_id)
+            white["opponents"].add(player2_id)
+            black["opponents"].add(player1_id)
+            white["colours"] += "W"
+            black["colours"] += "B"
+
+    def have_met(self, player1_id, player2_id):
+        """
+        Check whether two players have already been paired together.
+        """
+        entry = self.entries.get(player1_id)
+        return entry is not None and player2_id in entry["opponents"]
+
+    def __contains__(self, pair):
+        """
+        Support `(player1_id, player2_id) in history`, as used by the pairing engine.
+        """
+        return self.have_met(*pair)
+
+    def bye_ids(self):
+        """
+        Return the ids of the players who already received a bye.
+        """
+        return {pid for pid, entry in self.entries.items() if entry["byes"]}
+
+    @staticmethod
+    def from_rounds(rounds):
+        """
+        Rebuild the index from the rounds of a tournament.
+        """
+        history = PairingHistory()
+        for round_ in rounds:
+            history.record_round(round_.matches)
+        return history
+
+    def check(self, rounds):
+        """
+        Compare the index with the one rebuilt from `rounds` and return the ids of the players
+        whose entry differs (an empty list means the index is consistent).
+        """
+        expected = PairingHistory.from_rounds(rounds).entries
+        player_ids = set(expected) | set(self.entries)
+        return sorted(pid for pid in player_ids if expected.get(pid) != self.entries.get(pid))
@@ -1,19 +1,29 @@
-import json
-import os
+import sys
 
-DATA_FILE = "data/players.json"
+from models import storage
+from models.elo import DEFAULT_K_FACTOR, DEFAULT_RATING
 
 
 class Player:
     """
     Represents a chess tournament player.
+
+    Slotted, with interned strings: the id is shared by every reference to the player, and
+    names and birth dates, which repeat a lot in large rating lists, are stored once.
+    The Elo rating, K-factor and number of rated games are maintained by models.elo.
     """
+    __slots__ = ("last_name", "first_name", "birth_date", "id", "score", "rating", "k_factor", "games", "version")
+
     def __init__(self, last_name, first_name, birth_date, player_id=None):
-        self.last_name = last_name
-        self.first_name = first_name
-        self.birth_date = birth_date  # format: YYYY-MM-DD
-        self.id = player_id or f"{first_name.lower()}_{last_name.lower()}_{birth_date}"
+        self.last_name = sys.intern(last_name)
+        self.first_name = sys.intern(first_name)
+        self.birth_date = sys.intern(birth_date)  # format: YYYY-MM-DD
+        self.id = sys.intern(player_id or f"{first_name.lower()}_{last_name.lower()}_{birth_date}")
         self.score = 0
+        self.rating = DEFAULT_RATING
+        self.k_factor = DEFAULT_K_FACTOR
+        self.games = 0  # Rated games
+        self.version = 0  # Incremented on every save (optimistic concurrency control)
 
     def to_dict(self):
         """
@@ -24,7 +34,11 @@ class Player:
             "last_name": self.last_name,
             "first_name": self.first_name,
             "birth_date": self.birth_date,
-            "score": self.score
+            "score": self.score,
+            "rating": self.rating,
+            "k_factor": self.k_factor,
+            "games": self.games,
+            "version": self.version
         }
 
     @staticmethod
@@ -39,32 +53,107 @@ class Player:
             player_id=data["id"]
         )
         player.score = data.get("score", 0)
+        player.rating = data.get("rating", DEFAULT_RATING)
+        player.k_factor = data.get("k_factor", DEFAULT_K_FACTOR)
+        player.games = data.get("games", 0)
+        player.version = data.get("version", 0)
         return player
 
 
 class PlayerRepository:
     """
     Repository class for handling persistence of Player data.
+
+    Storage itself is delegated to the active backend (see models.storage). Loaded players are
+    kept in a session-scoped identity map: they are only deserialized again when the backend
+    reports a change, and saves are written through.
     """
+    _identity_map = storage.IdentityMap()
+    _index = None
+
     @staticmethod
     def load_players():
         """
-        Load all players from the JSON data file.
+        Load all players from the storage backend.
         """
-        if not os.path.exists(DATA_FILE):
+        backend = storage.get_backend()
+        cache = PlayerRepository._identity_map
+        signature = backend.signature("players")
+        if signature is None:
+            cache.invalidate()
             return []
+        if cache.is_complete(signature):
+            return cache.values()
 
-        with open(DATA_FILE, "r") as f:
-            data = json.load(f)
-            return [Player.from_dict(p) for p in data]
+        cache.load([Player.from_dict(p) for p in backend.load_players()], signature)
+        return cache.values()
 
     @staticmethod
-    def save_players(players):
+    def get_player(player_id):
         """
-        Save a list of players to the JSON data file.
+        Return the player with the given id, or None if it does not exist.
         """
-        with open(DATA_FILE, "w") as f:
-            json.dump([p.to_dict() for p in players], f, indent=4)
+        return PlayerRepository.get_index().get(player_id)
+
+    @staticmethod
+    def get_index():
+        """
+        Return the index of all players by id and by name (see models.player_index).
+
+        The index is built once and then kept up to date by the saves of this session; it is
+        only rebuilt when the players were changed by another process.
+        """
+        from models.player_index import PlayerIndex
+
+        signature = storage.get_backend().signature("players")
+        index = PlayerRepository._index
+        if index is None or index.signature != signature:
+            index = PlayerIndex(PlayerRepository.load_players(), signature)
+            PlayerRepository._index = index
+        return index
+
+    @staticmethod
+    def load_player_columns():
+        """
+        Load all players into a column store (see models.player_columns) without building
+        Player objects. Meant for bulk listings; use load_players() to modify players.
+        """
+        from models.player_columns import PlayerColumns
+
+        cache = PlayerRepository._identity_map
+        if cache.is_complete(storage.get_backend().signature("players")):
+            return PlayerColumns.from_records(p.to_dict() for p in cache.values())
+        return PlayerColumns.from_records(storage.get_backend().load_players())
+
+    @staticmethod
+    def save_players(players, changed=None):
+        """
+        Save a list of players. `changed` optionally lists the players that were actually modified,
+        which lets backends write only those.
+
+        Raises storage.ConcurrentModificationError if one of the saved players was modified by
+        another process since it was loaded.
+        """
+        backend = storage.get_backend()
+        cache = PlayerRepository._identity_map
+        previous = backend.signature("players")
+        try:
+            with storage.bumped_versions(players if changed is None else changed):
+                backend.save_players(players, changed=changed)
+        except BaseException:
+            PlayerRepository.invalidate()
+            raise
+        signature = backend.signature("players")
+        if changed is None:
+            cache.store(players, signature)
+        else:
+            cache.store_changed(changed, previous, signature)
+        index = PlayerRepository._index
+        if index is not None and changed is not None and index.signature == previous:
+            # L'index suit les joueurs enregistrés sans être reconstruit.
+            for player in changed:
+                index.add(player)
+            index.signature = signature
 
     @staticmethod
     def add_player(player):
@@ -73,4 +162,24 @@ class PlayerRepository:
         """
         players = PlayerRepository.load_players()
         players.append(player)
-        PlayerRepository.save_players(players)
+        PlayerRepository.save_players(players, changed=[player])
+
+    @staticmethod
+    def add_players(new_players):
+        """
+        Add several new players in a single batched save (see models.exchange for bulk imports).
+        """
+        new_players = list(new_players)
+        if not new_players:
+            return
+        players = PlayerRepository.load_players()
+        players.extend(new_players)
+        PlayerRepository.save_players(players, changed=new_players)
+
+    @staticmethod
+    def invalidate():
+        """
+        Forget the cached players so that the next load reads the storage backend again.
+        """
+        PlayerRepository._identity_map.invalidate()
+        PlayerRepository._index = None
@@ -0,0 +1,83 @@
+import sys
+from array import array
+
+from models.elo import DEFAULT_K_FACTOR, DEFAULT_RATING
+from models.player import Player
+
+
+class PlayerColumns:
+    """
+    Column store of players for bulk listings.
+
+    Instead of one object per player, every field is kept in its own column: ids and names in
+    lists of (interned) strings, birth dates as YYYYMMDD integers, scores, ratings and the other
+    numbers in typed arrays. Listing or sorting a large rating list then costs a few bytes per player; a Player
+    object is only built on demand with player().
+    """
+    def __init__(self):
+        self.ids = []
+        self.last_names = []
+        self.first_names = []
+        self.birth_dates = array("I")
+        self.scores = array("d")
+        self.ratings = array("d")
+        self.k_factors = array("B")
+        self.games = array("I")
+        self.versions = array("I")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, data):
+        """
+        Add a player given in its serialized (dictionary) form.
+        """
+        self.ids.append(sys.intern(data["id"]))
+        self.last_names.append(sys.intern(data["last_name"]))
+        self.first_names.append(sys.intern(data["first_name"]))
+        self.birth_dates.append(int(data["birth_date"].replace("-", "")))
+        self.scores.append(data.get("score", 0))
+        self.ratings.append(data.get("rating", DEFAULT_RATING))
+        self.k_factors.append(data.get("k_factor", DEFAULT_K_FACTOR))
+        self.games.append(data.get("games", 0))
+        self.versions.append(data.get("version", 0))
+
+    def birth_date(self, index):
+        """
+        Return the birth date of the player at `index` in the YYYY-MM-DD format.
+        """
+        value = self.birth_dates[index]
+        return f"{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}"
+
+    def player(self, index):
+        """
+        Build the Player object of the player at `index`.
+        """
+        return Player.from_dict({
+            "id": self.ids[index],
+            "last_name": self.last_names[index],
+            "first_name": self.first_names[index],
+            "birth_date": self.birth_date(index),
+            "score": self.scores[index],
+            "rating": self.ratings[index],
+            "k_factor": self.k_factors[index],
+            "games": self.games[index],
+            "version": self.versions[index],
+        })
+
+    def sorted_by_name(self):
+        """
+        Return the row indexes ordered by last name, then first name.
+        """
+        last_names, first_names = self.last_names, self.first_names
+        return sorted(range(len(self.ids)), key=lambda i: (last_names[i].lower(), first_names[i].lower()))
+
+    @staticmethod
+    def from_records(records):
+        """
+        Build the column store from serialized players.
+        """
+        columns = PlayerColumns()
+        for data in records:
+            columns.append(data)
+        return columns
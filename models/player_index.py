@@ -0,0 +1,96 @@
+"""
+Player lookup index.
+
+A PlayerIndex keeps, next to the hash index by id, a list of search keys sorted by
+(last name, first name). Keys are folded (accents removed, case ignored), so "Dupont", "dupont"
+and "Dûpont" are equivalent. New players are inserted with bisect, so the order is maintained
+without sorting again, and a name prefix is found by binary search: a search costs
+O(log n + page size) whatever the size of the database.
+"""
+import unicodedata
+from bisect import bisect_left, insort
+
+# Sorts after every character of a folded key: "prefix" + END bounds all keys starting with prefix.
+END = "\U0010ffff"
+
+
+def fold(text):
+    """
+    Return the search form of a text: without accents, case-folded and with single spaces.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).casefold().split())
+
+
+def search_key(player):
+    """
+    Return the sort and search key of a player: "last name first name", folded.
+    """
+    return f"{fold(player.last_name)} {fold(player.first_name)}"
+
+
+class PlayerIndex:
+    """
+    Index of players by id and by name, kept sorted on insert.
+
+    `signature` is the storage signature of the players the index was built from (see
+    PlayerRepository.get_index).
+    """
+    def __init__(self, players=(), signature=None):
+        self.by_id = {}
+        self.key_of = {}  # player id -> search key
+        self.signature = signature
+        for player in players:
+            self.by_id[player.id] = player
+            self.key_of[player.id] = search_key(player)
+        self.keys = sorted((key, pid) for pid, key in self.key_of.items())  # sorted (search key, player id) pairs
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, player_id):
+        return player_id in self.by_id
+
+    def __getitem__(self, player_id):
+        return self.by_id[player_id]
+
+    def get(self, player_id):
+        """
+        Return the player with the given id, or None.
+        """
+        return self.by_id.get(player_id)
+
+    def add(self, player):
+        """
+        Add a player, or update the entry of a player already indexed (for instance after a name change).
+        """
+        key = search_key(player)
+        previous = self.key_of.get(player.id)
+        if previous != key:
+            if previous is not None:
+                self.keys.pop(bisect_left(self.keys, (previous, player.id)))
+            insort(self.keys, (key, player.id))
+            self.key_of[player.id] = key
+        self.by_id[player.id] = player
+
+    def _bounds(self, query):
+        prefix = fold(query)
+        return bisect_left(self.keys, (prefix,)), bisect_left(self.keys, (prefix + END,))
+
+    def count(self, query=""):
+        """
+        Return the number of players whose "last name first name" starts with the query.
+        """
+        start, end = self._bounds(query)
+        return end - start
+
+    def search(self, query="", offset=0, limit=None):
+        """
+        Return the players whose "last name first name" starts with the query (accents and case
+        ignored), sorted by name; `offset` and `limit` select a page of the results.
+        """
+        start, end = self._bounds(query)
+        start = min(start + offset, end)
+        if limit is not None:
+            end = min(end, start + limit)
+        return [self.by_id[pid] for _, pid in self.keys[start:end]]
@@ -0,0 +1,90 @@
+"""
+Replay of the pairings of a tournament.
+
+A round paired with a seed (see Tournament.pairing_seed) can be generated again: its inputs are
+the players it contains, taken in registration order, their scores after the previous rounds,
+their ratings at registration, the pairs and byes of the previous rounds, and the seeded order
+of the players still tied.
+replay_tournament regenerates every such round and compares it with the stored one, board by
+board. Rounds paired without a seed, or by another version of the pairing engine, cannot be
+checked and are reported as such.
+
+A difference means that the stored round was not produced by the engine from these inputs: it
+was edited by hand, or a result of an earlier round was corrected after it was paired.
+"""
+from models.pairing import ENGINE_VERSION, PairingError, pair_round, rank_for_pairing, seeded_random
+from models.pairing_history import PairingHistory
+from models.standings import StandingsLedger
+
+IDENTICAL = "identical"
+DIFFERENT = "different"
+UNCHECKED = "unchecked"
+
+
+class RoundReplay:
+    """
+    Outcome of the replay of one round: its status and, when it differs, the differing boards.
+    """
+    def __init__(self, name, status, message="", differences=None):
+        self.name = name
+        self.status = status
+        self.message = message
+        self.differences = differences or []  # (board, stored pair, replayed pair)
+
+    def summary(self):
+        if self.status == IDENTICAL:
+            return f"{self.name} : appariements identiques."
+        return f"{self.name} : {self.message}"
+
+
+def replay_pairs(tournament, index):
+    """
+    Regenerate the pairs of the round at `index` from its stored inputs.
+
+    Raises ValueError when the round was paired without a seed or by another engine version,
+    and PairingError when no legal pairing exists for these inputs.
+    """
+    round_ = tournament.rounds[index]
+    if round_.pairing_seed is None:
+        raise ValueError("round apparié sans graine, non reproductible.")
+    if round_.pairing_engine != ENGINE_VERSION:
+        raise ValueError(f"round apparié par le moteur {round_.pairing_engine}, "
+                         f"le moteur actuel est {ENGINE_VERSION}.")
+
+    previous = tournament.rounds[:index]
+    present = {pid for match in round_.matches for pid in match.player_ids()}
+    players = [pid for pid in tournament.players if pid in present]
+    ledger = StandingsLedger.from_rounds(previous)
+    scores = {pid: ledger.score(pid) for pid in players}
+    history = PairingHistory.from_rounds(previous)
+    ranked = rank_for_pairing(players, scores, seeded_random(round_.pairing_seed, index + 1), tournament.ratings)
+    return pair_round(ranked, scores, history, history.bye_ids())
+
+
+def replay_round(tournament, index):
+    """
+    Regenerate the round at `index` and compare it with the stored one.
+    """
+    round_ = tournament.rounds[index]
+    try:
+        pairs = replay_pairs(tournament, index)
+    except ValueError as error:
+        return RoundReplay(round_.name, UNCHECKED, str(error))
+    except PairingError as error:
+        return RoundReplay(round_.name, DIFFERENT, f"rejeu impossible : {error}")
+
+    stored = [(match.player1_id, match.player2_id) for match in round_.matches]
+    if len(stored) != len(pairs):
+        return RoundReplay(round_.name, DIFFERENT,
+                           f"{len(pairs)} échiquier(s) au rejeu contre {len(stored)} enregistré(s).")
+    differences = [(board, old, new) for board, (old, new) in enumerate(zip(stored, pairs), start=1) if old != new]
+    if not differences:
+        return RoundReplay(round_.name, IDENTICAL)
+    return RoundReplay(round_.name, DIFFERENT, f"{len(differences)} échiquier(s) différent(s) du rejeu.", differences)
+
+
+def replay_tournament(tournament):
+    """
+    Replay every round of a tournament; returns one RoundReplay per round, in order.
+    """
+    return [replay_round(tournament, index) for index in range(len(tournament.rounds))]
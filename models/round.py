@@ -0,0 +1,150 @@
+import sys
+
+# Scores are kept in half points (small ints shared by the interpreter) and exposed through
+# these shared floats, so a match never allocates a score object of its own.
+SCORES = (0.0, 0.5, 1.0)
+
+# Result notations accepted on input, as (score1, score2).
+RESULT_CODES = {"1-0": (1.0, 0.0), "0-1": (0.0, 1.0), "1/2-1/2": (0.5, 0.5), "½-½": (0.5, 0.5), "=": (0.5, 0.5)}
+
+
+def half_points(score):
+    """
+    Convert a match score (0, 0.5 or 1) to half points; raises ValueError for any other value.
+    """
+    value = score * 2
+    if value not in (0, 1, 2):
+        raise ValueError(f"Score invalide : {score}")
+    return int(value)
+
+
+class Match:
+    """
+    A game between two players; player2_id is None for a bye.
+
+    Serialized as [[player1_id, score1], [player2_id, score2]], player 1 having White.
+    """
+    __slots__ = ("player1_id", "player2_id", "_points1", "_points2")
+
+    def __init__(self, player1_id, player2_id=None, score1=0.0, score2=0.0):
+        self.player1_id = player1_id if player1_id is None else sys.intern(player1_id)
+        self.player2_id = player2_id if player2_id is None else sys.intern(player2_id)
+        self._points1 = half_points(score1)
+        self._points2 = half_points(score2)
+
+    @property
+    def score1(self):
+        return SCORES[self._points1]
+
+    @score1.setter
+    def score1(self, score):
+        self._points1 = half_points(score)
+
+    @property
+    def score2(self):
+        return SCORES[self._points2]
+
+    @score2.setter
+    def score2(self, score):
+        self._points2 = half_points(score)
+
+    @property
+    def is_bye(self):
+        return self.player2_id is None
+
+    def player_ids(self):
+        """
+        Return the ids of the players of the match (one for a bye).
+        """
+        if self.player2_id is None:
+            return [self.player1_id]
+        return [self.player1_id, self.player2_id]
+
+    def set_result(self, score1, score2):
+        """
+        Record the result of the match.
+        """
+        self.score1 = score1
+        self.score2 = score2
+
+    def result_code(self):
+        """
+        Return the result in PGN notation ("1-0", "0-1" or "1/2-1/2"), or None while it is not entered.
+        """
+        if self._points1 + self._points2 == 0:
+            return None
+        return {2: "1-0", 1: "1/2-1/2", 0: "0-1"}[self._points1]
+
+    def to_list(self):
+        """
+        Convert the Match to its serialized [[id, score], [id, score]] form.
+        """
+        return [[self.player1_id, SCORES[self._points1]], [self.player2_id, SCORES[self._points2]]]
+
+    @staticmethod
+    def from_list(data):
+        """
+        Create a Match from its serialized form.
+        """
+        (player1_id, score1), (player2_id, score2) = data
+        return Match(player1_id, player2_id, score1, score2)
+
+
+class Round:
+    """
+    A round of a tournament: its name, start and end times and its matches.
+    """
+    __slots__ = ("name", "start_time", "end_time", "matches", "extra")
+
+    def __init__(self, name, start_time=None, end_time=None, matches=None, extra=None):
+        self.name = name
+        self.start_time = start_time
+        self.end_time = end_time  # None while the round is in progress
+        self.matches = matches if matches is not None else []
+        self.extra = extra        # Unknown serialized keys, kept for round trips (None if none)
+
+    @property
+    def is_finished(self):
+        return self.end_time is not None
+
+    @property
+    def pairing_seed(self):
+        """
+        Seed of the tournament when the round was paired (None for rounds paired without one).
+        """
+        return self.extra.get("pairing_seed") if self.extra else None
+
+    @property
+    def pairing_engine(self):
+        """
+        Version of the pairing engine that produced the round (see models.pairing.ENGINE_VERSION).
+        """
+        return self.extra.get("pairing_engine") if self.extra else None
+
+    def to_dict(self):
+        """
+        Convert the Round to a dictionary format for serialization.
+        """
+        data = {
+            "name": self.name,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "matches": [match.to_list() for match in self.matches]
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @staticmethod
+    def from_dict(data):
+        """
+        Create a Round from a dictionary.
+        """
+        extra = {k: v for k, v in data.items() if k not in ("name", "start_time", "end_time", "matches")}
+        return Round(
+            name=data["name"],
+            start_time=data.get("start_time"),
+            end_time=data.get("end_time"),
+            matches=[Match.from_list(match) for match in data.get("matches", [])],
+            extra=extra or None
+        )
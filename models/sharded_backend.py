@@ -0,0 +1,106 @@
+import json
+import os
+
+from models import storage
+from models.storage import JsonBackend, catalog_entry, check_versions, file_signature, locked
+
+
+class ShardedBackend(JsonBackend):
+    """
+    Storage backend writing one JSON file per tournament plus a small catalog index.
+
+    Players stay in the usual JSON file. The catalog holds the name, location, dates,
+    round progress, player count and status of every tournament, so listings never open
+    a tournament file; a tournament is only read when it is actually selected.
+    """
+    name = "sharded"
+    partial_saves = True
+
+    def __init__(self, players_file=None, tournaments_dir=None, catalog_file=None, lock_file=None):
+        super().__init__(players_file=players_file, lock_file=lock_file)
+        self.tournaments_dir = tournaments_dir or storage.TOURNAMENTS_DIR
+        self.catalog_file = catalog_file or storage.CATALOG_FILE
+
+    def signature(self, kind):
+        """
+        Return a value that changes whenever the stored players or tournaments change.
+        """
+        return file_signature(self.players_file if kind == "players" else self.catalog_file)
+
+    def load_catalog(self):
+        """
+        Return the catalog record of every tournament.
+        """
+        storage.recover_documents(self.lock_file)
+        return self._read(self.catalog_file)
+
+    def load_tournaments(self):
+        """
+        Return every stored tournament as a dictionary, in catalog order.
+        """
+        return [self.load_tournament(entry["id"]) for entry in self.load_catalog()]
+
+    def load_tournament(self, tournament_id):
+        """
+        Return a single stored tournament as a dictionary, or None if it does not exist.
+        """
+        storage.recover_documents(self.lock_file)
+        path = self._shard_path(tournament_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def commit(self, players=None, tournaments=None, changed_players=None, changed_tournaments=None):
+        """
+        Persist players and the given tournament shards, then the updated catalog, in one staged write.
+
+        Only the shards being written are read back for the version check, so operators working
+        on different tournaments never conflict.
+        """
+        with locked(self.lock_file):
+            documents = {}
+            if players is not None or changed_players is not None:
+                documents[self.players_file] = self._merge(self._read(self.players_file), players, changed_players)
+
+            if tournaments is not None or changed_tournaments is not None:
+                os.makedirs(self.tournaments_dir, exist_ok=True)
+                if changed_tournaments is None:
+                    catalog = {}
+                    changed_tournaments = tournaments
+                else:
+                    catalog = {entry["id"]: entry for entry in self.load_catalog()}
+                stored = (self.load_tournament(t.id) for t in changed_tournaments)
+                check_versions({data["id"]: data.get("version", 0) for data in stored if data is not None},
+                               changed_tournaments)
+                for tournament in changed_tournaments:
+                    data = tournament.to_dict()
+                    documents[self._shard_path(tournament.id)] = data
+                    catalog[tournament.id] = catalog_entry(data)
+                # Le catalogue est remplacé en dernier : il ne référence jamais un fichier absent.
+                documents[self.catalog_file] = list(catalog.values())
+
+            storage.write_json_documents(documents)
+            if tournaments is not None:
+                self._remove_stale_shards({t.id for t in tournaments})
+
+    def import_records(self, players, tournaments):
+        """
+        Replace the whole stored content with the given player and tournament dictionaries.
+        """
+        with locked(self.lock_file):
+            os.makedirs(self.tournaments_dir, exist_ok=True)
+            documents = {self.players_file: players}
+            for tournament in tournaments:
+                documents[self._shard_path(tournament["id"])] = tournament
+            documents[self.catalog_file] = [catalog_entry(t) for t in tournaments]
+            storage.write_json_documents(documents)
+            self._remove_stale_shards({t["id"] for t in tournaments})
+
+    def _shard_path(self, tournament_id):
+        return os.path.join(self.tournaments_dir, f"{tournament_id}.json")
+
+    def _remove_stale_shards(self, kept_ids):
+        for filename in os.listdir(self.tournaments_dir):
+            if filename.endswith(".json") and filename[:-len(".json")] not in kept_ids:
+                os.remove(os.path.join(self.tournaments_dir, filename))
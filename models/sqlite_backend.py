@@ -0,0 +1,372 @@
+import copy
+import json
+import sqlite3
+
+from models import storage
+from models.storage import check_versions, diff_tournament
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    id TEXT PRIMARY KEY,
+    last_name TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    birth_date TEXT NOT NULL,
+    score REAL NOT NULL DEFAULT 0,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    location TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    description TEXT,
+    number_of_rounds INTEGER NOT NULL,
+    current_round INTEGER NOT NULL,
+    is_closed INTEGER NOT NULL,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS registrations (
+    tournament_id TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    PRIMARY KEY (tournament_id, player_id)
+);
+CREATE INDEX IF NOT EXISTS idx_registrations_player ON registrations (player_id);
+CREATE TABLE IF NOT EXISTS rounds (
+    tournament_id TEXT NOT NULL,
+    round_index INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    start_time TEXT,
+    end_time TEXT,
+    extra TEXT,
+    PRIMARY KEY (tournament_id, round_index)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    tournament_id TEXT NOT NULL,
+    round_index INTEGER NOT NULL,
+    board INTEGER NOT NULL,
+    player1_id TEXT,
+    score1 REAL NOT NULL,
+    player2_id TEXT,
+    score2 REAL NOT NULL,
+    PRIMARY KEY (tournament_id, round_index, board)
+);
+CREATE INDEX IF NOT EXISTS idx_matches_player1 ON matches (player1_id);
+CREATE INDEX IF NOT EXISTS idx_matches_player2 ON matches (player2_id);
+"""
+
+PLAYER_COLUMNS = ("id", "last_name", "first_name", "birth_date", "score")
+TOURNAMENT_COLUMNS = (
+    "id", "name", "location", "start_date", "end_date", "description",
+    "number_of_rounds", "current_round", "is_closed"
+)
+ROUND_COLUMNS = ("name", "start_time", "end_time")
+
+
+def _extra(data, known):
+    """
+    Serialize the keys of a record that have no dedicated column, or None if there are none.
+    """
+    extra = {k: v for k, v in data.items() if k not in known}
+    return json.dumps(extra) if extra else None
+
+
+class SqliteBackend:
+    """
+    Storage backend based on a normalized SQLite database.
+
+    Players, tournaments, registrations, rounds and matches live in their own indexed tables.
+    Saving a tournament only writes the rows that changed since it was last loaded or saved,
+    so recording a result or registering a player is a single row write. Writes take the database
+    write lock up front (BEGIN IMMEDIATE) and check record versions inside the transaction.
+    """
+    name = "sqlite"
+    partial_saves = True
+
+    def __init__(self, path=None):
+        self.path = path or storage.SQLITE_FILE
+        self._connection = None
+        self._persisted = {}
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def signature(self, kind):
+        """
+        Return the write counter of the players or tournaments tables.
+        """
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (kind,)).fetchone()
+        return self.name, self.path, row[0] if row else 0
+
+    def load_players(self):
+        """
+        Return every stored player as a dictionary.
+        """
+        players = []
+        for row in self.connection.execute(f"SELECT {', '.join(PLAYER_COLUMNS)}, extra FROM players ORDER BY rowid"):
+            player = dict(zip(PLAYER_COLUMNS, row))
+            if row[-1]:
+                player.update(json.loads(row[-1]))
+            players.append(player)
+        return players
+
+    def load_tournaments(self):
+        """
+        Return every stored tournament as a dictionary, rebuilt from its normalized rows.
+        """
+        tournaments = self._read_tournaments()
+        self._persisted = copy.deepcopy(tournaments)
+        return list(tournaments.values())
+
+    def load_tournament(self, tournament_id):
+        """
+        Return a single stored tournament as a dictionary, or None if it does not exist.
+        """
+        tournament = self._read_tournaments(tournament_id).get(tournament_id)
+        if tournament is not None:
+            self._persisted[tournament_id] = copy.deepcopy(tournament)
+        return tournament
+
+    def _read_tournaments(self, tournament_id=None):
+        db = self.connection
+        where, params = ("", ()) if tournament_id is None else (" WHERE tournament_id = ?", (tournament_id,))
+        tournaments = {}
+        for row in db.execute(
+                f"SELECT {', '.join(TOURNAMENT_COLUMNS)}, extra FROM tournaments"
+                f"{where.replace('tournament_id', 'id')} ORDER BY rowid", params):
+            tournament = dict(zip(TOURNAMENT_COLUMNS, row))
+            tournament["is_closed"] = bool(tournament["is_closed"])
+            if row[-1]:
+                tournament.update(json.loads(row[-1]))
+            tournament["players"] = []
+            tournament["rounds"] = []
+            tournaments[tournament["id"]] = tournament
+
+        for tid, player_id in db.execute(
+                f"SELECT tournament_id, player_id FROM registrations{where} ORDER BY rowid", params):
+            tournaments[tid]["players"].append(player_id)
+
+        for tid, _, name, start_time, end_time, extra in db.execute(
+                "SELECT tournament_id, round_index, name, start_time, end_time, extra "
+                f"FROM rounds{where} ORDER BY tournament_id, round_index", params):
+            rnd = {"name": name, "start_time": start_time, "end_time": end_time, "matches": []}
+            if extra:
+                rnd.update(json.loads(extra))
+            tournaments[tid]["rounds"].append(rnd)
+
+        for tid, round_index, player1_id, score1, player2_id, score2 in db.execute(
+                "SELECT tournament_id, round_index, player1_id, score1, player2_id, score2 "
+                f"FROM matches{where} ORDER BY tournament_id, round_index, board", params):
+            match = [[player1_id, score1], [player2_id, score2]]
+            tournaments[tid]["rounds"][round_index]["matches"].append(match)
+        return tournaments
+
+    def load_catalog(self):
+        """
+        Return the catalog record of every tournament, computed without reading rounds or matches.
+        """
+        query = (
+            f"SELECT {', '.join('t.' + c for c in TOURNAMENT_COLUMNS)}, "
+            "(SELECT COUNT(*) FROM registrations r WHERE r.tournament_id = t.id) "
+            "FROM tournaments t ORDER BY t.rowid"
+        )
+        catalog = []
+        for row in self.connection.execute(query):
+            entry = dict(zip(TOURNAMENT_COLUMNS, row[:-1]))
+            entry["is_closed"] = bool(entry["is_closed"])
+            entry["player_count"] = row[-1]
+            catalog.append(entry)
+        return catalog
+
+    def save_players(self, players, changed=None):
+        """
+        Persist players; when `changed` is given, only those rows are written.
+        """
+        self.commit(players=players, changed_players=changed)
+
+    def save_tournaments(self, tournaments, changed=None):
+        """
+        Persist tournaments; when `changed` is given, only those tournaments are compared and written.
+        """
+        self.commit(tournaments=tournaments, changed_tournaments=changed)
+
+    def commit(self, players=None, tournaments=None, changed_players=None, changed_tournaments=None):
+        """
+        Persist players and/or tournaments in a single transaction.
+        """
+        db = self.connection
+        persisted = {}
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            if players is not None or changed_players is not None:
+                saved = players if changed_players is None else changed_players
+                check_versions(self._stored_versions(db, "players", saved), saved)
+                self._write_players(db, players, changed_players)
+                self._bump(db, "players")
+            if tournaments is not None or changed_tournaments is not None:
+                saved = tournaments if changed_tournaments is None else changed_tournaments
+                check_versions(self._stored_versions(db, "tournaments", saved), saved)
+                persisted = self._write_tournaments(db, tournaments, changed_tournaments)
+                self._bump(db, "tournaments")
+        self._persisted.update(persisted)
+
+    def import_records(self, players, tournaments):
+        """
+        Replace the whole database content with the given player and tournament dictionaries.
+        """
+        db = self.connection
+        with db:
+            for table in ("players", "tournaments", "registrations", "rounds", "matches"):
+                db.execute(f"DELETE FROM {table}")
+            self._upsert_players(db, players)
+            for tournament in tournaments:
+                self._insert_tournament(db, tournament)
+            self._bump(db, "players")
+            self._bump(db, "tournaments")
+        self._persisted = {t["id"]: copy.deepcopy(t) for t in tournaments}
+
+    @staticmethod
+    def _stored_versions(db, table, objects):
+        """
+        Return the stored version of each of the given records that exists in the table.
+        """
+        versions = {}
+        for obj in objects:
+            row = db.execute(f"SELECT extra FROM {table} WHERE id = ?", (obj.id,)).fetchone()
+            if row is not None:
+                versions[obj.id] = json.loads(row[0]).get("version", 0) if row[0] else 0
+        return versions
+
+    def _write_players(self, db, players, changed):
+        if changed is not None:
+            self._upsert_players(db, [p.to_dict() for p in changed])
+            return
+        data = [p.to_dict() for p in players]
+        kept = {p["id"] for p in data}
+        stale = [(pid,) for (pid,) in db.execute("SELECT id FROM players") if pid not in kept]
+        db.executemany("DELETE FROM players WHERE id = ?", stale)
+        self._upsert_players(db, data)
+
+    @staticmethod
+    def _upsert_players(db, players):
+        db.executemany(
+            "INSERT INTO players (id, last_name, first_name, birth_date, score, extra) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET last_name = excluded.last_name, first_name = excluded.first_name, "
+            "birth_date = excluded.birth_date, score = excluded.score, extra = excluded.extra",
+            [tuple(p.get(c, 0) for c in PLAYER_COLUMNS) + (_extra(p, PLAYER_COLUMNS),) for p in players]
+        )
+
+    def _write_tournaments(self, db, tournaments, changed):
+        persisted = {}
+        if changed is None:
+            kept = {t.id for t in tournaments}
+            for (tournament_id,) in db.execute("SELECT id FROM tournaments").fetchall():
+                if tournament_id not in kept:
+                    self._delete_tournament(db, tournament_id)
+                    self._persisted.pop(tournament_id, None)
+            changed = tournaments
+
+        for tournament in changed:
+            data = tournament.to_dict()
+            for event in diff_tournament(self._persisted.get(tournament.id), data):
+                self._apply(db, tournament.id, event)
+            persisted[tournament.id] = copy.deepcopy(data)
+        return persisted
+
+    def _apply(self, db, tournament_id, event):
+        """
+        Translate one change event into row writes.
+        """
+        kind = event["type"]
+        if kind == "tournament_created":
+            self._delete_tournament(db, tournament_id)
+            self._insert_tournament(db, event["tournament"])
+        elif kind == "tournament_updated":
+            self._update_tournament_fields(db, tournament_id, event["fields"], event.get("removed", ()))
+        elif kind == "player_registered":
+            db.execute("INSERT OR IGNORE INTO registrations (tournament_id, player_id) VALUES (?, ?)",
+                       (tournament_id, event["player_id"]))
+        elif kind == "players_replaced":
+            db.execute("DELETE FROM registrations WHERE tournament_id = ?", (tournament_id,))
+            self._insert_registrations(db, tournament_id, event["players"])
+        elif kind == "rounds_truncated":
+            db.execute("DELETE FROM rounds WHERE tournament_id = ? AND round_index >= ?",
+                       (tournament_id, event["count"]))
+            db.execute("DELETE FROM matches WHERE tournament_id = ? AND round_index >= ?",
+                       (tournament_id, event["count"]))
+        elif kind in ("round_started", "round_replaced"):
+            db.execute("DELETE FROM matches WHERE tournament_id = ? AND round_index = ?",
+                       (tournament_id, event["round"]))
+            self._insert_round(db, tournament_id, event["round"], event["data"])
+        elif kind == "match_result":
+            (player1_id, score1), (player2_id, score2) = event["match"]
+            db.execute("UPDATE matches SET score1 = ?, score2 = ? "
+                       "WHERE tournament_id = ? AND round_index = ? AND board = ?",
+                       (score1, score2, tournament_id, event["round"], event["board"]))
+        elif kind == "round_finalized":
+            db.execute("UPDATE rounds SET end_time = ? WHERE tournament_id = ? AND round_index = ?",
+                       (event["end_time"], tournament_id, event["round"]))
+
+    def _update_tournament_fields(self, db, tournament_id, fields, removed=()):
+        columns = {k: v for k, v in fields.items() if k in TOURNAMENT_COLUMNS and k != "id"}
+        if columns:
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            db.execute(f"UPDATE tournaments SET {assignments} WHERE id = ?", (*columns.values(), tournament_id))
+        if removed or any(k not in TOURNAMENT_COLUMNS for k in fields):
+            (extra,) = db.execute("SELECT extra FROM tournaments WHERE id = ?", (tournament_id,)).fetchone()
+            extra = json.loads(extra) if extra else {}
+            extra.update({k: v for k, v in fields.items() if k not in TOURNAMENT_COLUMNS})
+            for key in removed:
+                extra.pop(key, None)
+            db.execute("UPDATE tournaments SET extra = ? WHERE id = ?",
+                       (json.dumps(extra) if extra else None, tournament_id))
+
+    def _insert_tournament(self, db, tournament):
+        known = TOURNAMENT_COLUMNS + ("players", "rounds")
+        db.execute(
+            f"INSERT INTO tournaments ({', '.join(TOURNAMENT_COLUMNS)}, extra) "
+            f"VALUES ({', '.join('?' * (len(TOURNAMENT_COLUMNS) + 1))})",
+            tuple(tournament.get(c) for c in TOURNAMENT_COLUMNS) + (_extra(tournament, known),)
+        )
+        self._insert_registrations(db, tournament["id"], tournament.get("players", []))
+        for index, rnd in enumerate(tournament.get("rounds", [])):
+            self._insert_round(db, tournament["id"], index, rnd)
+
+    @staticmethod
+    def _insert_registrations(db, tournament_id, player_ids):
+        db.executemany("INSERT OR IGNORE INTO registrations (tournament_id, player_id) VALUES (?, ?)",
+                       [(tournament_id, pid) for pid in player_ids])
+
+    @staticmethod
+    def _insert_round(db, tournament_id, index, rnd):
+        db.execute(
+            "INSERT OR REPLACE INTO rounds (tournament_id, round_index, name, start_time, end_time, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (tournament_id, index, rnd["name"], rnd.get("start_time"), rnd.get("end_time"),
+             _extra(rnd, ROUND_COLUMNS + ("matches",)))
+        )
+        db.executemany(
+            "INSERT INTO matches (tournament_id, round_index, board, player1_id, score1, player2_id, score2) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(tournament_id, index, board, m[0][0], m[0][1], m[1][0], m[1][1])
+             for board, m in enumerate(rnd["matches"])]
+        )
+
+    @staticmethod
+    def _delete_tournament(db, tournament_id):
+        for table, column in (("tournaments", "id"), ("registrations", "tournament_id"),
+                              ("rounds", "tournament_id"), ("matches", "tournament_id")):
+            db.execute(f"DELETE FROM {table} WHERE {column} = ?", (tournament_id,))
+
+    @staticmethod
+    def _bump(db, kind):
+        db.execute("INSERT INTO meta (key, value) VALUES (?, 1) "
+                   "ON CONFLICT(key) DO UPDATE SET value = value + 1", (kind,))
@@ -0,0 +1,92 @@
+class StandingsLedger:
+    """
+    Per-tournament score ledger.
+
+    For every player of a tournament it keeps the score, the number of games played and the
+    result of each round as an [opponent_id, points] pair (opponent_id is None for a bye),
+    which are the inputs of the tiebreaks. It is updated as results are entered, so standings
+    never depend on the global Player.score nor on other tournaments.
+
+    The ledger is kept in memory only: Tournament.from_dict rebuilds it from the rounds once per
+    load, and check() compares the live ledger with them.
+    """
+    def __init__(self):
+        self.entries = {}
+
+    def _entry(self, player_id):
+        entry = self.entries.get(player_id)
+        if entry is None:
+            entry = self.entries[player_id] = {"score": 0.0, "games": 0, "results": []}
+        return entry
+
+    def record_match(self, round_index, match):
+        """
+        Record (or correct) the result of one match of the given round.
+        """
+        player1_id, player2_id = match.player1_id, match.player2_id
+        for player_id, opponent_id, points in ((player1_id, player2_id, match.score1),
+                                               (player2_id, player1_id, match.score2)):
+            if player_id is None:
+                continue
+            entry = self._entry(player_id)
+            results = entry["results"]
+            results.extend([None] * (round_index + 1 - len(results)))
+            previous = results[round_index]
+            if previous is not None:
+                entry["score"] -= previous[1]
+                if previous[0] is not None:
+                    entry["games"] -= 1
+            results[round_index] = [opponent_id, points]
+            entry["score"] += points
+            if opponent_id is not None:
+                entry["games"] += 1
+
+    def record_round(self, round_index, matches):
+        """
+        Record the results of every match of a round.
+        """
+        for match in matches:
+            self.record_match(round_index, match)
+
+    def score(self, player_id):
+        """
+        Return the tournament score of a player.
+        """
+        entry = self.entries.get(player_id)
+        return entry["score"] if entry else 0.0
+
+    def results(self, player_id):
+        """
+        Return the per-round [opponent_id, points] results of a player (None for rounds not played).
+        """
+        entry = self.entries.get(player_id)
+        return entry["results"] if entry else []
+
+    @staticmethod
+    def from_rounds(rounds):
+        """
+        Rebuild the ledger from the rounds of a tournament.
+
+        Finished rounds count in full. In a round still in progress, only the games whose result
+        was already entered count (see TournamentController.set_match_result); its byes count
+        when the round ends. This is the single rule for the round in progress: scores, pairing
+        and standings with their tiebreaks (models.tiebreaks) all read the ledger.
+        """
+        ledger = StandingsLedger()
+        for index, round_ in enumerate(rounds):
+            if round_.is_finished:
+                ledger.record_round(index, round_.matches)
+                continue
+            for match in round_.matches:
+                if not match.is_bye and match.result_code() is not None:
+                    ledger.record_match(index, match)
+        return ledger
+
+    def check(self, rounds):
+        """
+        Compare the ledger with the one rebuilt from `rounds` and return the ids of the players
+        whose entry differs (an empty list means the ledger is consistent).
+        """
+        expected = StandingsLedger.from_rounds(rounds).entries
+        player_ids = set(expected) | set(self.entries)
+        return sorted(pid for pid in player_ids if expected.get(pid) != self.entries.get(pid))
@@ -0,0 +1,658 @@
+import contextlib
+import copy
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou consultatif, les écritures restent atomiques.
+    fcntl = None
+
+BACKEND_ENV_VAR = "CHESS_STORAGE"
+DATA_DIR_ENV_VAR = "CHESS_DATA_DIR"
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE = os.path.join(PROJECT_DIR, "config.json")  # Optionnel : {"data_dir": "..."}
+COMMIT_FILE_NAME = ".commit"  # Commit en cours de write_documents, à rejouer s'il a été interrompu.
+
+# Fichiers de données, fixés par set_data_dir() (voir resolve_data_dir).
+DATA_DIR = PLAYERS_FILE = TOURNAMENTS_FILE = SQLITE_FILE = JOURNAL_FILE = None
+TOURNAMENTS_DIR = CATALOG_FILE = SNAPSHOT_FILE = BINARY_FILE = LOCK_FILE = None
+
+_backend = None
+_lock_depth = {}
+
+
+def resolve_data_dir():
+    """
+    Return the data directory: the CHESS_DATA_DIR environment variable, else the "data_dir" entry
+    of config.json in the project root (relative to that file), else data/ in the project root.
+
+    The result never depends on the current working directory, except for a relative
+    CHESS_DATA_DIR, which is taken as given on the command line.
+    """
+    path = os.environ.get(DATA_DIR_ENV_VAR)
+    if path:
+        return os.path.abspath(path)
+    try:
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            path = json.load(f).get("data_dir")
+    except FileNotFoundError:
+        path = None
+    return os.path.join(PROJECT_DIR, path or "data")
+
+
+def set_data_dir(path):
+    """
+    Point every data file at the directory `path`. The active backend is dropped, so the next
+    get_backend() creates one there (used at import time, and by tools and benchmarks).
+    """
+    global DATA_DIR, PLAYERS_FILE, TOURNAMENTS_FILE, SQLITE_FILE, JOURNAL_FILE, TOURNAMENTS_DIR, CATALOG_FILE
+    global SNAPSHOT_FILE, BINARY_FILE, LOCK_FILE, _backend
+    DATA_DIR = path
+    PLAYERS_FILE = os.path.join(path, "players.json")
+    TOURNAMENTS_FILE = os.path.join(path, "tournaments.json")
+    SQLITE_FILE = os.path.join(path, "chess.db")
+    JOURNAL_FILE = os.path.join(path, "journal.jsonl")
+    TOURNAMENTS_DIR = os.path.join(path, "tournaments")
+    CATALOG_FILE = os.path.join(path, "catalog.json")
+    SNAPSHOT_FILE = os.path.join(path, "snapshot.json")
+    BINARY_FILE = os.path.join(path, "chess.bin")
+    LOCK_FILE = os.path.join(path, ".lock")
+    _backend = None
+
+
+set_data_dir(resolve_data_dir())
+
+
+class ConcurrentModificationError(Exception):
+    """
+    Raised when a record was modified by another process since it was loaded, so that
+    saving it would silently overwrite that change (lost update).
+    """
+
+
+@contextlib.contextmanager
+def locked(path=None):
+    """
+    Hold the advisory lock of a data directory for the duration of a read-check-write sequence.
+
+    Writers from several processes (e.g. several entry terminals) are serialized by it. The lock is
+    re-entrant within a process. Taking it first finishes any commit of write_documents left
+    interrupted in the directory. Where fcntl is not available it is a no-op and only the atomic
+    replaces and version checks protect the data.
+    """
+    path = path or LOCK_FILE
+    if _lock_depth.get(path):
+        _lock_depth[path] += 1
+        try:
+            yield
+        finally:
+            _lock_depth[path] -= 1
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        _lock_depth[path] = 1
+        try:
+            _replay_commit(os.path.join(os.path.dirname(path), COMMIT_FILE_NAME))
+            yield
+        finally:
+            _lock_depth[path] = 0
+            # Fermer le fichier libère le verrou.
+
+
+def check_versions(stored_versions, objects):
+    """
+    Optimistic concurrency check before a write.
+
+    `objects` arrive with their version already incremented (see bumped_versions), so the stored
+    version of each must still be the one they were loaded with. `stored_versions` maps the id of
+    every stored record to its version. Raises ConcurrentModificationError otherwise.
+    """
+    for obj in objects:
+        expected = obj.version - 1
+        current = stored_versions.get(obj.id)
+        if current is None and expected == 0:
+            continue  # Nouvel enregistrement.
+        if current != expected:
+            raise ConcurrentModificationError(
+                "Les données ont été modifiées par un autre poste depuis leur chargement. "
+                "Elles ont été rechargées : veuillez recommencer l’opération."
+            )
+
+
+@contextlib.contextmanager
+def bumped_versions(objects):
+    """
+    Increment the version of the objects about to be saved, restoring it if the save fails.
+    """
+    objects = list({id(obj): obj for obj in objects}.values())
+    previous = [obj.version for obj in objects]
+    for obj in objects:
+        obj.version += 1
+    try:
+        yield
+    except BaseException:
+        for obj, version in zip(objects, previous):
+            obj.version = version
+        raise
+
+
+def write_json_documents(documents):
+    """
+    Write several JSON documents as a single commit (see write_documents).
+    Returns the number of bytes written.
+    """
+    return write_documents({path: json.dumps(data, indent=4).encode() for path, data in documents.items()})
+
+
+def write_documents(documents):
+    """
+    Write several files, given as {path: bytes}, as a single all-or-nothing commit.
+
+    Every document is first staged to a temporary sibling file and flushed to disk. A commit file
+    listing the staged files is then written next to them: once it exists the commit is decided,
+    and the targets are replaced before it is deleted. If the process dies while replacing, the
+    next lock of the data directory, read or write replays the commit (see recover_documents), so a
+    crash or Ctrl-C during a save never leaves a file truncated nor one file updated and the other
+    not. Returns the number of bytes written.
+    """
+    staged = []
+    written = 0
+    try:
+        for path, payload in documents.items():
+            tmp_path = f"{path}.tmp"
+            staged.append((tmp_path, path))
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            written += len(payload)
+    except BaseException:
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+    if not staged:
+        return written
+
+    directory = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for _, path in staged])
+    commit_file = os.path.join(directory, COMMIT_FILE_NAME)
+    entries = [[os.path.relpath(tmp_path, directory), os.path.relpath(path, directory)] for tmp_path, path in staged]
+    with open(f"{commit_file}.tmp", "w") as f:
+        json.dump(entries, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f"{commit_file}.tmp", commit_file)
+    _fsync_directory(directory)
+    _replay_commit(commit_file)
+    return written
+
+
+def recover_documents(lock_file=None):
+    """
+    Finish a commit of write_documents interrupted in the data directory of `lock_file`, if any.
+
+    Backends call it before reading; writers do not need to, as taking the lock replays it.
+    """
+    lock_file = lock_file or LOCK_FILE
+    if os.path.exists(os.path.join(os.path.dirname(lock_file), COMMIT_FILE_NAME)):
+        with locked(lock_file):
+            pass  # Prendre le verrou rejoue le commit, une fois l'écrivain éventuel terminé.
+
+
+def _replay_commit(commit_file):
+    """
+    Move the staged files listed in a commit file onto their targets, then delete it.
+    Files already moved by an interrupted run are skipped, so replaying twice is harmless.
+    """
+    directory = os.path.dirname(commit_file)
+    try:
+        with open(commit_file, "r") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return
+    for tmp_path, path in entries:
+        tmp_path = os.path.join(directory, tmp_path)
+        if os.path.exists(tmp_path):
+            os.replace(tmp_path, os.path.join(directory, path))
+    for target_directory in {os.path.dirname(os.path.join(directory, path)) for _, path in entries}:
+        _fsync_directory(target_directory)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(commit_file)
+    _fsync_directory(directory)
+
+
+def _fsync_directory(path):
+    """
+    Make the renames done in a directory durable. Skipped where directories cannot be opened (Windows).
+    """
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def file_signature(path):
+    """
+    Return a (mtime, size) pair identifying the current state of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def diff_tournament(old, new):
+    """
+    Describe the change between two serialized states of a tournament as a list of events.
+
+    Each event is a dict with a "type" key. Backends use them to persist only what changed
+    instead of rewriting the whole tournament.
+    """
+    if old is None:
+        return [{"type": "tournament_created", "tournament": new}]
+
+    events = []
+    fields = {
+        key: value for key, value in new.items()
+        if key not in ("players", "rounds") and old.get(key) != value
+    }
+    removed = [key for key in old if key not in new]
+    if removed:
+        events.append({"type": "tournament_updated", "fields": fields, "removed": removed})
+    elif fields:
+        events.append({"type": "tournament_updated", "fields": fields})
+
+    old_players, new_players = old.get("players", []), new.get("players", [])
+    if new_players[:len(old_players)] == old_players:
+        for player_id in new_players[len(old_players):]:
+            events.append({"type": "player_registered", "player_id": player_id})
+    else:
+        events.append({"type": "players_replaced", "players": new_players})
+
+    old_rounds, new_rounds = old.get("rounds", []), new.get("rounds", [])
+    if len(new_rounds) < len(old_rounds):
+        events.append({"type": "rounds_truncated", "count": len(new_rounds)})
+    for index, rnd in enumerate(new_rounds):
+        if index >= len(old_rounds):
+            events.append({"type": "round_started", "round": index, "data": rnd})
+            continue
+        previous = old_rounds[index]
+        if previous == rnd:
+            continue
+        if not _same_pairings(previous, rnd):
+            events.append({"type": "round_replaced", "round": index, "data": rnd})
+            continue
+        for board, (old_match, new_match) in enumerate(zip(previous["matches"], rnd["matches"])):
+            if old_match != new_match:
+                events.append({"type": "match_result", "round": index, "board": board, "match": new_match})
+        if previous.get("end_time") != rnd.get("end_time"):
+            events.append({"type": "round_finalized", "round": index, "end_time": rnd.get("end_time")})
+    return events
+
+
+def apply_tournament_event(tournament, event):
+    """
+    Apply one event produced by diff_tournament to a serialized tournament and return the result.
+    """
+    kind = event["type"]
+    if kind == "tournament_created":
+        return copy.deepcopy(event["tournament"])
+    if kind == "tournament_updated":
+        tournament.update(copy.deepcopy(event["fields"]))
+        for key in event.get("removed", ()):
+            tournament.pop(key, None)
+    elif kind == "player_registered":
+        tournament["players"].append(event["player_id"])
+    elif kind == "players_replaced":
+        tournament["players"] = list(event["players"])
+    elif kind == "rounds_truncated":
+        del tournament["rounds"][event["count"]:]
+    elif kind in ("round_started", "round_replaced"):
+        rnd = copy.deepcopy(event["data"])
+        if event["round"] < len(tournament["rounds"]):
+            tournament["rounds"][event["round"]] = rnd
+        else:
+            tournament["rounds"].append(rnd)
+    elif kind == "match_result":
+        tournament["rounds"][event["round"]]["matches"][event["board"]] = copy.deepcopy(event["match"])
+    elif kind == "round_finalized":
+        tournament["rounds"][event["round"]]["end_time"] = event["end_time"]
+    return tournament
+
+
+def _same_pairings(old_round, new_round):
+    """
+    Check that two states of a round only differ by match scores and end time.
+    """
+    ignored = ("matches", "end_time")
+    if {k: v for k, v in old_round.items() if k not in ignored} != \
+            {k: v for k, v in new_round.items() if k not in ignored}:
+        return False
+    if len(old_round["matches"]) != len(new_round["matches"]):
+        return False
+    return all(
+        old_match[0][0] == new_match[0][0] and old_match[1][0] == new_match[1][0]
+        for old_match, new_match in zip(old_round["matches"], new_round["matches"])
+    )
+
+
+class JsonBackend:
+    """
+    Storage backend keeping players and tournaments as two JSON arrays.
+
+    Saves run under the data directory lock: the arrays are read again, the versions of the
+    records being written are checked, and only those records are replaced before the files
+    are rewritten, so concurrent operators never overwrite each other's changes.
+    """
+    name = "json"
+    partial_saves = True
+
+    def __init__(self, players_file=None, tournaments_file=None, lock_file=None):
+        self.players_file = players_file or PLAYERS_FILE
+        self.tournaments_file = tournaments_file or TOURNAMENTS_FILE
+        self.lock_file = lock_file or LOCK_FILE
+
+    def signature(self, kind):
+        """
+        Return a value that changes whenever the stored players or tournaments change.
+        """
+        return file_signature(self.players_file if kind == "players" else self.tournaments_file)
+
+    def load_players(self):
+        """
+        Return every stored player as a dictionary.
+        """
+        recover_documents(self.lock_file)
+        return self._read(self.players_file)
+
+    def load_tournaments(self):
+        """
+        Return every stored tournament as a dictionary.
+        """
+        recover_documents(self.lock_file)
+        return self._read(self.tournaments_file)
+
+    def save_players(self, players, changed=None):
+        """
+        Persist players; when `changed` is given, only those records are replaced.
+        """
+        self.commit(players=players, changed_players=changed)
+
+    def save_tournaments(self, tournaments, changed=None):
+        """
+        Persist tournaments; when `changed` is given, only those records are replaced.
+        """
+        self.commit(tournaments=tournaments, changed_tournaments=changed)
+
+    def commit(self, players=None, tournaments=None, changed_players=None, changed_tournaments=None):
+        """
+        Persist players and/or tournaments together in one staged write.
+        """
+        with locked(self.lock_file):
+            documents = {}
+            if players is not None or changed_players is not None:
+                documents[self.players_file] = self._merge(self._read(self.players_file), players, changed_players)
+            if tournaments is not None or changed_tournaments is not None:
+                documents[self.tournaments_file] = self._merge(
+                    self._read(self.tournaments_file), tournaments, changed_tournaments)
+            write_json_documents(documents)
+
+    @staticmethod
+    def _merge(records, objects, changed):
+        """
+        Return the new content of a record list: the stored `records` with the `changed` ones replaced,
+        or exactly `objects` when `changed` is None, after checking the versions of what is written.
+        """
+        stored = {record["id"]: record for record in records}
+        check_versions({rid: record.get("version", 0) for rid, record in stored.items()},
+                       objects if changed is None else changed)
+        if changed is None:
+            return [obj.to_dict() for obj in objects]
+        for obj in changed:
+            stored[obj.id] = obj.to_dict()
+        return list(stored.values())
+
+    @staticmethod
+    def _read(path):
+        if not os.path.exists(path):
+            return []
+        with open(path, "r") as f:
+            return json.load(f)
+
+
+def get_backend():
+    """
+    Return the active storage backend, created on first use from the CHESS_STORAGE environment variable.
+    """
+    global _backend
+    if _backend is None:
+        _backend = create_backend(os.environ.get(BACKEND_ENV_VAR, "json"))
+    return _backend
+
+
+def set_backend(backend):
+    """
+    Replace the active storage backend (used by tools and benchmarks).
+    """
+    global _backend
+    _backend = backend
+
+
+def create_backend(name):
+    """
+    Build a storage backend from its name.
+    """
+    if name == "json":
+        return JsonBackend()
+    if name == "sqlite":
+        from models.sqlite_backend import SqliteBackend
+        return SqliteBackend()
+    if name == "journal":
+        from models.journal_backend import JournalBackend
+        return JournalBackend()
+    if name == "sharded":
+        from models.sharded_backend import ShardedBackend
+        return ShardedBackend()
+    if name == "binary":
+        from models.binary_backend import BinaryBackend
+        return BinaryBackend()
+    raise ValueError(f"Moteur de stockage inconnu : {name}")
+
+
+class IdentityMap:
+    """
+    Session-scoped cache holding one live object per id for a given data file.
+
+    The cache is considered fresh as long as the file signature it was built from is unchanged.
+    When the file changes on disk, the map is rebuilt but objects already handed out are
+    refreshed in place, so every caller keeps seeing a single instance per id.
+    The map may also hold only part of the records when they are loaded one by one.
+    """
+    def __init__(self):
+        self.objects = {}
+        self.retired = {}
+        self.signature = None
+        self.complete = False
+
+    def is_fresh(self, signature):
+        """
+        Check whether the cached objects still reflect the file with the given signature.
+        """
+        return self.signature is not None and self.signature == signature
+
+    def is_complete(self, signature):
+        """
+        Check whether the cache is fresh and holds every record.
+        """
+        return self.complete and self.is_fresh(signature)
+
+    def load(self, objects, signature):
+        """
+        Replace the cached content with freshly deserialized objects, reusing live instances.
+        """
+        self.retired.update(self.objects)
+        self.objects = {}
+        for obj in objects:
+            self._adopt(obj)
+        self.retired = {}
+        self.signature = signature
+        self.complete = True
+
+    def put(self, obj, signature):
+        """
+        Add a single freshly deserialized object, reusing the live instance for its id if any.
+        """
+        self._rebase(signature)
+        return self._adopt(obj)
+
+    def store(self, objects, signature):
+        """
+        Write-through update after a save: the saved objects become the live instances.
+        """
+        self.objects = {obj.id: obj for obj in objects}
+        self.retired = {}
+        self.signature = signature
+        self.complete = True
+
+    def store_one(self, obj, previous_signature, signature):
+        """
+        Write-through update after saving a single object. The other cached objects are kept
+        only if the cache was fresh right before the save.
+        """
+        self.store_changed([obj], previous_signature, signature)
+
+    def store_changed(self, objects, previous_signature, signature):
+        """
+        Write-through update after saving only some objects, as store_one.
+        """
+        if self.signature is not None and self.signature == previous_signature:
+            self.signature = signature
+        else:
+            self._rebase(signature)
+        for obj in objects:
+            self.objects[obj.id] = obj
+
+    def values(self):
+        """
+        Return the live objects as a new list, in file order.
+        """
+        return list(self.objects.values())
+
+    def get(self, object_id):
+        """
+        Return the live object for the given id, or None.
+        """
+        return self.objects.get(object_id)
+
+    def invalidate(self):
+        """
+        Drop the cached content; the next load will read the file again.
+        """
+        self.objects = {}
+        self.retired = {}
+        self.signature = None
+        self.complete = False
+
+    def _rebase(self, signature):
+        if self.signature != signature:
+            self.retired.update(self.objects)
+            self.objects = {}
+            self.signature = signature
+            self.complete = False
+
+    def _adopt(self, obj):
+        live = self.objects.get(obj.id) or self.retired.pop(obj.id, None)
+        if live is not None:
+            if hasattr(obj, "__dict__"):
+                live.__dict__.update(obj.__dict__)
+            else:
+                for name in obj.__slots__:
+                    setattr(live, name, getattr(obj, name))
+            obj = live
+        self.objects[obj.id] = obj
+        return obj
+
+
+def catalog_entry(tournament):
+    """
+    Build the lightweight catalog record used to list a serialized tournament without its rounds.
+    """
+    return {
+        "id": tournament["id"],
+        "name": tournament["name"],
+        "location": tournament["location"],
+        "start_date": tournament["start_date"],
+        "end_date": tournament["end_date"],
+        "description": tournament["description"],
+        "current_round": tournament.get("current_round", 0),
+        "number_of_rounds": tournament.get("number_of_rounds", 4),
+        "player_count": len(tournament.get("players", [])),
+        "is_closed": tournament.get("is_closed", False),
+    }
+
+
+def migrate_json(target, players_file=None, tournaments_file=None):
+    """
+    Copy every player and tournament from the JSON files into another storage backend.
+    """
+    source = JsonBackend(players_file, tournaments_file)
+    players = source.load_players()
+    tournaments = source.load_tournaments()
+    target.import_records(players, tournaments)
+    return len(players), len(tournaments)
+
+
+def export_json(source, players_file=None, tournaments_file=None):
+    """
+    Copy every player and tournament from a storage backend back into the JSON files.
+    """
+    players_file = players_file or PLAYERS_FILE
+    tournaments_file = tournaments_file or TOURNAMENTS_FILE
+    players = source.load_players()
+    tournaments = source.load_tournaments()
+    with locked():
+        write_json_documents({players_file: players, tournaments_file: tournaments})
+    return len(players), len(tournaments)
+
+
+def migrate_json_to_sqlite(players_file=None, tournaments_file=None, db_file=None):
+    """
+    Copy every player and tournament from the JSON files into a SQLite database.
+    """
+    from models.sqlite_backend import SqliteBackend
+
+    return migrate_json(SqliteBackend(db_file), players_file, tournaments_file)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Outils de stockage des données du tournoi.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Migrer data/*.json vers un autre moteur de stockage.")
+    migrate.add_argument("--to", choices=["sqlite", "journal", "sharded", "binary"], default="sqlite")
+    migrate.add_argument("--players", default=PLAYERS_FILE)
+    migrate.add_argument("--tournaments", default=TOURNAMENTS_FILE)
+    export = subparsers.add_parser("export", help="Réécrire data/*.json depuis un autre moteur de stockage.")
+    export.add_argument("--from", dest="source", choices=["sqlite", "journal", "sharded", "binary"], required=True)
+    export.add_argument("--players", default=PLAYERS_FILE)
+    export.add_argument("--tournaments", default=TOURNAMENTS_FILE)
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        player_count, tournament_count = migrate_json(create_backend(args.to), args.players, args.tournaments)
+        print(f"✅ {player_count} joueur(s) et {tournament_count} tournoi(s) migrés vers le moteur {args.to}.")
+    else:
+        player_count, tournament_count = export_json(create_backend(args.source), args.players, args.tournaments)
+        print(f"✅ {player_count} joueur(s) et {tournament_count} tournoi(s) exportés depuis le moteur {args.source}.")
@@ -0,0 +1,87 @@
+"""
+Tiebreak computation.
+
+All tiebreaks of a tournament are computed together from its standings ledger
+(models.standings), which already holds every player's score and per-round (opponent, points)
+results, so no round is scanned again. Scores are first read into an array indexed like the
+players; Buchholz, Sonneborn-Berger and direct encounter then only read opponents' scores from it.
+The results counted are those of the ledger: completed rounds, plus the games already entered
+in the round in progress.
+
+Byes count as points for the player but add nothing to the opponent-based tiebreaks.
+"""
+
+TIEBREAKS = {
+    "direct_encounter": "Confrontation directe",
+    "buchholz_cut1": "Buchholz cut-1",
+    "buchholz": "Buchholz",
+    "sonneborn_berger": "Sonneborn-Berger",
+    "progressive": "Progressif",
+}
+
+DEFAULT_TIEBREAK_ORDER = ["direct_encounter", "buchholz_cut1", "buchholz", "sonneborn_berger", "progressive"]
+
+
+def validate_order(order):
+    """
+    Check a tiebreak order and return it as a list; raises ValueError on an unknown or repeated tiebreak.
+    """
+    order = list(order)
+    unknown = [name for name in order if name not in TIEBREAKS]
+    if unknown:
+        raise ValueError(f"Départage inconnu : {', '.join(unknown)}.")
+    if len(set(order)) != len(order):
+        raise ValueError("Un départage ne peut apparaître qu'une seule fois.")
+    return order
+
+
+def compute_tiebreaks(player_ids, ledger):
+    """
+    Compute the score and every tiebreak of the given players from the tournament's standings ledger.
+
+    Returns a dict mapping each player id to {"score": ..., "<tiebreak>": ...}.
+    """
+    index = {pid: i for i, pid in enumerate(player_ids)}
+    entries = [ledger.entries.get(pid) for pid in player_ids]
+    scores = [entry["score"] if entry else 0.0 for entry in entries]
+    round_count = max((len(entry["results"]) for entry in entries if entry), default=0)
+
+    table = {}
+    for pid, i in index.items():
+        results = []
+        progressive = 0.0
+        for number, result in enumerate(entries[i]["results"] if entries[i] else []):
+            if result is None:
+                continue
+            opponent_id, points = result
+            # Les points du round comptent dans le score progressif de chaque round restant.
+            progressive += points * (round_count - number)
+            j = index.get(opponent_id)
+            if j is not None:
+                results.append((j, points))
+        opponent_scores = [scores[j] for j, _ in results]
+        buchholz = sum(opponent_scores)
+        table[pid] = {
+            "score": scores[i],
+            "direct_encounter": sum(points for j, points in results if scores[j] == scores[i]),
+            "buchholz_cut1": buchholz - min(opponent_scores) if opponent_scores else 0.0,
+            "buchholz": buchholz,
+            "sonneborn_berger": sum(points * scores[j] for j, points in results),
+            "progressive": progressive,
+        }
+    return table
+
+
+def rank_players(player_ids, ledger, order=DEFAULT_TIEBREAK_ORDER):
+    """
+    Rank the players by score, then by the tiebreaks in the given order.
+
+    Returns a list of (player_id, values) pairs, values being the dict built by compute_tiebreaks.
+    Players still tied keep their registration order.
+    """
+    order = validate_order(order)
+    table = compute_tiebreaks(player_ids, ledger)
+    return sorted(
+        ((pid, table[pid]) for pid in player_ids),
+        key=lambda item: [-item[1]["score"]] + [-item[1][name] for name in order]
+    )
@@ -1,8 +1,11 @@
-import json
-import os
-import uuid
+import sys
 
-TOURNAMENTS_FILE = "data/tournaments.json"
+from models import storage
+from models.pairing_history import PairingHistory
+from models.player import PlayerRepository
+from models.round import Round
+from models.standings import StandingsLedger
+from models.tiebreaks import DEFAULT_TIEBREAK_ORDER
 
 
 class Tournament:
@@ -10,7 +13,8 @@ class Tournament:
     Represents a chess tournament with relevant attributes such as name, location, date, players, and rounds.
     """
     def __init__(
-            self, name, location, start_date, end_date, description, id=None, number_of_rounds=4, is_closed=False):
+            self, name, location, start_date, end_date, description, id=None, number_of_rounds=4, is_closed=False,
+            tiebreaks=None, pairing_seed=None):
         """
         Initializes a new Tournament instance.
         """
@@ -19,12 +23,26 @@ class Tournament:
         self.start_date = start_date  # format: YYYY-MM-DD
         self.end_date = end_date      # format: YYYY-MM-DD
         self.description = description
-        self.id = id or str(uuid.uuid4())
+        if not id:
+            import uuid  # Seulement pour un nouveau tournoi : uuid est lent à importer.
+
+            id = str(uuid.uuid4())
+        self.id = id
         self.number_of_rounds = number_of_rounds
         self.current_round = 0
-        self.rounds = []        # List of rounds
+        self.rounds = []        # List of Round objects
         self.players = []       # List of player IDs
         self.is_closed = is_closed
+        # Tiebreak order, see models.tiebreaks
+        self.tiebreaks = list(DEFAULT_TIEBREAK_ORDER if tiebreaks is None else tiebreaks)
+        # Indexes derived from the rounds: not serialized, rebuilt by from_dict
+        self.pairing_history = PairingHistory()
+        self.standings = StandingsLedger()
+        # Seed of the pairing order on equal scores, see models.pairing (None: not reproducible)
+        self.pairing_seed = pairing_seed
+        # Elo rating of each player when registered, used to order players on equal scores
+        self.ratings = {}
+        self.version = 0  # Incremented on every save (optimistic concurrency control)
 
     def to_dict(self):
         """
@@ -39,15 +57,22 @@ class Tournament:
             "id": self.id,
             "number_of_rounds": self.number_of_rounds,
             "current_round": self.current_round,
-            "rounds": self.rounds,
+            "rounds": [rnd.to_dict() for rnd in self.rounds],
             "players": self.players,
-            "is_closed": self.is_closed
+            "is_closed": self.is_closed,
+            "tiebreaks": self.tiebreaks,
+            "pairing_seed": self.pairing_seed,
+            "ratings": self.ratings,
+            "version": self.version
         }
 
     @staticmethod
     def from_dict(data):
         """
         Creates a Tournament object from a dictionary.
+
+        The pairing history and standings ledger are rebuilt from the rounds; the copies stored
+        in the documents of earlier versions are ignored (and dropped at the next save).
         """
         tournament = Tournament(
             id=data.get("id"),
@@ -57,42 +82,224 @@ class Tournament:
             end_date=data["end_date"],
             description=data["description"],
             number_of_rounds=data.get("number_of_rounds", 4),
-            is_closed=data.get("is_closed", False)
+            is_closed=data.get("is_closed", False),
+            tiebreaks=data.get("tiebreaks"),
+            pairing_seed=data.get("pairing_seed")
         )
         tournament.current_round = data.get("current_round", 0)
-        tournament.rounds = data.get("rounds", [])
-        tournament.players = data.get("players", [])
+        tournament.rounds = [Round.from_dict(rnd) for rnd in data.get("rounds", [])]
+        tournament.players = [sys.intern(pid) for pid in data.get("players", [])]
+        tournament.version = data.get("version", 0)
+        tournament.ratings = data.get("ratings") or {}
+        tournament.pairing_history = PairingHistory.from_rounds(tournament.rounds)
+        tournament.standings = StandingsLedger.from_rounds(tournament.rounds)
         return tournament
 
 
 class TournamentRepository:
     """
-    Handles loading, saving, and updating tournament data to and from the JSON file.
+    Handles loading, saving, and updating tournament data through the active storage backend.
+
+    Like PlayerRepository, loaded tournaments are cached in a session-scoped identity map
+    that is only rebuilt when the backend reports a change.
     """
+    _identity_map = storage.IdentityMap()
+    _analytics = None
+
     @staticmethod
     def load_tournaments():
         """
-        Loads all tournaments from the JSON file.
+        Loads all tournaments from the storage backend.
         """
-        if not os.path.exists(TOURNAMENTS_FILE):
+        backend = storage.get_backend()
+        cache = TournamentRepository._identity_map
+        signature = backend.signature("tournaments")
+        if signature is None:
+            cache.invalidate()
             return []
-        with open(TOURNAMENTS_FILE, "r") as f:
-            data = json.load(f)
-            return [Tournament.from_dict(t) for t in data]
+        if cache.is_complete(signature):
+            return cache.values()
+
+        cache.load([Tournament.from_dict(t) for t in backend.load_tournaments()], signature)
+        return cache.values()
+
+    @staticmethod
+    def get_tournament(tournament_id):
+        """
+        Returns the tournament with the given id, or None if it does not exist.
+
+        Backends able to read a single tournament only load that one.
+        """
+        backend = storage.get_backend()
+        cache = TournamentRepository._identity_map
+        signature = backend.signature("tournaments")
+        if cache.is_fresh(signature) and cache.get(tournament_id) is not None:
+            return cache.get(tournament_id)
+        if not hasattr(backend, "load_tournament"):
+            TournamentRepository.load_tournaments()
+            return cache.get(tournament_id)
+
+        data = backend.load_tournament(tournament_id)
+        if data is None:
+            return None
+        return cache.put(Tournament.from_dict(data), signature)
 
     @staticmethod
-    def save_tournaments(tournaments):
+    def load_catalog():
         """
-        Saves the given list of tournaments to the JSON file.
+        Returns the lightweight catalog record (name, location, dates, progress, player count,
+        status) of every tournament, without loading rounds when the backend keeps an index.
         """
-        with open(TOURNAMENTS_FILE, "w") as f:
-            json.dump([t.to_dict() for t in tournaments], f, indent=4)
+        backend = storage.get_backend()
+        if hasattr(backend, "load_catalog"):
+            return backend.load_catalog()
+        return [storage.catalog_entry(t.to_dict()) for t in TournamentRepository.load_tournaments()]
+
+    @staticmethod
+    def save_tournaments(tournaments, changed=None):
+        """
+        Saves the given list of tournaments. `changed` optionally lists the tournaments that were
+        actually modified, which lets backends write only those.
+
+        Raises storage.ConcurrentModificationError if one of the saved tournaments was modified by
+        another process since it was loaded.
+        """
+        backend = storage.get_backend()
+        previous = backend.signature("tournaments")
+        try:
+            with storage.bumped_versions(tournaments if changed is None else changed):
+                backend.save_tournaments(tournaments, changed=changed)
+        except BaseException:
+            TournamentRepository.invalidate()
+            raise
+        TournamentRepository._identity_map.store(tournaments, backend.signature("tournaments"))
+        TournamentRepository._track_analytics(tournaments if changed is None else changed, previous)
+
+    @staticmethod
+    def save_tournament(tournament):
+        """
+        Saves a single tournament, adding it to the stored list if it is not there yet.
+        """
+        TournamentRepository.save_changed([tournament])
+
+    @staticmethod
+    def save_changed(tournaments):
+        """
+        Saves several modified tournaments together in a single write, adding those that are
+        not stored yet.
+        """
+        if not tournaments:
+            return
+        backend = storage.get_backend()
+        if not backend.partial_saves:
+            stored = None
+            for tournament in tournaments:
+                stored = TournamentRepository._with_tournament(tournament, stored)
+            TournamentRepository.save_tournaments(stored, changed=tournaments)
+            return
+
+        cache = TournamentRepository._identity_map
+        previous = backend.signature("tournaments")
+        try:
+            with storage.bumped_versions(tournaments):
+                backend.save_tournaments(None, changed=tournaments)
+        except BaseException:
+            TournamentRepository.invalidate()
+            raise
+        cache.store_changed(tournaments, previous, backend.signature("tournaments"))
+        TournamentRepository._track_analytics(tournaments, previous)
 
     @staticmethod
     def add_tournament(tournament):
         """
         Adds a new tournament to the list and saves it.
         """
-        tournaments = TournamentRepository.load_tournaments()
-        tournaments.append(tournament)
-        TournamentRepository.save_tournaments(tournaments)
+        TournamentRepository.save_tournament(tournament)
+
+    @staticmethod
+    def commit(tournament, players=None, changed_players=None):
+        """
+        Saves a tournament and the players together in a single write: every player in `players`,
+        or only the `changed_players` when they are given (`players` may then be omitted).
+        """
+        backend = storage.get_backend()
+        cache = TournamentRepository._identity_map
+        previous = backend.signature("tournaments")
+        previous_players = backend.signature("players")
+        tournaments = None if backend.partial_saves else TournamentRepository._with_tournament(tournament)
+        saved_players = players if changed_players is None else changed_players
+        try:
+            with storage.bumped_versions([tournament, *saved_players]):
+                backend.commit(players=players, tournaments=tournaments,
+                               changed_players=changed_players, changed_tournaments=[tournament])
+        except BaseException:
+            PlayerRepository.invalidate()
+            TournamentRepository.invalidate()
+            raise
+        if changed_players is None:
+            PlayerRepository._identity_map.store(players, backend.signature("players"))
+        else:
+            PlayerRepository._identity_map.store_changed(
+                changed_players, previous_players, backend.signature("players"))
+        if tournaments is None:
+            cache.store_one(tournament, previous, backend.signature("tournaments"))
+        else:
+            cache.store(tournaments, backend.signature("tournaments"))
+        TournamentRepository._track_analytics([tournament], previous)
+
+    @staticmethod
+    def get_analytics():
+        """
+        Return the player history and head-to-head index of all tournaments (see models.analytics).
+
+        The index is built in one pass over the tournaments and then kept up to date by the saves
+        of this session; it is only rebuilt when the tournaments were changed by another process.
+        """
+        from models.analytics import AnalyticsIndex
+
+        backend = storage.get_backend()
+        cache = TournamentRepository._identity_map
+        signature = backend.signature("tournaments")
+        index = TournamentRepository._analytics
+        if index is None or index.signature != signature:
+            index = AnalyticsIndex(signature)
+            if cache.is_complete(signature):
+                for tournament in cache.values():
+                    index.record(tournament)
+            elif signature is not None:
+                index = AnalyticsIndex.from_tournaments(backend.load_tournaments(), signature)
+            TournamentRepository._analytics = index
+        return index
+
+    @staticmethod
+    def _track_analytics(tournaments, previous):
+        index = TournamentRepository._analytics
+        if index is not None and index.signature == previous:
+            # L'index suit les tournois enregistrés sans être reconstruit.
+            for tournament in tournaments:
+                index.record(tournament)
+            index.signature = storage.get_backend().signature("tournaments")
+
+    @staticmethod
+    def invalidate():
+        """
+        Forgets the cached tournaments so that the next load reads the storage backend again.
+        """
+        TournamentRepository._identity_map.invalidate()
+        TournamentRepository._analytics = None
+
+    @staticmethod
+    def _with_tournament(tournament, tournaments=None):
+        """
+        Returns the stored tournaments (or the given list) with the given one replacing its
+        previous version or appended.
+        """
+        if tournaments is None:
+            tournaments = TournamentRepository.load_tournaments()
+        for i, t in enumerate(tournaments):
+            if t.id == tournament.id:
+                tournaments[i] = tournament
+                break
+        else:
+            tournaments.append(tournament)
+        return tournaments
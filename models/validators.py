@@ -0,0 +1,43 @@
+"""
+Input validation rules shared by the interactive views and the bulk imports (models.exchange).
+"""
+import re
+from datetime import datetime
+
+NAME_PATTERN = re.compile(r"[A-Za-zÀ-ÿ\- ]{2,}")
+TEXT_FIELD_PATTERN = re.compile(r"[A-Za-z0-9À-ÿ ,.'\-]{2,}")
+
+
+def validate_name(name):
+    """
+    Validates that a name contains only letters, hyphens, or spaces and is at least two characters long.
+    """
+    return bool(NAME_PATTERN.fullmatch(name))
+
+
+def validate_birth_date(date_str):
+    """
+    Validates that the date is in the format YYYY-MM-DD and is not a future date.
+    """
+    try:
+        birth_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        return birth_date <= datetime.today().date()
+    except ValueError:
+        return False
+
+
+def validate_text_field(text):
+    """
+    Validates a general text field (name, location, etc.).
+    """
+    return bool(TEXT_FIELD_PATTERN.fullmatch(text))
+
+
+def validate_date(date_str):
+    """
+    Validates and parses a date string in the format YYYY-MM-DD.
+    """
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return None
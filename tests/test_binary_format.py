@@ -0,0 +1,159 @@
+"""
+Round-trip tests of the binary format (models.binary_format) and of the binary storage backend
+against the JSON backend on the same data.
+
+Run from the project root:
+
+    python -m pytest tests
+"""
+import copy
+import os
+import tempfile
+import unittest
+
+from models import binary_format, storage
+from models.binary_backend import BinaryBackend
+from models.player import Player
+from models.round import Match, Round
+from models.tournament import Tournament
+
+
+def _players():
+    return [Player(f"Nom{i}", f"Prénom{i}", f"19{60 + i}-0{1 + i % 9}-15", player_id=f"p{i}") for i in range(5)]
+
+
+def _tournament(finished_rounds=2, round_in_progress=True):
+    """
+    Return a tournament of five players (one bye per round) with finished rounds and, optionally,
+    a round in progress where only the first board has a result.
+    """
+    tournament = Tournament("Open", "Paris", "2025-01-01", "2025-01-02", "", id="t1", pairing_seed="graine")
+    tournament.players = [f"p{i}" for i in range(5)]
+    tournament.ratings = {pid: 1500.0 for pid in tournament.players}
+    results = [(1.0, 0.0), (0.5, 0.5)]
+    for index in range(finished_rounds):
+        order = tournament.players[index:] + tournament.players[:index]
+        matches = [Match(order[0], order[1], *results[0]), Match(order[2], order[3], *results[1]),
+                   Match(order[4], None, 1.0)]
+        tournament.rounds.append(Round(f"Round {index + 1}", "2025-01-01 10:00:00", "2025-01-01 12:00:00", matches,
+                                       extra={"pairing_engine": 2, "pairing_seed": "graine"}))
+    if round_in_progress:
+        matches = [Match("p4", "p0", 0.0, 1.0), Match("p1", "p2"), Match("p3", None, 1.0)]
+        tournament.rounds.append(Round(f"Round {finished_rounds + 1}", "2025-01-02 10:00:00", matches=matches))
+    tournament.current_round = len(tournament.rounds)
+    return tournament
+
+
+def _legacy_document(document):
+    """
+    Return a tournament document as saved before the derived indexes were left out of it.
+    """
+    loaded = Tournament.from_dict(document)
+    pairing_history = {pid: dict(entry, opponents=sorted(entry["opponents"]))
+                       for pid, entry in loaded.pairing_history.entries.items()}
+    return dict(document, standings=copy.deepcopy(loaded.standings.entries), pairing_history=pairing_history)
+
+
+class BinaryFormatTest(unittest.TestCase):
+    def test_round_trip(self):
+        players = [p.to_dict() for p in _players()]
+        tournaments = [_tournament().to_dict()]
+        self.assertEqual(binary_format.decode(binary_format.encode(players, tournaments)),
+                         (players, tournaments))
+
+    def test_round_in_progress(self):
+        tournament = _tournament()
+        _, (decoded,) = binary_format.decode(binary_format.encode([], [tournament.to_dict()]))
+        current = decoded["rounds"][-1]
+        self.assertIsNone(current["end_time"])
+        self.assertEqual(current["matches"], [[["p4", 0.0], ["p0", 1.0]], [["p1", 0.0], ["p2", 0.0]],
+                                              [["p3", 1.0], [None, 0.0]]])
+        loaded = Tournament.from_dict(decoded)
+        self.assertEqual(loaded.standings.entries, Tournament.from_dict(tournament.to_dict()).standings.entries)
+        # Seul le résultat saisi du round en cours compte, pas encore l'exempt.
+        self.assertEqual(loaded.standings.results("p3"), [["p2", 0.5], ["p4", 0.5]])
+        self.assertEqual(loaded.standings.results("p0")[-1], ["p4", 1.0])
+
+    def test_rebuildable_indexes_left_out(self):
+        document = _tournament().to_dict()
+        expected = Tournament.from_dict(document)
+        legacy = _legacy_document(document)
+        _, (decoded,) = binary_format.decode(binary_format.encode([], [legacy]))
+        self.assertNotIn("standings", decoded)
+        self.assertNotIn("pairing_history", decoded)
+        self.assertEqual(decoded, document)
+        loaded = Tournament.from_dict(decoded)
+        self.assertEqual(loaded.standings.entries, expected.standings.entries)
+        self.assertEqual(loaded.pairing_history.entries, expected.pairing_history.entries)
+
+    def test_invalid_data(self):
+        with self.assertRaises(binary_format.BinaryFormatError):
+            binary_format.decode(b"CHS")
+        with self.assertRaises(binary_format.BinaryFormatError):
+            binary_format.decode(b"XXXX" + binary_format.encode([], [])[4:])
+        with self.assertRaises(binary_format.BinaryFormatError):
+            binary_format.decode(binary_format.encode([], [_tournament().to_dict()])[:-1])
+
+
+class BinaryBackendTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = directory.name
+        self.json = storage.JsonBackend(os.path.join(path, "players.json"), os.path.join(path, "tournaments.json"),
+                                        os.path.join(path, ".lock"))
+        self.binary = BinaryBackend(os.path.join(path, "chess.bin"), os.path.join(path, ".lock"))
+
+    @staticmethod
+    def _commit(backend, players=(), tournaments=(), partial=False):
+        """
+        Save the objects as TournamentRepository does: versions are bumped by the save.
+        """
+        with storage.bumped_versions([*players, *tournaments]):
+            if partial:
+                backend.commit(changed_players=players, changed_tournaments=tournaments)
+            else:
+                backend.commit(players=players, tournaments=tournaments)
+
+    def _assert_same_content(self):
+        self.assertEqual(self.binary.load_players(), self.json.load_players())
+        self.assertEqual(self.binary.load_tournaments(), self.json.load_tournaments())
+        for binary, json in zip(self.binary.load_tournaments(), self.json.load_tournaments()):
+            binary, json = Tournament.from_dict(binary), Tournament.from_dict(json)
+            self.assertEqual(binary.standings.entries, json.standings.entries)
+            self.assertEqual(binary.pairing_history.entries, json.pairing_history.entries)
+
+    def test_load_matches_json_backend(self):
+        players = _players()
+        tournaments = [_tournament(), _tournament(finished_rounds=3, round_in_progress=False)]
+        tournaments[1].id = "t2"
+        for backend in (self.json, self.binary):
+            self._commit(backend, copy.deepcopy(players), copy.deepcopy(tournaments))
+        self._assert_same_content()
+
+    def test_partial_saves_match_json_backend(self):
+        for backend in (self.json, self.binary):
+            players, tournament = _players(), _tournament()
+            self._commit(backend, players, [tournament])
+            tournament.rounds[-1].matches[1].set_result(0.5, 0.5)
+            players[1].score += 0.5
+            players[2].score += 0.5
+            self._commit(backend, players[1:3], [tournament], partial=True)
+        self._assert_same_content()
+        self.assertEqual(self.binary.load_tournaments()[0]["rounds"][-1]["matches"][1], [["p1", 0.5], ["p2", 0.5]])
+
+    def test_legacy_documents_load_like_json(self):
+        document = _tournament().to_dict()
+        expected = Tournament.from_dict(document)
+        legacy = _legacy_document(document)
+        players = [p.to_dict() for p in _players()]
+        storage.write_json_documents({self.json.players_file: players, self.json.tournaments_file: [legacy]})
+        self.binary.import_records(players, [legacy])
+        self.assertEqual(self.binary.load_tournaments(), [document])
+        loaded = Tournament.from_dict(self.binary.load_tournaments()[0])
+        self.assertEqual(loaded.to_dict(), Tournament.from_dict(self.json.load_tournaments()[0]).to_dict())
+        self.assertEqual(loaded.standings.entries, expected.standings.entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
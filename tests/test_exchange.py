@@ -0,0 +1,64 @@
+"""
+Tests of the tournament exports (models.exchange).
+
+Run from the project root:
+
+    python -m pytest tests
+"""
+import io
+import re
+import unittest
+
+from models import exchange
+from models.player import Player
+from models.round import Match, Round
+from models.tournament import Tournament
+
+# Points des codes de résultat TRF16 d'une colonne de round.
+TRF_POINTS = {"1": 1.0, "=": 0.5, "0": 0.0, "U": 1.0, "Z": 0.0}
+
+
+def _tournament():
+    """
+    Return a tournament of five players with one finished round and a round in progress
+    where only the first board has a result.
+    """
+    tournament = Tournament("Open", "Paris", "2025-01-01", "2025-01-02", "", id="t1")
+    tournament.players = [f"p{i}" for i in range(5)]
+    tournament.ratings = {pid: 1500.0 for pid in tournament.players}
+    tournament.rounds.append(Round("Round 1", "2025-01-01 10:00:00", "2025-01-01 12:00:00",
+                                   [Match("p0", "p1", 1.0, 0.0), Match("p2", "p3", 0.5, 0.5), Match("p4", None, 1.0)]))
+    tournament.rounds.append(Round("Round 2", "2025-01-02 10:00:00",
+                                   matches=[Match("p1", "p4", 1.0, 0.0), Match("p3", "p0"), Match("p2", None, 1.0)]))
+    tournament.current_round = 2
+    return Tournament.from_dict(tournament.to_dict())
+
+
+class TrfExportTest(unittest.TestCase):
+    def _player_lines(self, tournament):
+        players = {pid: Player(f"Nom{pid}", "Prénom", "1990-01-15", player_id=pid) for pid in tournament.players}
+        out = io.StringIO()
+        exchange.write_tournament_trf(tournament, players, out)
+        return [line for line in out.getvalue().splitlines() if line.startswith("001")]
+
+    def test_points_match_reported_rounds_mid_round(self):
+        tournament = _tournament()
+        # Le résultat saisi du round en cours compte au classement interne, pas dans le rapport.
+        self.assertEqual(tournament.standings.score("p1"), 1.0)
+        lines = self._player_lines(tournament)
+        self.assertEqual(len(lines), 5)
+        places = []
+        for line in lines:
+            points = float(line[80:84])
+            codes = re.findall(r"\S+ [wb-] (\S)", line[89:])
+            self.assertEqual(len(codes), 1)
+            self.assertEqual(points, sum(TRF_POINTS[code] for code in codes))
+            places.append((int(line[85:89]), points))
+        # Les places suivent les points rapportés.
+        by_place = [points for _, points in sorted(places)]
+        self.assertEqual(by_place, sorted(by_place, reverse=True))
+        self.assertEqual(float(lines[1][80:84]), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Change feed of the HTTP service: live standings and pairings pushed to the screens.
+
+For each tournament somebody follows, the feed keeps the last standings and pairings it
+published. When a round is started, a result is entered or a round ends (see
+TournamentController.subscribe), or when another process changed the data, it computes them
+again once and publishes only what changed: the standings rows whose rank, score or tiebreaks
+moved, and the boards whose pairing or result changed (the whole round when a new one starts).
+
+Each event is encoded once and handed to every subscriber through a bounded queue. A subscriber
+that cannot keep up is never waited for: when its queue is full, its pending events are dropped
+and it receives a fresh snapshot instead once it catches up. Long-poll clients read the same
+events from a short per-tournament history.
+"""
+import asyncio
+import json
+from collections import deque
+
+from controllers.tournament_controller import TournamentController
+
+QUEUE_SIZE = 64     # events waiting per subscriber before it is resynchronized
+HISTORY_SIZE = 256  # events kept per tournament for long-poll clients
+RESYNC = object()   # queue marker: send a snapshot instead of the dropped events
+
+
+def standings_diff(old, new):
+    """
+    Return the rows of `new` that differ from `old` and the ids of the players no longer listed.
+    """
+    previous = {row["id"]: row for row in old}
+    current = {row["id"] for row in new}
+    return {
+        "changed": [row for row in new if previous.get(row["id"]) != row],
+        "removed": [pid for pid in previous if pid not in current],
+    }
+
+
+def pairings_diff(old, new):
+    """
+    Return the changes between two round descriptions: the whole round when it is a new one,
+    otherwise the changed boards and round fields.
+    """
+    if new is None:
+        return None
+    if old is None or old["number"] != new["number"]:
+        return {"round": new}
+    boards = {match["board"]: match for match in old["matches"]}
+    diff = {key: new[key] for key in ("round", "start_time", "end_time") if new[key] != old[key]}
+    matches = [match for match in new["matches"] if boards.get(match["board"]) != match]
+    if matches:
+        diff["matches"] = matches
+    return diff or None
+
+
+class Subscriber:
+    """
+    A client following a tournament; events are read from `queue`.
+    """
+    def __init__(self):
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.resync = False
+
+    def offer(self, item):
+        """
+        Queue an event without ever waiting; a full queue is replaced by a resynchronization.
+        """
+        if self.resync:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.resync = True
+            self.queue.put_nowait(RESYNC)
+
+
+class Channel:
+    """
+    Published state, event history and subscribers of one tournament.
+    """
+    def __init__(self, tournament_id, standings, pairings):
+        self.tournament_id = tournament_id
+        self.standings = standings
+        self.pairings = pairings
+        self.seq = 0
+        self.history = deque(maxlen=HISTORY_SIZE)  # (seq, event)
+        self.subscribers = set()
+        self.changed = asyncio.Event()
+
+    def snapshot(self):
+        return {"seq": self.seq, "tournament": self.tournament_id,
+                "standings": self.standings, "pairings": self.pairings}
+
+
+class ChangeFeed:
+    """
+    Publishes the changes of the followed tournaments to SSE subscribers and long-poll clients.
+    """
+    def __init__(self):
+        self.channels = {}
+        self._loop = None
+
+    def start(self):
+        """
+        Start listening to the controller; must be called from the running event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        TournamentController.subscribe(self._on_event)
+
+    def stop(self):
+        TournamentController.unsubscribe(self._on_event)
+
+    def _on_event(self, event, tournament):
+        if tournament.id in self.channels:
+            # Publié après l'opération en cours, depuis la boucle d'événements.
+            self._loop.call_soon_threadsafe(self.refresh, tournament.id, event)
+
+    def channel(self, tournament_id):
+        """
+        Return the channel of a tournament, creating it on first use; None if the tournament does not exist.
+        """
+        channel = self.channels.get(tournament_id)
+        if channel is None:
+            state = self._state(tournament_id)
+            if state is None:
+                return None
+            channel = self.channels[tournament_id] = Channel(tournament_id, *state)
+        return channel
+
+    @staticmethod
+    def _state(tournament_id):
+        tournament = TournamentController.get_tournament(tournament_id)
+        if tournament is None:
+            return None
+        standings = TournamentController.get_standings_table(tournament)
+        return standings, TournamentController.get_round_pairings(tournament)
+
+    def refresh(self, tournament_id, event):
+        """
+        Recompute a followed tournament and publish what changed since the last event.
+        """
+        channel = self.channels.get(tournament_id)
+        state = self._state(tournament_id) if channel else None
+        if state is None:
+            return
+        standings, pairings = state
+        changes = {}
+        standings_changes = standings_diff(channel.standings, standings)
+        if standings_changes["changed"] or standings_changes["removed"]:
+            changes["standings"] = standings_changes
+        pairings_changes = pairings_diff(channel.pairings, pairings)
+        if pairings_changes:
+            changes["pairings"] = pairings_changes
+        channel.standings, channel.pairings = standings, pairings
+        if not changes:
+            return
+
+        channel.seq += 1
+        payload = {"seq": channel.seq, "tournament": tournament_id, "event": event, **changes}
+        channel.history.append((channel.seq, payload))
+        encoded = sse_message("change", channel.seq, payload)
+        for subscriber in channel.subscribers:
+            subscriber.offer(encoded)
+        channel.changed.set()
+        channel.changed = asyncio.Event()
+
+    def refresh_all(self, event="external"):
+        for tournament_id in list(self.channels):
+            self.refresh(tournament_id, event)
+
+    async def changes_since(self, channel, since, timeout):
+        """
+        Long poll: return the events published after `since`, waiting up to `timeout` seconds
+        for the next one; a snapshot is returned when `since` is older than the history.
+        """
+        if since == channel.seq:
+            try:
+                await asyncio.wait_for(channel.changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return {"seq": channel.seq, "events": []}
+        if not channel.seq - len(channel.history) <= since <= channel.seq:
+            return {"seq": channel.seq, "snapshot": channel.snapshot()}
+        return {"seq": channel.seq, "events": [event for seq, event in channel.history if seq > since]}
+
+
+def sse_message(event, seq, data):
+    """
+    Encode a Server-Sent Events message.
+    """
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
@@ -0,0 +1,386 @@
+"""
+Non-interactive command line interface.
+
+    python main.py players import joueurs.csv
+    python main.py players rerate
+    python main.py players history <player id>
+    python main.py players h2h <player id> <player id>
+    python main.py tournament create --name "Open de Paris" --location Paris --start 2025-05-01 --end 2025-05-02
+    python main.py tournament register "Open de Paris" <player id> <player id> ...
+    python main.py round start "Open de Paris"
+    python main.py round start-all "Open A" "Open B" "Jeunes"
+    python main.py round results "Open de Paris" --file resultats.txt
+    python main.py tournament replay "Open de Paris"
+    python main.py standings "Open de Paris" --format json
+    python main.py batch evenement.txt
+    python main.py serve --port 8000      (see views.http_server)
+
+Tournaments are designated by id or by name. A batch script holds one command per line, in the
+same syntax without "python main.py" (blank lines and lines starting with # are ignored); all its
+commands run against one loaded state and everything they change is saved in a single write at
+the end, or not at all if one of them fails.
+
+The controllers and models a command needs are imported by its handler, so that a scripted call
+only loads what it uses.
+"""
+import argparse
+import json
+import shlex
+import sys
+
+from models.storage import ConcurrentModificationError
+
+
+class CommandError(Exception):
+    """
+    A command could not be carried out; the message is shown to the user.
+    """
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Gestion de tournois d'échecs en ligne de commande.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    players = commands.add_parser("players", help="Joueurs.").add_subparsers(dest="action", required=True)
+    players_import = players.add_parser("import", help="Importer des joueurs (CSV ou TRF).")
+    players_import.add_argument("path")
+    players_import.add_argument("--format", choices=["csv", "trf"])
+    players_list = players.add_parser("list", help="Lister ou rechercher des joueurs.")
+    players_list.add_argument("--search", default="", help="Début du nom (accents et casse ignorés).")
+    players_list.add_argument("--format", choices=["text", "json"], default="text")
+    players.add_parser("rerate", help="Recalculer tous les classements Elo sur l'historique des tournois.")
+    history = players.add_parser("history", help="Carrière d'un joueur sur tous les tournois.")
+    history.add_argument("player_id")
+    history.add_argument("--format", choices=["text", "json"], default="text")
+    h2h = players.add_parser("h2h", help="Face-à-face de deux joueurs sur tous les tournois.")
+    h2h.add_argument("player_id")
+    h2h.add_argument("opponent_id")
+    h2h.add_argument("--format", choices=["text", "json"], default="text")
+
+    tournament = commands.add_parser("tournament", help="Tournois.").add_subparsers(dest="action", required=True)
+    create = tournament.add_parser("create", help="Créer un tournoi.")
+    create.add_argument("--name", required=True)
+    create.add_argument("--location", required=True)
+    create.add_argument("--start", required=True, help="Date de début (YYYY-MM-DD).")
+    create.add_argument("--end", required=True, help="Date de fin (YYYY-MM-DD).")
+    create.add_argument("--description", default="")
+    create.add_argument("--rounds", type=int, default=4)
+    create.add_argument("--seed", help="Graine des appariements (par défaut, tirée au hasard).")
+    register = tournament.add_parser("register", help="Inscrire des joueurs (identifiants).")
+    register.add_argument("tournament")
+    register.add_argument("player_ids", nargs="+")
+    close = tournament.add_parser("close", help="Clôturer un tournoi.")
+    close.add_argument("tournament")
+    replay = tournament.add_parser("replay", help="Recalculer les appariements de chaque round et les comparer "
+                                                  "aux rounds enregistrés.")
+    replay.add_argument("tournament")
+
+    rounds = commands.add_parser("round", help="Rounds.").add_subparsers(dest="action", required=True)
+    start = rounds.add_parser("start", help="Démarrer le round suivant et afficher les appariements.")
+    start.add_argument("tournament")
+    start.add_argument("--format", choices=["text", "json"], default="text")
+    start_all = rounds.add_parser("start-all", help="Démarrer en une fois le round suivant de plusieurs sections "
+                                                    "(appariements calculés en parallèle).")
+    start_all.add_argument("tournaments", nargs="*", help="Tournois ; par défaut, tous ceux qui ne sont pas clôturés.")
+    start_all.add_argument("--workers", type=int, help="Nombre de processus (par défaut, un par cœur).")
+    results = rounds.add_parser("results", help="Saisir les résultats du round en cours.")
+    results.add_argument("tournament")
+    results.add_argument("--file", required=True, help="Une ligne « <échiquier> <résultat> » par match "
+                                                       "(1-0, 0-1 ou 1/2-1/2) ; - pour l'entrée standard.")
+
+    standings = commands.add_parser("standings", help="Afficher le classement d'un tournoi.")
+    standings.add_argument("tournament")
+    standings.add_argument("--format", choices=["text", "json"], default="text")
+
+    serve = commands.add_parser("serve", help="Démarrer le service HTTP local (appariements, classements).")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+
+    batch = commands.add_parser("batch", help="Exécuter un script de commandes avec une seule sauvegarde finale.")
+    batch.add_argument("script", help="Fichier de commandes ; - pour l'entrée standard.")
+    return parser
+
+
+def main(argv=None):
+    """
+    Run one command line; returns the process exit status.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "batch":
+            run_batch(parser, _read_lines(args.script))
+        else:
+            run_command(args)
+    except (CommandError, ValueError, ConcurrentModificationError) as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_batch(parser, lines):
+    """
+    Run the commands of a batch script with deferred saves (see models.deferred_backend).
+    """
+    from models.deferred_backend import deferred_saves
+
+    with deferred_saves():
+        for number, line in enumerate(lines, start=1):
+            words = shlex.split(line, comments=True)
+            if not words:
+                continue
+            try:
+                args = parser.parse_args(words)
+                if args.command in ("batch", "serve"):
+                    raise CommandError(f"la commande {args.command} n'est pas disponible dans un script")
+                run_command(args)
+            except SystemExit:
+                raise CommandError(f"Ligne {number} : commande invalide, aucune modification enregistrée.")
+            except (CommandError, ValueError) as error:
+                raise CommandError(f"Ligne {number} : {error} ; aucune modification enregistrée.")
+
+
+def run_command(args):
+    handler = COMMANDS[(args.command, getattr(args, "action", None))]
+    handler(args)
+
+
+def _players_import(args):
+    from models import exchange
+
+    report = exchange.import_players_file(args.path, args.format)
+    for number, message in report.errors:
+        print(f"❌ Ligne {number} : {message}")
+    print(f"✅ {report.summary()}")
+
+
+def _players_list(args):
+    from controllers.player_controller import PlayerController
+
+    players = PlayerController.search_players(args.search)
+    if args.format == "json":
+        print(json.dumps([p.to_dict() for p in players], ensure_ascii=False, indent=2))
+        return
+    for p in players:
+        print(f"{p.id}\t{p.last_name} {p.first_name}\t{p.birth_date}\t{p.rating:.0f}")
+
+
+def _players_rerate(args):
+    from controllers.player_controller import PlayerController
+
+    games, changed = PlayerController.rerate_players()
+    print(f"✅ {games} partie(s) recalculée(s), classement modifié pour {changed} joueur(s).")
+
+
+def _players_history(args):
+    from controllers.player_controller import PlayerController
+    from views.player_view import format_career
+
+    player = _find_player(args.player_id)
+    career = PlayerController.get_career(player.id)
+    if career is None:
+        raise CommandError(f"{_name(player.id)} n'a participé à aucun tournoi.")
+    if args.format == "json":
+        print(json.dumps(career, ensure_ascii=False, indent=2))
+        return
+    print(f"{_name(player.id)} : {format_career(career)}")
+    for t in career["tournaments"]:
+        performance = "-" if t["performance"] is None else t["performance"]
+        print(f"{t['start_date']}\t{t['name']}\t{t['games']}\t{t['points']:g}\t{performance}")
+
+
+def _players_h2h(args):
+    from controllers.player_controller import PlayerController
+    from views.player_view import format_head_to_head
+
+    player, opponent = _find_player(args.player_id), _find_player(args.opponent_id)
+    record = PlayerController.get_head_to_head(player.id, opponent.id)
+    if args.format == "json":
+        print(json.dumps(record, ensure_ascii=False, indent=2))
+        return
+    print(f"{_pair_names((player.id, opponent.id))} : {format_head_to_head(record)}")
+
+
+def _tournament_create(args):
+    from controllers.tournament_controller import TournamentController
+    from models.validators import validate_date, validate_text_field
+
+    if not validate_text_field(args.name) or not validate_text_field(args.location):
+        raise CommandError("Nom ou lieu du tournoi invalide.")
+    start_date, end_date = validate_date(args.start), validate_date(args.end)
+    if start_date is None or end_date is None or end_date < start_date:
+        raise CommandError("Dates invalides : format YYYY-MM-DD, la fin ne peut précéder le début.")
+    if args.rounds < 1:
+        raise CommandError("Le nombre de rounds doit être positif.")
+    tournament = TournamentController.create_tournament(args.name, args.location, args.start, args.end,
+                                                        args.description, number_of_rounds=args.rounds,
+                                                        pairing_seed=args.seed)
+    print(f"✅ Tournoi « {tournament.name} » créé : {tournament.id}")
+
+
+def _tournament_register(args):
+    from controllers.tournament_controller import TournamentController
+
+    tournament = _find_tournament(args.tournament)
+    unknown = [pid for pid in args.player_ids if TournamentController.get_player(pid) is None]
+    if unknown:
+        raise CommandError(f"Joueur(s) inconnu(s) : {', '.join(unknown)}")
+    added = TournamentController.register_players_to_tournament(tournament, args.player_ids)
+    print(f"✅ {added} joueur(s) inscrit(s) dans le tournoi « {tournament.name} ».")
+
+
+def _tournament_close(args):
+    from controllers.tournament_controller import TournamentController
+
+    tournament = _find_tournament(args.tournament)
+    if not TournamentController.close_tournament(tournament):
+        raise CommandError("Tous les rounds ne sont pas terminés.")
+    print(f"✅ Tournoi « {tournament.name} » clôturé.")
+
+
+def _tournament_replay(args):
+    from models.replay import DIFFERENT, IDENTICAL, replay_tournament
+
+    tournament = _find_tournament(args.tournament)
+    outcomes = replay_tournament(tournament)
+    for outcome in outcomes:
+        print(("✅ " if outcome.status == IDENTICAL else "⚠️ ") + outcome.summary())
+        for board, stored, replayed in outcome.differences:
+            print(f"   échiquier {board} : enregistré {_pair_names(stored)}, rejeu {_pair_names(replayed)}")
+    if any(outcome.status == DIFFERENT for outcome in outcomes):
+        raise CommandError("Des rounds ne correspondent pas au rejeu de leurs appariements.")
+
+
+def _round_start(args):
+    from controllers.tournament_controller import TournamentController
+
+    tournament = _find_tournament(args.tournament)
+    new_round, message = TournamentController.start_new_round(tournament)
+    if message:
+        raise CommandError(message)
+    if args.format == "json":
+        print(json.dumps({"tournament": tournament.id, "round": new_round.name,
+                          "matches": [[m.player1_id, m.player2_id] for m in new_round.matches]}, indent=2))
+        return
+    print(f"✅ {new_round.name} démarré.")
+    for board, match in enumerate(new_round.matches, start=1):
+        print(f"{board}\t{_name(match.player1_id)}\t{_name(match.player2_id)}")
+
+
+def _round_start_all(args):
+    from controllers.tournament_controller import TournamentController
+
+    if args.tournaments:
+        tournaments = [_find_tournament(reference) for reference in args.tournaments]
+    else:
+        tournaments = [t for t in TournamentController.get_all_tournaments() if not t.is_closed]
+    if not tournaments:
+        raise CommandError("Aucun tournoi en cours.")
+    outcomes = TournamentController.start_new_rounds(tournaments, workers=args.workers)
+    for tournament, (new_round, message) in zip(tournaments, outcomes):
+        if message:
+            print(f"⚠️ {tournament.name} : {message}")
+        else:
+            print(f"✅ {tournament.name} : {new_round.name} démarré ({len(new_round.matches)} échiquiers).")
+    if all(message for _, message in outcomes):
+        raise CommandError("Aucun round n'a pu être démarré.")
+
+
+def _round_results(args):
+    from controllers.tournament_controller import TournamentController
+    from models.round import RESULT_CODES
+
+    tournament = _find_tournament(args.tournament)
+    given = {}
+    for number, line in enumerate(_read_lines(args.file), start=1):
+        words = line.split("#", 1)[0].split()
+        if not words:
+            continue
+        if len(words) != 2 or not words[0].isdigit() or words[1] not in RESULT_CODES:
+            raise CommandError(f"Résultat illisible ligne {number} : {line.strip()}")
+        given[int(words[0])] = RESULT_CODES[words[1]]
+    current_round = TournamentController.enter_board_results(tournament, given)
+    print(f"✅ Résultats enregistrés pour {current_round.name}.")
+
+
+def _standings(args):
+    from controllers.tournament_controller import TournamentController
+    from models.tiebreaks import TIEBREAKS
+
+    tournament = _find_tournament(args.tournament)
+    if args.format == "json":
+        print(json.dumps(TournamentController.get_standings_table(tournament), ensure_ascii=False, indent=2))
+        return
+    rows = TournamentController.get_tournament_standings(tournament)
+    print("\t".join(["#", "Joueur", "Score"] + [TIEBREAKS[name] for name in tournament.tiebreaks]))
+    for rank, (player, score, values) in enumerate(rows, start=1):
+        print("\t".join([str(rank), f"{player.first_name} {player.last_name}", f"{score:g}"]
+                        + [f"{value:g}" for value in values]))
+
+
+def _serve(args):
+    from views.http_server import serve
+
+    serve(args.host, args.port)
+
+
+COMMANDS = {
+    ("players", "import"): _players_import,
+    ("players", "list"): _players_list,
+    ("players", "rerate"): _players_rerate,
+    ("players", "history"): _players_history,
+    ("players", "h2h"): _players_h2h,
+    ("tournament", "create"): _tournament_create,
+    ("tournament", "register"): _tournament_register,
+    ("tournament", "close"): _tournament_close,
+    ("tournament", "replay"): _tournament_replay,
+    ("round", "start"): _round_start,
+    ("round", "start-all"): _round_start_all,
+    ("round", "results"): _round_results,
+    ("standings", None): _standings,
+    ("serve", None): _serve,
+}
+
+
+def _find_tournament(reference):
+    """
+    Return the tournament with the given id or, failing that, the only one with the given name.
+    """
+    from controllers.tournament_controller import TournamentController
+
+    tournament = TournamentController.get_tournament(reference)
+    if tournament is not None:
+        return tournament
+    matches = [t for t in TournamentController.get_tournament_catalog() if t["name"].lower() == reference.lower()]
+    if not matches:
+        raise CommandError(f"Tournoi introuvable : {reference}")
+    if len(matches) > 1:
+        raise CommandError(f"Plusieurs tournois s'appellent « {reference} » : utilisez leur identifiant.")
+    return TournamentController.get_tournament(matches[0]["id"])
+
+
+def _find_player(player_id):
+    from controllers.tournament_controller import TournamentController
+
+    player = TournamentController.get_player(player_id)
+    if player is None:
+        raise CommandError(f"Joueur inconnu : {player_id}")
+    return player
+
+
+def _name(player_id):
+    from controllers.tournament_controller import TournamentController
+
+    player = TournamentController.get_player(player_id) if player_id else None
+    return f"{player.first_name} {player.last_name}" if player else "Libre"
+
+
+def _pair_names(pair):
+    return f"{_name(pair[0])} - {_name(pair[1])}"
+
+
+def _read_lines(path):
+    if path == "-":
+        return sys.stdin.read().splitlines()
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
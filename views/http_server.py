@@ -0,0 +1,421 @@
+"""
+Local HTTP/JSON service for the screens of the playing hall (pairing boards, live standings).
+
+    python main.py serve --port 8000
+
+Endpoints:
+
+    GET  /tournaments                      tournament catalog
+    GET  /tournaments/<id>                 tournament details
+    GET  /tournaments/<id>/pairings        latest round: pairings and results entered so far
+    GET  /tournaments/<id>/standings       standings with tiebreaks
+    POST /tournaments/<id>/rounds          start the next round
+    POST /tournaments/<id>/results         results of the round in progress: {"results": {"1": "1-0", ...}}
+    POST /tournaments/<id>/boards/<n>      result of one board of the round in progress: {"result": "1-0"}
+    POST /tournaments/<id>/round-end       close the round in progress
+    GET  /tournaments/<id>/events          Server-Sent Events stream of standings and pairing changes
+    GET  /tournaments/<id>/changes?since=N long poll of the same changes (see views.change_feed)
+
+The service runs in one process holding one in-memory copy of the repositories. Each GET
+response is rendered once per state change and then served from memory with an ETag (a client
+sending it back in If-None-Match gets an empty 304). Writes are queued to a single writer task
+that applies them one at a time and then drops the rendered responses. Changes made by another
+process (the menu on the arbiter's computer) are noticed by a watcher that checks the storage
+signatures every few seconds, so the disk is read at most once per change, however many
+clients poll.
+"""
+import asyncio
+import hashlib
+import json
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from controllers.tournament_controller import TournamentController
+from models import storage
+from models.round import RESULT_CODES
+from views.change_feed import RESYNC, ChangeFeed, Subscriber, sse_message
+
+REFRESH_INTERVAL = 2.0   # seconds between two checks for changes made by other processes
+HEARTBEAT_INTERVAL = 15.0  # seconds of silence before an SSE comment keeps the connection open
+LONG_POLL_TIMEOUT = 30.0   # longest wait of a long-poll request
+MAX_HEADERS = 100
+MAX_BODY_SIZE = 1 << 20
+
+
+class HttpError(Exception):
+    """
+    Error answered to the client with the given HTTP status and a JSON {"error": message} body.
+    """
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiServer:
+    """
+    asyncio HTTP server exposing the tournaments, see the module docstring.
+    """
+    def __init__(self, host="127.0.0.1", port=8000, refresh_interval=REFRESH_INTERVAL):
+        self.host = host
+        self.port = port
+        self.refresh_interval = refresh_interval
+        self.server = None
+        self._responses = {}  # path -> (etag, body) of the rendered GET responses
+        self._signatures = None
+        self._writes = None
+        self._tasks = []
+        self._connections = set()
+        self.feed = ChangeFeed()
+
+    async def start(self):
+        """
+        Start the writer and watcher tasks and listen for connections.
+        """
+        self._writes = asyncio.Queue()
+        self._signatures = self._storage_signatures()
+        self.feed.start()
+        self._tasks = [asyncio.create_task(self._writer()), asyncio.create_task(self._watch())]
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.feed.stop()
+        self.server.close()
+        await self.server.wait_closed()
+        for task in self._tasks + list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._connections, return_exceptions=True)
+
+    # --- État partagé -------------------------------------------------------------------------
+
+    async def _writer(self):
+        """
+        Apply queued write operations one at a time.
+        """
+        while True:
+            operation, future = await self._writes.get()
+            try:
+                result = operation()
+            except Exception as error:
+                if not future.cancelled():
+                    future.set_exception(error)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                self._responses.clear()
+                self._signatures = self._storage_signatures()
+
+    async def _watch(self):
+        """
+        Drop the rendered responses when another process changed the stored data.
+        """
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            signatures = self._storage_signatures()
+            if signatures != self._signatures:
+                self._signatures = signatures
+                self._responses.clear()
+                self.feed.refresh_all()
+
+    async def _submit(self, operation):
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((operation, future))
+        return await future
+
+    @staticmethod
+    def _storage_signatures():
+        backend = storage.get_backend()
+        return backend.signature("players"), backend.signature("tournaments")
+
+    def _rendered(self, path, headers, build):
+        """
+        Answer a GET from the rendered responses, rendering it only if the state changed since.
+        """
+        response = self._responses.get(path)
+        if response is None:
+            body = self._json(build())
+            response = (f'"{hashlib.sha1(body).hexdigest()[:20]}"', body)
+            self._responses[path] = response
+        etag, body = response
+        if etag in headers.get("if-none-match", ""):
+            return HTTPStatus.NOT_MODIFIED, {"ETag": etag}, b""
+        return HTTPStatus.OK, {"ETag": etag}, body
+
+    # --- Routes -------------------------------------------------------------------------------
+
+    async def _dispatch(self, method, path, query, headers, body):
+        """
+        Return the (status, headers, body) answer of a request.
+        """
+        parts = [part for part in path.split("/") if part]
+        if not parts or parts[0] != "tournaments" or len(parts) > 4:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Ressource inconnue.")
+        tournament_id = parts[1] if len(parts) > 1 else None
+        resource = tuple(parts[2:])
+
+        if method == "GET":
+            if tournament_id is None:
+                return self._rendered(path, headers, TournamentController.get_tournament_catalog)
+            if resource == ("changes",):
+                return HTTPStatus.OK, {}, self._json(await self._long_poll(tournament_id, query))
+            builders = {
+                (): lambda: self._details(tournament_id),
+                ("pairings",): lambda: self._pairings(tournament_id),
+                ("standings",): lambda: TournamentController.get_standings_table(self._tournament(tournament_id)),
+            }
+            if resource not in builders:
+                raise HttpError(HTTPStatus.NOT_FOUND, "Ressource inconnue.")
+            return self._rendered(path, headers, builders[resource])
+
+        if method != "POST" or tournament_id is None:
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "Méthode non autorisée pour cette ressource.")
+        if resource == ("rounds",):
+            pairings = await self._submit(lambda: self._start_round(tournament_id))
+            return HTTPStatus.CREATED, {}, self._json(pairings)
+        if resource == ("results",):
+            results = self._parse_results(body)
+            pairings = await self._submit(lambda: self._enter_results(tournament_id, results))
+            return HTTPStatus.OK, {}, self._json(pairings)
+        if len(resource) == 2 and resource[0] == "boards" and resource[1].isdigit():
+            scores = self._parse_result(body)
+            pairings = await self._submit(lambda: self._set_board_result(tournament_id, int(resource[1]), scores))
+            return HTTPStatus.OK, {}, self._json(pairings)
+        if resource == ("round-end",):
+            pairings = await self._submit(lambda: self._end_round(tournament_id))
+            return HTTPStatus.OK, {}, self._json(pairings)
+        raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "Méthode non autorisée pour cette ressource.")
+
+    async def _long_poll(self, tournament_id, query):
+        channel = self.feed.channel(tournament_id)
+        if channel is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Tournoi introuvable : {tournament_id}")
+        try:
+            since = int(query.get("since", [channel.seq])[0])
+            timeout = min(float(query.get("timeout", [LONG_POLL_TIMEOUT])[0]), LONG_POLL_TIMEOUT)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Paramètres since / timeout invalides.")
+        return await self.feed.changes_since(channel, since, timeout)
+
+    @staticmethod
+    def _tournament(tournament_id):
+        tournament = TournamentController.get_tournament(tournament_id)
+        if tournament is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Tournoi introuvable : {tournament_id}")
+        return tournament
+
+    @staticmethod
+    def _details(tournament_id):
+        tournament = ApiServer._tournament(tournament_id)
+        details = storage.catalog_entry(tournament.to_dict())
+        details["tiebreaks"] = tournament.tiebreaks
+        return details
+
+    @staticmethod
+    def _pairings(tournament_id):
+        pairings = TournamentController.get_round_pairings(ApiServer._tournament(tournament_id))
+        if pairings is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Aucun round n'a encore été joué.")
+        return pairings
+
+    @staticmethod
+    def _start_round(tournament_id):
+        tournament = ApiServer._tournament(tournament_id)
+        _, message = TournamentController.start_new_round(tournament)
+        if message:
+            raise HttpError(HTTPStatus.CONFLICT, message)
+        return TournamentController.get_round_pairings(tournament)
+
+    @staticmethod
+    def _enter_results(tournament_id, results):
+        tournament = ApiServer._tournament(tournament_id)
+        TournamentController.enter_board_results(tournament, results)
+        return TournamentController.get_round_pairings(tournament)
+
+    @staticmethod
+    def _current_round(tournament):
+        current_round = TournamentController.get_current_round(tournament)
+        if current_round is None:
+            raise HttpError(HTTPStatus.CONFLICT, "Aucun round en cours.")
+        return current_round
+
+    @staticmethod
+    def _set_board_result(tournament_id, board, scores):
+        tournament = ApiServer._tournament(tournament_id)
+        matches = ApiServer._current_round(tournament).matches
+        if not 1 <= board <= len(matches) or matches[board - 1].is_bye:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Échiquier inconnu : {board}")
+        TournamentController.set_match_result(matches[board - 1], *scores, tournament=tournament)
+        return TournamentController.get_round_pairings(tournament)
+
+    @staticmethod
+    def _end_round(tournament_id):
+        tournament = ApiServer._tournament(tournament_id)
+        ApiServer._current_round(tournament)
+        TournamentController.finalize_round(tournament)
+        return TournamentController.get_round_pairings(tournament)
+
+    @staticmethod
+    def _parse_result(body):
+        """
+        Read {"result": "<1-0|0-1|1/2-1/2>"} into (score1, score2).
+        """
+        try:
+            return RESULT_CODES[json.loads(body or b"{}")["result"]]
+        except (ValueError, KeyError, TypeError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Corps attendu : {"result": "1-0" | "0-1" | "1/2-1/2"}.')
+
+    @staticmethod
+    def _parse_results(body):
+        """
+        Read {"results": {"<board>": "<1-0|0-1|1/2-1/2>", ...}} into {board: (score1, score2)}.
+        """
+        try:
+            results = json.loads(body or b"{}")["results"]
+            return {int(board): RESULT_CODES[code] for board, code in results.items()}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise HttpError(HTTPStatus.BAD_REQUEST,
+                            'Corps attendu : {"results": {"<échiquier>": "1-0" | "0-1" | "1/2-1/2"}}.')
+
+    # --- HTTP ---------------------------------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as error:
+                    self._write_response(writer, error.status, self._error_body(error), close=True)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                url = urlsplit(target)
+                if method == "GET" and url.path.rstrip("/").endswith("/events"):
+                    await self._stream_events(url.path.strip("/").split("/"), writer)
+                    break
+                status, extra_headers, payload = await self._answer(
+                    method, url.path, parse_qs(url.query), headers, body)
+                self._write_response(writer, status, payload, extra_headers, close=not keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            pass  # arrêt du service : les connexions ouvertes (flux SSE compris) sont fermées
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _stream_events(self, parts, writer):
+        """
+        Server-Sent Events stream of a tournament: a snapshot, then one event per change.
+        """
+        channel = self.feed.channel(parts[1]) if len(parts) == 3 and parts[0] == "tournaments" else None
+        if channel is None:
+            error = HttpError(HTTPStatus.NOT_FOUND, "Tournoi introuvable.")
+            self._write_response(writer, error.status, self._error_body(error), close=True)
+            return
+        subscriber = Subscriber()
+        channel.subscribers.add(subscriber)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n"
+                         b"Cache-Control: no-cache\r\nAccess-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n")
+            writer.write(sse_message("snapshot", channel.seq, channel.snapshot()))
+            await writer.drain()
+            while True:
+                try:
+                    item = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    item = b": ping\n\n"
+                if item is RESYNC:
+                    subscriber.resync = False
+                    item = sse_message("snapshot", channel.seq, channel.snapshot())
+                writer.write(item)
+                await writer.drain()
+        finally:
+            channel.subscribers.discard(subscriber)
+
+    async def _answer(self, method, path, query, headers, body):
+        try:
+            return await self._dispatch(method, path, query, headers, body)
+        except HttpError as error:
+            return error.status, {}, self._error_body(error)
+        except storage.ConcurrentModificationError as error:
+            return HTTPStatus.CONFLICT, {}, self._error_body(error)
+        except ValueError as error:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {}, self._error_body(error)
+
+    @staticmethod
+    async def _read_request(reader):
+        """
+        Read one request; returns None when the client closed the connection.
+        """
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Requête invalide.")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Trop d'en-têtes.")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Content-Length invalide.")
+        if length > MAX_BODY_SIZE:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corps de requête trop volumineux.")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+        return method.upper(), target, headers, body, keep_alive
+
+    @staticmethod
+    def _json(data):
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def _error_body(error):
+        return ApiServer._json({"error": str(error)})
+
+    @staticmethod
+    def _write_response(writer, status, body, headers=None, close=False):
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Cache-Control: no-cache",
+            "Access-Control-Allow-Origin: *",
+            f"Connection: {'close' if close else 'keep-alive'}",
+        ]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+
+def serve(host="127.0.0.1", port=8000):
+    """
+    Run the service until interrupted (Ctrl+C).
+    """
+    server = ApiServer(host, port)
+    print(f"✅ Service HTTP démarré sur http://{host}:{port}/tournaments (Ctrl+C pour arrêter)")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nArrêt du service.")
@@ -0,0 +1,29 @@
+from models import instrumentation
+
+TOP_OPERATIONS = 25  # Operations listed in the summary
+
+
+def show_metrics_view():
+    """
+    Displays the time, calls, bytes and deserialized objects of each instrumented operation of
+    the session (see models.instrumentation), slowest first.
+    """
+    if not instrumentation.is_enabled():
+        print("\nLes mesures ne sont pas activées : relancez avec « python main.py --profile ».\n")
+        return
+    print("\n=== Mesures de la session ===")
+    print(format_report(instrumentation.report()))
+    print()
+
+
+def format_report(operations):
+    """
+    Return the summary table of instrumented operations (see models.instrumentation.report).
+    """
+    if not operations:
+        return "Aucune opération mesurée."
+    lines = [f"{'opération':<45} {'appels':>7} {'temps (ms)':>11} {'lu (ko)':>9} {'écrit (ko)':>10} {'objets':>8}"]
+    for op in operations[:TOP_OPERATIONS]:
+        lines.append(f"{op['operation']:<45} {op['calls']:>7} {op['time'] * 1000:>11.1f} "
+                     f"{op['bytes_read'] / 1024:>9.1f} {op['bytes_written'] / 1024:>10.1f} {op['objects']:>8}")
+    return "\n".join(lines)
@@ -1,25 +1,8 @@
 from models.player import PlayerRepository
 from controllers.player_controller import PlayerController
-import re
-from datetime import datetime
+from models.validators import validate_birth_date, validate_name
 
-
-def validate_name(name):
-    """
-    Validates that a name contains only letters, hyphens, or spaces and is at least two characters long.
-    """
-    return bool(re.fullmatch(r"[A-Za-zÀ-ÿ\- ]{2,}", name))
-
-
-def validate_birth_date(date_str):
-    """
-    Validates that the date is in the format YYYY-MM-DD and is not a future date.
-    """
-    try:
-        birth_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        return birth_date <= datetime.today().date()
-    except ValueError:
-        return False
+PAGE_SIZE = 50  # Players listed before asking to continue
 
 
 def create_player_view():
@@ -54,17 +37,88 @@ def list_players_view():
     """
     Displays a sorted list of all registered players.
     Players are sorted by last name and then first name.
-    Includes their birth date and current score.
+    Includes their birth date, current score and Elo rating.
+
+    Players are read into a column store, so listing a large rating list builds no Player objects,
+    and are shown one page at a time.
     """
-    players = PlayerRepository.load_players()
+    players = PlayerRepository.load_player_columns()
 
-    if not players:
+    if not len(players):
         print("\nAucun joueur enregistré.\n")
         return
 
     print("\n=== Liste des joueurs enregistrés ===")
-    players.sort(key=lambda p: (p.last_name.lower(), p.first_name.lower()))
+    for idx, i in enumerate(players.sorted_by_name(), start=1):
+        print(f"{idx}. {players.first_names[i]} {players.last_names[i]} - Né(e) le {players.birth_date(i)} "
+              f"- Score: {players.scores[i]:g} - Elo: {players.ratings[i]:.0f}")
+        if idx % PAGE_SIZE == 0 and idx < len(players):
+            if input(f"-- {idx}/{len(players)} -- Entrée : suite, q : arrêter ").strip().lower() == "q":
+                break
+    print()
 
+
+def _choose_player(prompt):
+    """
+    Ask for the beginning of a name and return the chosen player, or None.
+    """
+    query = input(prompt).strip()
+    players = PlayerController.search_players(query, limit=PAGE_SIZE)
+    if not players:
+        print("❌ Aucun joueur trouvé.")
+        return None
     for idx, player in enumerate(players, start=1):
-        print(f"{idx}. {player.first_name} {player.last_name} - Né(e) le {player.birth_date} - Score: {player.score}")
-    print()
+        print(f"{idx}. {player.first_name} {player.last_name} ({player.birth_date}) - Elo: {player.rating:.0f}")
+    choice = input("Numéro du joueur : ").strip()
+    if not choice.isdigit() or not 1 <= int(choice) <= len(players):
+        print("❌ Choix invalide.")
+        return None
+    return players[int(choice) - 1]
+
+
+def player_history_view():
+    """
+    Displays the career of a player over all tournaments (results, performance rating per
+    tournament) and, on request, their record against another player.
+    """
+    player = _choose_player("\nRechercher un joueur par nom : ")
+    if player is None:
+        return
+    career = PlayerController.get_career(player.id)
+    if career is None:
+        print(f"\n{player.first_name} {player.last_name} n'a participé à aucun tournoi.\n")
+        return
+
+    print(f"\n=== {player.first_name} {player.last_name} ===")
+    print(format_career(career))
+    for t in career["tournaments"]:
+        performance = "-" if t["performance"] is None else t["performance"]
+        print(f"  {t['start_date']}  {t['name']} : {t['points']:g} pt en {t['games']} partie(s), "
+              f"performance {performance}")
+
+    if input("\nVoir le face-à-face avec un autre joueur ? (o/n) : ").strip().lower() != "o":
+        return
+    opponent = _choose_player("Rechercher l'adversaire par nom : ")
+    if opponent is not None:
+        record = PlayerController.get_head_to_head(player.id, opponent.id)
+        print(f"\n{player.first_name} {player.last_name} - {opponent.first_name} {opponent.last_name} : "
+              f"{format_head_to_head(record)}\n")
+
+
+def format_career(career):
+    """
+    Return the one-line summary of a career (see PlayerController.get_career).
+    """
+    performance = "-" if career["performance"] is None else career["performance"]
+    return (f"{career['games']} partie(s) : +{career['wins']} ={career['draws']} -{career['losses']}, "
+            f"{career['byes']} exemption(s), {career['points']:g} pt, {career['opponents']} adversaire(s), "
+            f"performance {performance}")
+
+
+def format_head_to_head(record):
+    """
+    Return the summary of a head-to-head record (see PlayerController.get_head_to_head).
+    """
+    if not record["games"]:
+        return "jamais rencontrés."
+    return f"{record['games']} partie(s) : +{record['wins']} ={record['draws']} -{record['losses']}"
@@ -1,24 +1,11 @@
 from controllers.tournament_controller import TournamentController
 from models.player import PlayerRepository
-import re
+from models.round import RESULT_CODES
+from models.tiebreaks import TIEBREAKS
+from models.validators import validate_date, validate_text_field
 from datetime import datetime
 
-
-def validate_text_field(text):
-    """
-    Validates a general text field (name, location, etc.).
-    """
-    return bool(re.fullmatch(r"[A-Za-z0-9À-ÿ ,.'\-]{2,}", text))
-
-
-def validate_date(date_str):
-    """
-    Validates and parses a date string in the format YYYY-MM-DD.
-    """
-    try:
-        return datetime.strptime(date_str, "%Y-%m-%d").date()
-    except ValueError:
-        return None
+PAGE_SIZE = 20  # Players listed per page on the registration screen
 
 
 def create_tournament_view():
@@ -74,58 +61,74 @@ def list_tournaments_view():
     Displays a list of all saved tournaments with basic details like name, location,
     dates, round progress, and number of registered players.
     """
-    tournaments = TournamentController.get_all_tournaments()
+    catalog = TournamentController.get_tournament_catalog()
 
-    if not tournaments:
+    if not catalog:
         print("\nAucun tournoi enregistré.\n")
         return
 
     print("\n=== Liste des tournois ===")
-    for idx, t in enumerate(tournaments, start=1):
-        print(f"{idx}. {t.name} ({t.location}) - {t.start_date} → {t.end_date}")
-        print(f"   Description : {t.description}")
-        print(f"   Rounds : {t.current_round}/{t.number_of_rounds} | Joueurs inscrits : {len(t.players)}\n")
+    for idx, t in enumerate(catalog, start=1):
+        print(f"{idx}. {t['name']} ({t['location']}) - {t['start_date']} → {t['end_date']}")
+        print(f"   Description : {t['description']}")
+        print(f"   Rounds : {t['current_round']}/{t['number_of_rounds']} | Joueurs inscrits : {t['player_count']}\n")
 
 
 def register_players_to_tournament_view():
     """
-    Allows the user to select a tournament and register one or more players from the available list.
-    """
-    tournaments = TournamentController.get_all_tournaments()
-    if not tournaments:
-        print("\nAucun tournoi disponible.\n")
-        return
+    Allows the user to select a tournament, search players by name and register one or more of them.
 
-    print("\n=== Sélection du tournoi ===")
-    for idx, t in enumerate(tournaments, start=1):
-        print(f"{idx}. {t.name} ({t.location})")
-
-    try:
-        tournament_index = int(input("Choisissez le tournoi (numéro) : ")) - 1
-        tournament = tournaments[tournament_index]
-    except (ValueError, IndexError):
-        print("❌ Sélection invalide.")
+    Players are looked up in the player index (start of "last name first name", accents and case
+    ignored) and listed one page at a time, so the screen stays usable with a national database.
+    """
+    tournament = _select_tournament()
+    if not tournament:
         return
 
-    players = PlayerRepository.load_players()
-    if not players:
+    players = PlayerRepository.get_index()
+    if not len(players):
         print("\nAucun joueur disponible à inscrire.\n")
         return
 
-    print("\n=== Joueurs disponibles ===")
-    player_dict = {}
-    for idx, p in enumerate(players, start=1):
-        if p.id not in tournament.players:
-            print(f"{idx}. {p.first_name} {p.last_name} ({p.birth_date})")
-            player_dict[idx] = p
-
-    selected = input("Entrez les numéros des joueurs à inscrire (ex: 1 3 5) : ").strip().split()
+    registered = set(tournament.players)
     selected_ids = []
-    for sid in selected:
-        try:
-            selected_ids.append(player_dict[int(sid)].id)
-        except (ValueError, KeyError):
-            print(f"⚠️ Numéro invalide ou déjà inscrit : {sid}")
+    query = input("Rechercher un joueur par nom (Entrée : tous les joueurs) : ").strip()
+    offset = 0
+    while True:
+        total = players.count(query)
+        page = players.search(query, offset, PAGE_SIZE)
+        if not page:
+            print("\nAucun joueur trouvé.")
+        else:
+            print(f"\n=== Joueurs {offset + 1} à {offset + len(page)} sur {total} ===")
+            for idx, p in enumerate(page, start=1):
+                status = " - déjà inscrit" if p.id in registered else ""
+                print(f"{idx}. {p.last_name} {p.first_name} ({p.birth_date}){status}")
+
+        choice = input("Numéros à inscrire (ex: 1 3 5), + / - : page suivante / précédente, "
+                       "? : nouvelle recherche, Entrée : terminer : ").strip()
+        if not choice:
+            break
+        if choice == "+":
+            if offset + PAGE_SIZE < total:
+                offset += PAGE_SIZE
+            continue
+        if choice == "-":
+            offset = max(0, offset - PAGE_SIZE)
+            continue
+        if choice == "?":
+            query = input("Rechercher un joueur par nom (Entrée : tous les joueurs) : ").strip()
+            offset = 0
+            continue
+        for sid in choice.split():
+            player = page[int(sid) - 1] if sid.isdigit() and 1 <= int(sid) <= len(page) else None
+            if player is None:
+                print(f"⚠️ Numéro invalide : {sid}")
+            elif player.id in registered:
+                print(f"⚠️ Joueur déjà inscrit : {sid}")
+            else:
+                selected_ids.append(player.id)
+                registered.add(player.id)
 
     added_count = TournamentController.register_players_to_tournament(tournament, selected_ids)
     print(f"\n✅ {added_count} joueur(s) inscrit(s) dans le tournoi « {tournament.name} ».\n")
@@ -134,7 +137,7 @@ def register_players_to_tournament_view():
 def show_players_in_tournament_view():
     """
     Displays all players currently registered in a selected tournament,
-    along with their name, birth date, and current score.
+    along with their name, birth date, and score in this tournament.
     """
     tournament = _select_tournament()
     if not tournament:
@@ -147,7 +150,7 @@ def show_players_in_tournament_view():
     registered_players = TournamentController.get_players_in_tournament(tournament)
     print(f"\n=== Joueurs inscrits dans « {tournament.name} » ===")
     for idx, p in enumerate(registered_players, start=1):
-        print(f"{idx}. {p.first_name} {p.last_name} ({p.birth_date}) - Score: {p.score}")
+        print(f"{idx}. {p.first_name} {p.last_name} ({p.birth_date}) - Score: {tournament.standings.score(p.id)}")
     print()
 
 
@@ -164,16 +167,12 @@ def start_new_round_view():
     if message:
         print(f"\n❌ {message}\n")
     elif result:
-        print(f"\n✅ Nouveau round démarré : {result['name']}\n")
+        print(f"\n✅ Nouveau round démarré : {result.name}\n")
 
         print("Paires des matchs :")
-        player_dict = {p.id: p for p in PlayerRepository.load_players()}
-        for idx, match in enumerate(result["matches"], start=1):
-            p1_id, _ = match[0]
-            p2_id, _ = match[1]
-            p1_name = f"{player_dict[p1_id].first_name} {player_dict[p1_id].last_name}" if p1_id else "Libre"
-            p2_name = f"{player_dict[p2_id].first_name} {player_dict[p2_id].last_name}" if p2_id else "Libre"
-            print(f"  Match {idx}: {p1_name} vs {p2_name}")
+        for match in TournamentController.get_round_pairings(tournament)["matches"]:
+            white, black = _side_name(match["white"], "??"), _side_name(match["black"], "Libre")
+            print(f"  Match {match['board']}: {white} vs {black}")
         print()
     else:
         print("\n❌ Erreur inconnue lors du démarrage du round.\n")
@@ -194,17 +193,17 @@ def enter_results_for_round_view():
         print("✅ Tous les rounds sont terminés.")
         return
 
-    print(f"\n=== Saisie des résultats - {current_round['name']} ===")
-    player_dict = {p.id: p for p in PlayerRepository.load_players()}
+    print(f"\n=== Saisie des résultats - {current_round.name} ===")
+    player_dict = PlayerRepository.get_index()
+    results = []
 
-    for idx, match in enumerate(current_round["matches"], start=1):
-        p1_id, _ = match[0]
-        p2_id, _ = match[1]
+    for idx, match in enumerate(current_round.matches, start=1):
+        p1_id, p2_id = match.player1_id, match.player2_id
 
         if p2_id is None:
             print(
                 f"Match {idx}: {player_dict[p1_id].first_name} {player_dict[p1_id].last_name} reçoit 1 point.")
-            TournamentController.set_match_result(match, 1.0, 0.0)
+            results.append((1.0, 0.0))
             continue
 
         p1 = player_dict[p1_id]
@@ -218,31 +217,33 @@ def enter_results_for_round_view():
         while True:
             res = input("Résultat (1/2/3) : ").strip()
             if res == "1":
-                TournamentController.set_match_result(match, 1.0, 0.0)
+                results.append((1.0, 0.0))
                 break
             elif res == "2":
-                TournamentController.set_match_result(match, 0.0, 1.0)
+                results.append((0.0, 1.0))
                 break
             elif res == "3":
-                TournamentController.set_match_result(match, 0.5, 0.5)
+                results.append((0.5, 0.5))
                 break
             else:
                 print("Entrée invalide. Réessayez.")
 
-    TournamentController.finalize_round(tournament)
-    print(f"\n✅ Résultats enregistrés pour {current_round['name']}.\n")
+    TournamentController.enter_results_for_round(tournament, results)
+    print(f"\n✅ Résultats enregistrés pour {current_round.name}.\n")
 
 
 def show_rounds_history_view():
     """
     Displays a detailed history of all completed rounds in a selected tournament.
+
+    The name-resolved rounds come from the controller, which computes them once per state of the
+    tournament.
     """
     tournament = _select_tournament()
     if not tournament:
         return
 
-    rounds = tournament.rounds
-    player_names = {p.id: f"{p.first_name} {p.last_name}" for p in PlayerRepository.load_players()}
+    rounds = TournamentController.get_rounds_history(tournament)
 
     if not rounds:
         print(f"\nAucun round enregistré pour « {tournament.name} ».\n")
@@ -250,35 +251,68 @@ def show_rounds_history_view():
 
     print(f"\n=== Historique des rounds pour « {tournament.name} » ===")
     for rnd in rounds:
-        print(f"\n➡️  {rnd['name']}")
+        print(f"\n➡️  {rnd['round']}")
         print(f"   Début : {rnd['start_time']}")
         print(f"   Fin   : {rnd['end_time'] if rnd['end_time'] else '⏳ En cours'}")
         print("   Matchs :")
-        for idx, match in enumerate(rnd["matches"], start=1):
-            p1_id, s1 = match[0]
-            p2_id, s2 = match[1]
-            p1_name = player_names.get(p1_id, "??")
-            p2_name = player_names.get(p2_id, "Libre") if p2_id else "Libre"
-            print(f"     {idx}. {p1_name} ({s1}) vs {p2_name} ({s2})")
+        for match in rnd["matches"]:
+            s1, s2 = RESULT_CODES.get(match["result"], (0.0, 0.0))
+            print(f"     {match['board']}. {_side_name(match['white'], '??')} ({s1}) vs "
+                  f"{_side_name(match['black'], 'Libre')} ({s2})")
     print()
 
 
 def show_player_rankings_view():
     """
-    Displays the current player rankings for a selected tournament.
+    Displays the current player rankings for a selected tournament,
+    with the tiebreak values in the tournament's tiebreak order.
     """
     tournament = _select_tournament()
     if not tournament:
         return
 
-    ranking = TournamentController.get_tournament_rankings(tournament)
+    standings = TournamentController.get_tournament_standings(tournament)
 
     print(f"\n=== Classement des joueurs – {tournament.name} ===")
-    for rank, (player, score) in enumerate(ranking, start=1):
-        print(f"{rank}. {player.first_name} {player.last_name} – {score} points")
+    print(f"Départages : {', '.join(TIEBREAKS[name] for name in tournament.tiebreaks)}")
+    for rank, (player, score, tiebreaks) in enumerate(standings, start=1):
+        print(f"{rank}. {player.first_name} {player.last_name} – {score} points "
+              f"({' / '.join(f'{value:g}' for value in tiebreaks)})")
     print()
 
 
+def configure_tiebreaks_view():
+    """
+    Lets the user choose the tiebreak order of a selected tournament.
+    """
+    tournament = _select_tournament()
+    if not tournament:
+        return
+
+    names = list(TIEBREAKS)
+    print(f"\nOrdre actuel : {', '.join(TIEBREAKS[name] for name in tournament.tiebreaks)}")
+    for idx, name in enumerate(names, start=1):
+        print(f"{idx}. {TIEBREAKS[name]}")
+
+    raw = input("Nouvel ordre (numéros séparés par des virgules, vide pour conserver) : ").strip()
+    if not raw:
+        return
+    try:
+        positions = [int(x) for x in raw.split(",")]
+        if any(not 1 <= pos <= len(names) for pos in positions):
+            raise ValueError
+    except ValueError:
+        print("❌ Sélection invalide.")
+        return
+
+    try:
+        TournamentController.set_tiebreak_order(tournament, [names[pos - 1] for pos in positions])
+    except ValueError as error:
+        print(f"❌ {error}")
+        return
+    print(f"\n✅ Départages : {', '.join(TIEBREAKS[name] for name in tournament.tiebreaks)}\n")
+
+
 def close_tournament_view():
     """
     Handles closing a tournament after verifying that all rounds are complete.
@@ -305,21 +339,32 @@ def close_tournament_view():
         print("\n❌ Clôture annulée.\n")
 
 
+def _side_name(side, default):
+    """
+    Return the name of one side of a described match (see TournamentController.get_round_pairings),
+    or `default` when there is no player.
+    """
+    return side["name"] if side else default
+
+
 def _select_tournament():
     """
     Displays a list of available tournaments and prompts the user to select one.
+
+    Only the tournament catalog is read for the listing; the selected tournament is loaded afterwards.
     """
-    tournaments = TournamentController.get_all_tournaments()
-    if not tournaments:
+    catalog = TournamentController.get_tournament_catalog()
+    if not catalog:
         print("\nAucun tournoi disponible.\n")
         return None
 
     print("\n=== Sélection du tournoi ===")
-    for idx, t in enumerate(tournaments, start=1):
-        print(f"{idx}. {t.name} ({t.location})")
+    for idx, t in enumerate(catalog, start=1):
+        print(f"{idx}. {t['name']} ({t['location']})")
 
     try:
-        return tournaments[int(input("Choisissez le tournoi (numéro) : ")) - 1]
+        index = int(input("Choisissez le tournoi (numéro) : ")) - 1
+        return TournamentController.get_tournament(catalog[index]["id"])
     except (ValueError, IndexError):
         print("❌ Sélection invalide.")
         return None